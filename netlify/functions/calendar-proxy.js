@@ -6,6 +6,9 @@
  *
  * Returns this week + next week of G10 economic events grouped by currency.
  *
+ * Fallback only: the dashboard reads public/calendar.json first, which
+ * scripts/fetch_calendar.py precomputes from a persistent event store.
+ *
  * GET /api/calendar
  * Returns: { events: [...], byCurrency: { AUD:[...], ... }, fetchedAt }
  */
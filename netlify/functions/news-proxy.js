@@ -5,6 +5,10 @@
  * Runs server-side to avoid CORS. Parses XML with no dependencies.
  * Tags each article with relevant G10 currencies based on keywords.
  *
+ * Fallback only: the dashboard reads public/news/all.json first, which
+ * scripts/fetch_news.py pre-aggregates every 15 minutes. Per-currency
+ * results are static shards at /news/{CCY}.json.
+ *
  * GET /api/news               → all articles, all currencies
  * GET /api/news?ccy=AUD       → articles relevant to AUD
  * GET /api/news?ccy=AUD,EUR   → articles relevant to AUD or EUR
@@ -5,6 +5,9 @@
  * home.treasury.gov XML feed. No API key required.
  * Returns the most recent available business day's yields.
  *
+ * Fallback only: the dashboard reads public/yields.json first, which
+ * scripts/fetch_yields.py precomputes once per business day.
+ *
  * GET /api/yields
  */
 
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Append-only, delta-encoded archive of every published artifact snapshot.
+
+Each fetcher overwrites its public/*.json, so until now the only history was
+git log. This keeps it explicitly, per artifact, in data/archive/:
+
+  <name>.log   one JSON record per line, append-only
+                 keyframe: {"t": ts, "f": <full snapshot>}
+                 delta:    {"t": ts, "s": [[path, value], ...], "d": [path, ...]}
+               A keyframe starts each block of up to KEYFRAME_EVERY records
+               (or sooner, when a delta would be nearly as big as the snapshot).
+  <name>.idx   one line per record: "ts<TAB>offset<TAB>length<TAB>keyframe"
+
+ts is the snapshot's own fetchedAt (when it was captured), so "as of X"
+only ever sees what was known at X. A snapshot identical to the previous
+one apart from fetchedAt is not stored.
+
+as_of(name, when) bisects the index, seeks to the block's keyframe and
+reads just that block up to the wanted record — never the whole log.
+
+Usage:
+  python scripts/archive.py append [name ...]       # archive any changed artifacts
+  python scripts/archive.py asof cot-data 2026-03-06
+  python scripts/archive.py export [name ...]       # → public/history/<name>.json
+  python scripts/archive.py backfill                # one-off: replay git history
+
+append exits 0 when it archived something and EXIT_NOTHING_NEW when every
+artifact was unchanged, so a workflow can skip the export (and the commit).
+
+public/history/<name>.json is a daily, forward-filled table of the
+artifact's numeric fields, for the dashboard and scripts/backtest.py:
+  { "dates": ["2026-01-02", ...],
+    "series": { "cot-data:cot.EUR.net": [31, 31, 28, ...], ... },
+    "asOf": "<ts of the last snapshot>" }
+It is a pure function of the archive — the range ends at the last snapshot
+and nothing depends on the clock — so re-exporting an unchanged archive
+rewrites the same bytes. One file per artifact, because the workflows that
+refresh them run on independent schedules and each commits only its own.
+
+Stdlib only.
+"""
+
+import argparse
+import bisect
+import json
+import re
+import subprocess
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import profiling
+from market_calendar import parse_ts
+
+ROOT        = Path(__file__).parent.parent
+ARCHIVE_DIR = ROOT / "data" / "archive"
+EXPORT_DIR  = ROOT / "public" / "history"
+
+EXIT_NOTHING_NEW = 4      # `append` found nothing to archive (3 is profiling's over-limit)
+
+# Archived artifact name → public file. markets/news/calendar change too often
+# and carry no state worth replaying.
+ARTIFACTS = {
+    "cb-rates": "cb-rates.json",
+    "cot-data": "cot-data.json",
+    "atr-data": "atr-data.json",
+    "yields":   "yields.json",
+    "macro":    "macro.json",
+}
+
+# Top-level keys whose numeric leaves go into the export
+EXPORT_FIELDS = {
+    "cb-rates": ("rates",),
+    "cot-data": ("cot",),
+    "atr-data": ("atr",),
+    "yields":   ("yields",),
+    "macro":    ("fed", "usMacro"),
+}
+
+# Top-level keys recomputed from the rest of the snapshot on every run; not archived
+DERIVED = {
+    "atr-data": ("riskGrid",),
+}
+
+KEYFRAME_EVERY = 32
+KEYFRAME_RATIO = 0.6      # delta ≥ 60% of a full snapshot → write a keyframe instead
+VOLATILE       = ("fetchedAt",)
+
+
+# ── Delta encoding ────────────────────────────────────────────────────────────
+
+def diff(old, new, path=()):
+    """Nested-dict diff → (sets, deletes). Lists and scalars are replaced whole."""
+    sets, dels = [], []
+    for k in old.keys() - new.keys():
+        dels.append([*path, k])
+    for k, v in new.items():
+        if k not in old:
+            sets.append([[*path, k], v])
+        elif isinstance(v, dict) and isinstance(old[k], dict):
+            s, d = diff(old[k], v, (*path, k))
+            sets += s
+            dels += d
+        elif v != old[k]:
+            sets.append([[*path, k], v])
+    return sets, dels
+
+
+def apply(state, record):
+    if "f" in record:
+        return record["f"]
+    for path, value in record.get("s", []):
+        node = state
+        for k in path[:-1]:
+            node = node.setdefault(k, {})
+        node[path[-1]] = value
+    for path in record.get("d", []):
+        node = state
+        for k in path[:-1]:
+            node = node.get(k, {})
+        node.pop(path[-1], None)
+    return state
+
+
+def _stable(snapshot):
+    return {k: v for k, v in snapshot.items() if k not in VOLATILE}
+
+
+# ── Store ─────────────────────────────────────────────────────────────────────
+
+class Archive:
+    """One artifact's log + index."""
+
+    def __init__(self, name, directory=ARCHIVE_DIR):
+        self.name     = name
+        self.log_path = directory / f"{name}.log"
+        self.idx_path = directory / f"{name}.idx"
+        self.index    = self._load_index()     # [(ts, offset, length, is_key)]
+        self._ts      = [e[0] for e in self.index]
+
+    def _load_index(self):
+        try:
+            with open(self.idx_path) as f:
+                index = [(ts, int(off), int(n), k == "1")
+                         for ts, off, n, k in (line.rstrip("\n").split("\t") for line in f if line.strip())]
+        except OSError:
+            index = []
+        size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        if (index[-1][1] + index[-1][2] if index else 0) != size:
+            index = self._rebuild_index()       # interrupted append — trust the log
+        return index
+
+    def _rebuild_index(self):
+        index, offset = [], 0
+        if self.log_path.exists():
+            with open(self.log_path, "rb") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        break                   # torn last line
+                    index.append((rec["t"], offset, len(line), "f" in rec))
+                    offset += len(line)
+            with open(self.log_path, "r+b") as f:
+                f.truncate(offset)
+        self.idx_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.idx_path, "w") as f:
+            f.writelines(f"{ts}\t{o}\t{n}\t{int(k)}\n" for ts, o, n, k in index)
+        return index
+
+    def _read_block(self, i):
+        """Replay records from the keyframe before record i through record i."""
+        k = i
+        while not self.index[k][3]:
+            k -= 1
+        start = self.index[k][1]
+        end   = self.index[i][1] + self.index[i][2]
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+            lines = f.read(end - start).splitlines()
+        state = {}
+        for line in lines:
+            state = apply(state, json.loads(line))
+        return state
+
+    def latest(self):
+        return self._read_block(len(self.index) - 1) if self.index else None
+
+    def as_of(self, when):
+        """Snapshot as known at `when` (datetime, or date = end of that day UTC)."""
+        if isinstance(when, date) and not isinstance(when, datetime):
+            when = datetime.combine(when + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc) \
+                   - timedelta(microseconds=1)
+        i = bisect.bisect_right(self._ts, when.astimezone(timezone.utc).isoformat()) - 1
+        return self._read_block(i) if i >= 0 else None
+
+    def append(self, snapshot, ts=None):
+        """Append a snapshot if it differs from the latest. Returns True if written."""
+        snapshot = {k: v for k, v in snapshot.items() if k not in DERIVED.get(self.name, ())}
+        ts = (parse_ts(ts or snapshot.get("fetchedAt")) or datetime.now(timezone.utc))
+        ts = ts.astimezone(timezone.utc).isoformat()
+        if self._ts and ts <= self._ts[-1]:
+            return False                         # already archived (or older)
+
+        prev = self.latest()
+        if prev is not None and _stable(prev) == _stable(snapshot):
+            return False
+
+        since_key = next((n for n, e in enumerate(reversed(self.index)) if e[3]), len(self.index))
+        record    = None
+        if prev is not None and since_key + 1 < KEYFRAME_EVERY:
+            sets, dels = diff(prev, snapshot)
+            record = {"t": ts, "s": sets, "d": dels} if dels else {"t": ts, "s": sets}
+        full = {"t": ts, "f": snapshot}
+        line = json.dumps(record or full, separators=(",", ":"))
+        if record is not None:
+            full_line = json.dumps(full, separators=(",", ":"))
+            if len(line) >= KEYFRAME_RATIO * len(full_line):
+                line, record = full_line, None
+        data = (line + "\n").encode()
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        offset = self.log_path.stat().st_size if self.log_path.exists() else 0
+        with open(self.log_path, "ab") as f:
+            f.write(data)
+        with open(self.idx_path, "a") as f:
+            f.write(f"{ts}\t{offset}\t{len(data)}\t{int(record is None)}\n")
+        self.index.append((ts, offset, len(data), record is None))
+        self._ts.append(ts)
+        return True
+
+    def replay(self):
+        """Yield (ts, snapshot) for every record, oldest first (one sequential read)."""
+        if not self.index:
+            return
+        state = {}
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                rec   = json.loads(line)
+                state = apply(state, rec)
+                yield rec["t"], state
+
+
+# ── Export ────────────────────────────────────────────────────────────────────
+
+_NUMBER = re.compile(r"(?<![\d.])-?\d+(?:\.\d+)?")     # "3.50-3.75": the dash is a range, not a sign
+
+
+def _numeric(value):
+    """Numbers pass through; "3.50–3.75%" style strings → the last number (upper bound)."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        found = _NUMBER.findall(value)
+        return float(found[-1]) if found else None
+    return None
+
+
+def flatten(name, snapshot):
+    out = {}
+
+    def walk(node, path):
+        if isinstance(node, dict):
+            for k, v in node.items():
+                walk(v, (*path, k))
+        else:
+            n = _numeric(node)
+            if n is not None:
+                out[f"{name}:{'.'.join(path)}"] = n
+
+    for field in EXPORT_FIELDS.get(name, ()):
+        if field in snapshot:
+            walk(snapshot[field], (field,))
+    return out
+
+
+def export(names=ARTIFACTS, start=None, end=None):
+    """
+    Daily forward-filled numeric table across the archived artifacts, from
+    the first snapshot (or start) to the last one (or end, to carry the last
+    values forward to a given day).
+    """
+    daily  = {}                                  # name → {date: flat}
+    as_of  = None
+    for name in names:
+        per_day = {}
+        for ts, state in Archive(name).replay():
+            per_day[ts[:10]] = flatten(name, state)     # last snapshot of the day wins
+            as_of = max(as_of or ts, ts)
+        daily[name] = per_day
+
+    days_seen = [d for per_day in daily.values() for d in per_day]
+    if not days_seen:
+        return {"dates": [], "series": {}, "asOf": None}
+    first = date.fromisoformat(min(days_seen))
+    end   = end or date.fromisoformat(max(days_seen))
+    start = max(start or first, first)
+    dates = []
+    d = start
+    while d <= end:
+        dates.append(d.isoformat())
+        d += timedelta(days=1)
+
+    series = {}
+    for name, per_day in daily.items():
+        days    = sorted(per_day)
+        current = {}
+        j       = 0
+        columns = {}
+        for n, day in enumerate(dates):
+            while j < len(days) and days[j] <= day:
+                current = per_day[days[j]]
+                j += 1
+            for key, value in current.items():
+                columns.setdefault(key, [None] * len(dates))[n] = value
+        series.update(columns)
+
+    return {"dates": dates, "series": dict(sorted(series.items())), "asOf": as_of}
+
+
+# ── Commands ──────────────────────────────────────────────────────────────────
+
+def append_all(names=ARTIFACTS, public_dir=ROOT / "public"):
+    """Archive the current public/ version of each artifact. Returns names written."""
+    written = []
+    for name in names:
+        try:
+            with open(public_dir / ARTIFACTS[name]) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if Archive(name).append(snapshot):
+            written.append(name)
+    return written
+
+
+def export_path(name, directory=EXPORT_DIR):
+    return directory / f"{name}.json"
+
+
+def write_export(name, directory=EXPORT_DIR, start=None):
+    """Write one artifact's export. Returns it, or None when nothing is archived yet."""
+    with profiling.phase("compute"):
+        result = export(names=[name], start=start)
+    if not result["dates"]:
+        return None
+    directory.mkdir(parents=True, exist_ok=True)
+    with profiling.phase("write"), open(export_path(name, directory), "w") as f:
+        json.dump(result, f, separators=(",", ":"))
+    return result
+
+
+def on_artifacts_changed(job, paths):
+    """RefreshDaemon listener: archive changed artifacts and refresh their exports."""
+    files = {p.name for p in paths}
+    names = [n for n, f in ARTIFACTS.items() if f in files]
+    written = append_all(names) if names else []
+    for name in written:
+        write_export(name)
+    if written:
+        print(f"[archive] {', '.join(written)} archived")
+
+
+def backfill(names=ARTIFACTS):
+    """Replay every committed version of each artifact from git history, oldest first."""
+    for name in names:
+        rel = f"public/{ARTIFACTS[name]}"
+        log = subprocess.run(["git", "log", "--reverse", "--format=%H %cI", "--", rel],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout.split("\n")
+        archive, added = Archive(name), 0
+        for line in filter(None, log):
+            sha, committed = line.split(" ", 1)
+            shown = subprocess.run(["git", "show", f"{sha}:{rel}"], cwd=ROOT, capture_output=True, text=True)
+            try:
+                snapshot = json.loads(shown.stdout)
+            except ValueError:
+                continue
+            added += archive.append(snapshot, ts=snapshot.get("fetchedAt") or committed)
+        print(f"  {name:<9} +{added} from {len(list(filter(None, log)))} commits")
+
+
+def _artifact_name(value):
+    # Not choices=: argparse checks an empty nargs="*" list against them too
+    if value not in ARTIFACTS:
+        raise argparse.ArgumentTypeError(f"unknown artifact {value!r} (choose from {', '.join(sorted(ARTIFACTS))})")
+    return value
+
+
+@profiling.profiled("archive")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--profile", action="store_true", help="profile this run (see profiling.py)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("append", help=f"archive changed public/ artifacts (exit {EXIT_NOTHING_NEW} if none)")
+    p.add_argument("names", nargs="*", type=_artifact_name, metavar="name")
+    sub.add_parser("backfill", help="import every committed version from git history")
+    p = sub.add_parser("asof", help="print an artifact as of a date or timestamp")
+    p.add_argument("name", choices=sorted(ARTIFACTS))
+    p.add_argument("when")
+    p = sub.add_parser("export", help=f"write {EXPORT_DIR.relative_to(ROOT)}/<name>.json")
+    p.add_argument("names", nargs="*", type=_artifact_name, metavar="name")
+    p.add_argument("--from", dest="start", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    if args.cmd == "append":
+        written = append_all(args.names or ARTIFACTS)
+        print(f"Archived: {', '.join(written) or 'nothing new'}")
+        if not written:
+            sys.exit(EXIT_NOTHING_NEW)
+
+    elif args.cmd == "backfill":
+        print("Backfilling archive from git history...")
+        backfill()
+
+    elif args.cmd == "asof":
+        when = parse_ts(args.when) if "T" in args.when else date.fromisoformat(args.when)
+        snapshot = Archive(args.name).as_of(when)
+        if snapshot is None:
+            print(f"No {args.name} snapshot on or before {args.when}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(snapshot, indent=2))
+
+    elif args.cmd == "export":
+        for name in args.names or ARTIFACTS:
+            result = write_export(name, start=args.start)
+            if result is None:
+                print(f"  {name:<9} nothing archived yet")
+                continue
+            print(f"Wrote {export_path(name)}  ({len(result['dates'])} days × {len(result['series'])} series)")
+
+
+if __name__ == "__main__":
+    main()
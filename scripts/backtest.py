@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Vectorised backtest of the currency-score pair ranking (src/hooks/useScores.js).
+
+The dashboard ranks pairs by score divergence: each currency gets
+
+    score = monetary×2 + growth + inflation + risk + commodity
+
+and the widest spreads are the trade ideas (long the stronger currency).
+This measures how that ranking — and re-weighted variants of it, with COT
+positioning and the policy-rate carry as extra inputs — would have done.
+
+Inputs, aligned onto one date axis as numpy arrays:
+
+  prices   ECB reference rates from Frankfurter, cached in data/backtest/
+           (fetched incrementally)                            P[T, C]
+  scores   every committed version of the score{} blocks in
+           src/data/currencies.js, dated by commit (git log), ┐
+           or today's held throughout with --static-scores  │
+  cot      cot-data:cot.<CCY>.net  from the snapshot archive  ├ X[T, C, F]
+  carry    cb-rates:rates.<CCY>    from the snapshot archive  ┘
+           (scripts/archive.py export, held to the last price)
+
+Features F = monetary, growth, inflation, risk, commodity, cot, carry.
+For a weight vector w the signal is S = X·w; every G10 pair's spread
+S_i − S_j is ranked each day, the top-k (at least --min-spread apart)
+are held long-strong / short-weak at 1/k gross each, entered at the
+close the signal is known and earning the next day's log return, less
+--cost-bp per unit of turnover.
+
+A sweep evaluates many weight vectors at once: the N×T×28 spreads are one
+einsum over precomputed pair feature spreads, top-k is a partition along
+the pair axis, and P&L and metrics reduce over T. Chunks
+of the grid run on a process pool, so thousands of combinations take
+seconds.
+
+Usage:
+  python scripts/backtest.py                                   # the live model
+  python scripts/backtest.py --sweep monetary=0:4:0.5 cot=0:1:0.25 carry=0,0.5,1
+  python scripts/backtest.py --sweep growth=0:2:1 risk=0:2:1 --top-k 2 --workers 4
+
+Needs numpy (pip install numpy) — the only scripts/ tool that does.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import subprocess
+import sys
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("backtest.py needs numpy: pip install numpy")
+
+import archive
+import http_pool
+import profiling
+
+ROOT          = Path(__file__).parent.parent
+CACHE_DIR     = ROOT / "data" / "backtest"
+PRICES_PATH   = CACHE_DIR / "fx-daily.json"
+RESULTS_PATH  = CACHE_DIR / "results.json"
+CURRENCIES_JS = "src/data/currencies.js"
+
+CCYS     = ["USD", "EUR", "GBP", "JPY", "CHF", "CAD", "AUD", "NZD"]
+FEATURES = ["monetary", "growth", "inflation", "risk", "commodity", "cot", "carry"]
+SCORE_DIMS = FEATURES[:5]
+
+# The dashboard's formula: monetary×2 + growth + inflation + risk + commodity
+LIVE_WEIGHTS = {"monetary": 2, "growth": 1, "inflation": 1, "risk": 1, "commodity": 1, "cot": 0, "carry": 0}
+
+COT_SCALE = 0.1         # net % of OI (−100…100) → roughly score units
+TRADING_DAYS = 252
+CHUNK = 128             # weight vectors per einsum batch (bounds memory: CHUNK×T×28)
+
+PAIRS = list(itertools.combinations(range(len(CCYS)), 2))
+PAIR_I = np.array([i for i, _ in PAIRS])
+PAIR_J = np.array([j for _, j in PAIRS])
+TIE_BREAK = np.linspace(1e-9, 0, len(PAIRS), endpoint=False)
+
+FRANKFURTER = "https://api.frankfurter.app/{start}..{end}?from=USD&to=" + ",".join(CCYS[1:])
+
+
+# ── Prices ────────────────────────────────────────────────────────────────────
+
+def _fetch_range(start, end):
+    req = urllib.request.Request(FRANKFURTER.format(start=start, end=end),
+                                 headers={"User-Agent": "FXDashboard-Backtest/1.0"})
+    with http_pool.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read().decode("utf-8")).get("rates", {})
+
+
+def load_prices(start):
+    """Daily USD→CCY reference rates since `start`, cached and topped up by year."""
+    try:
+        with open(PRICES_PATH) as f:
+            rates = json.load(f)
+    except (OSError, ValueError):
+        rates = {}
+
+    today = datetime.now(timezone.utc).date()
+    have  = {d for d in rates}
+    begin = date.fromisoformat(max(rates)) + timedelta(days=1) if rates else start
+    if rates and min(rates) > start.isoformat():
+        begin = start                              # wider window than the cache
+    # One request per calendar year keeps Frankfurter on daily (not weekly) data
+    ranges, d = [], begin
+    while d <= today:
+        end = min(date(d.year, 12, 31), today)
+        ranges.append((d, end))
+        d = end + timedelta(days=1)
+
+    for a, b in ranges:
+        try:
+            fresh = _fetch_range(a, b)
+        except (OSError, ValueError) as e:
+            print(f"  WARN prices {a}..{b}: {e}", file=sys.stderr)
+            continue
+        rates.update({k: v for k, v in fresh.items() if k not in have})
+        print(f"  prices {a}..{b}: {len(fresh)} days")
+
+    if ranges:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(PRICES_PATH, "w") as f:
+            json.dump(dict(sorted(rates.items())), f, separators=(",", ":"))
+    return {d: r for d, r in rates.items() if d >= start.isoformat()}
+
+
+# ── Scores (git history of currencies.js) ─────────────────────────────────────
+
+_CCY_HEAD = re.compile(r"^([A-Z]{3}):\{", re.M)
+_SCORE    = re.compile(r"score:\{([^}]*)\}")
+_FIELD    = re.compile(r'"?(\w+)"?\s*:\s*(-?\d+(?:\.\d+)?)')
+
+
+def parse_scores(source):
+    """{CCY: {dim: value}} from one version of currencies.js."""
+    heads  = [(m.start(), m.group(1)) for m in _CCY_HEAD.finditer(source)]
+    scores = {}
+    for n, (pos, ccy) in enumerate(heads):
+        end   = heads[n + 1][0] if n + 1 < len(heads) else len(source)
+        match = _SCORE.search(source, pos, end)
+        if match and ccy in CCYS:
+            scores[ccy] = {k: float(v) for k, v in _FIELD.findall(match.group(1))}
+    return scores
+
+
+def load_score_history():
+    """[(date, {CCY: {dim: v}})] — one entry per commit that changed the scores."""
+    try:
+        log = subprocess.run(["git", "log", "--reverse", "--format=%H %cI", "--", CURRENCIES_JS],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        log = ""
+    history, last = [], None
+    for line in filter(None, log.split("\n")):
+        sha, committed = line.split(" ", 1)
+        shown  = subprocess.run(["git", "show", f"{sha}:{CURRENCIES_JS}"],
+                                cwd=ROOT, capture_output=True, text=True)
+        scores = parse_scores(shown.stdout)
+        if scores and scores != last:
+            history.append((committed[:10], scores))
+            last = scores
+    if not history:
+        # No git: the working copy is all we have (and it looks ahead — say so)
+        print("  WARN no score history in git; using current scores for every date", file=sys.stderr)
+        with open(ROOT / CURRENCIES_JS) as f:
+            history = [("0000-00-00", parse_scores(f.read()))]
+    return history
+
+
+# ── Alignment ─────────────────────────────────────────────────────────────────
+
+def build_arrays(start, static_scores=False):
+    """→ dates, returns r[T, C], features X[T, C, F] (NaN where unknown → 0)."""
+    rates = load_prices(start)
+    dates = sorted(rates)
+    if len(dates) < 30:
+        raise SystemExit(f"Only {len(dates)} days of prices since {start} — nothing to test")
+    T, C = len(dates), len(CCYS)
+
+    # USD value of one unit of each currency; USD itself = 1
+    P = np.ones((T, C))
+    for t, d in enumerate(dates):
+        for c, ccy in enumerate(CCYS[1:], start=1):
+            P[t, c] = 1.0 / rates[d][ccy] if rates[d].get(ccy) else np.nan
+    P = _ffill(P)
+    r = np.zeros((T, C))
+    r[1:] = np.log(P[1:] / P[:-1])
+    r = np.nan_to_num(r)
+
+    X = np.full((T, C, len(FEATURES)), np.nan)
+
+    # Score dims: step function over commit dates
+    history = load_score_history()
+    if static_scores:
+        history = [("0000-00-00", history[-1][1])]
+    idx     = np.searchsorted([d for d, _ in history], dates, side="right") - 1
+    for h, (_, scores) in enumerate(history):
+        rows = idx == h
+        for c, ccy in enumerate(CCYS):
+            for f, dim in enumerate(SCORE_DIMS):
+                if dim in scores.get(ccy, {}):
+                    X[rows, c, f] = scores[ccy][dim]
+
+    # COT and carry: the archive's daily forward-filled export, carried to the last price
+    exported = archive.export(names=["cot-data", "cb-rates"], start=start,
+                              end=date.fromisoformat(dates[-1]))
+    ex_pos   = {d: n for n, d in enumerate(exported["dates"])}
+    take     = np.array([ex_pos.get(d, -1) for d in dates])
+    for c, ccy in enumerate(CCYS):
+        for f, key, scale in ((FEATURES.index("cot"), f"cot-data:cot.{ccy}.net", COT_SCALE),
+                              (FEATURES.index("carry"), f"cb-rates:rates.{ccy}", 1.0)):
+            column = exported["series"].get(key)
+            if column is None:
+                continue
+            values = np.array([np.nan if v is None else v for v in column], dtype=float)
+            X[take >= 0, c, f] = values[take[take >= 0]] * scale
+
+    coverage = {name: float(np.mean(~np.isnan(X[..., f]))) for f, name in enumerate(FEATURES)}
+    return dates, r, np.nan_to_num(X), coverage
+
+
+def _ffill(a):
+    """Forward-fill NaNs down axis 0."""
+    mask = np.isnan(a)
+    idx  = np.where(~mask, np.arange(a.shape[0])[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return a[idx, np.arange(a.shape[1])]
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
+
+def evaluate(XD, R_pair, W, top_k=3, min_spread=1.0, cost_bp=1.0):
+    """
+    Metrics for each row of W (N×F), fully vectorised over N, T and pairs.
+    XD: T×P×F pair feature spreads (X[:, i] − X[:, j] for PAIRS),
+    R_pair: T×P pair log returns. Returns a dict of length-N arrays.
+    """
+    top_k = min(top_k, len(PAIRS))
+    D = np.einsum("tpf,nf->ntp", XD, W, optimize=True)        # N×T×P signal spreads
+    A = np.abs(D)
+
+    # Top-k by |spread|; the tiny per-pair offset breaks ties (integer scores
+    # tie constantly) in PAIRS order, so partition picks exactly k
+    ranked = A + TIE_BREAK
+    kth    = np.partition(ranked, -top_k, axis=-1)[..., -top_k:-top_k + 1 or None]
+    sel    = (ranked >= kth) & (A >= max(min_spread, 1e-9))
+
+    w = np.sign(D) * sel / top_k                              # long i/short j when S_i > S_j
+    # Decided at close t, earns t+1; trading costs on every change of weights
+    pnl      = np.einsum("ntp,tp->nt", w[:, :-1], R_pair[1:])
+    turnover = np.abs(np.diff(w, axis=1, prepend=0)).sum(-1)[:, :-1]
+    net      = pnl - turnover * cost_bp / 1e4
+
+    equity = np.cumsum(net, axis=1)
+    dd     = np.maximum.accumulate(equity, axis=1) - equity
+    mean   = net.mean(axis=1)
+    std    = net.std(axis=1)
+    active = sel[:, :-1].any(-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(TRADING_DAYS), 0.0)
+        hit    = np.where(active.any(1), ((net > 0) & active).sum(1) / active.sum(1), 0.0)
+    return {
+        "totalReturn": np.expm1(equity[:, -1]),
+        "annReturn":   mean * TRADING_DAYS,
+        "annVol":      std * np.sqrt(TRADING_DAYS),
+        "sharpe":      sharpe,
+        "maxDrawdown": -np.expm1(-dd.max(axis=1)),
+        "hitRate":     hit,
+        "exposure":    active.mean(axis=1),
+        "turnover":    turnover.mean(axis=1),
+    }
+
+
+# Process-pool workers get the arrays once, via the initializer
+_shared = {}
+
+
+def _init_worker(XD, R_pair, settings):
+    _shared.update(XD=XD, R_pair=R_pair, settings=settings)
+
+
+def _evaluate_chunk(W):
+    return evaluate(_shared["XD"], _shared["R_pair"], W, **_shared["settings"])
+
+
+def run_grid(XD, R_pair, W, settings, workers):
+    chunks = [W[i:i + CHUNK] for i in range(0, len(W), CHUNK)]
+    if workers <= 1 or len(chunks) == 1:
+        parts = [evaluate(XD, R_pair, c, **settings) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(XD, R_pair, settings)) as pool:
+            parts = list(pool.map(_evaluate_chunk, chunks))
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+# ── Sweep spec ────────────────────────────────────────────────────────────────
+
+def parse_values(spec):
+    """'0:4:0.5' → 0, 0.5 … 4 (inclusive);  '0,0.5,2' → as listed."""
+    if ":" in spec:
+        lo, hi, step = (float(x) for x in spec.split(":"))
+        return list(np.round(np.arange(lo, hi + step / 2, step), 10))
+    return [float(x) for x in spec.split(",")]
+
+
+def build_grid(sweeps):
+    axes = {}
+    for item in sweeps:
+        name, _, spec = item.partition("=")
+        if name not in FEATURES:
+            raise SystemExit(f"Unknown feature '{name}' (one of: {', '.join(FEATURES)})")
+        axes[name] = parse_values(spec)
+    base  = np.array([LIVE_WEIGHTS[f] for f in FEATURES], dtype=float)
+    names = list(axes)
+    grid  = np.repeat(base[None, :], int(np.prod([len(v) for v in axes.values()] or [1])), axis=0)
+    for row, combo in enumerate(itertools.product(*axes.values())):
+        for name, value in zip(names, combo):
+            grid[row, FEATURES.index(name)] = value
+    return grid
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def _fmt(m, i):
+    return (f"sharpe {m['sharpe'][i]:5.2f}  ann {m['annReturn'][i]:+7.2%}  vol {m['annVol'][i]:6.2%}  "
+            f"maxDD {m['maxDrawdown'][i]:6.2%}  hit {m['hitRate'][i]:5.1%}  exposure {m['exposure'][i]:5.1%}")
+
+
+@profiling.profiled("backtest")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sweep", nargs="*", default=[], metavar="FEATURE=SPEC",
+                        help="weights to vary: lo:hi:step or a,b,c (others stay at the live model)")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat,
+                        default=date.today() - timedelta(days=5 * 365))
+    parser.add_argument("--top-k", type=int, default=3, help="pairs held per day")
+    parser.add_argument("--min-spread", type=float, default=1.0, help="minimum signal spread to trade")
+    parser.add_argument("--cost-bp", type=float, default=1.0, help="cost per unit turnover, bp")
+    parser.add_argument("--static-scores", action="store_true",
+                        help="hold today's scores over the whole window (look-ahead; for shallow git history)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top", type=int, default=10, help="results to print")
+    parser.add_argument("--profile", action="store_true", help="profile this run (see profiling.py)")
+    args = parser.parse_args()
+
+    with profiling.phase("fetch"):
+        print(f"Loading prices, scores, COT and CB rates since {args.start}...")
+        dates, r, X, coverage = build_arrays(args.start, args.static_scores)
+    R_pair = r[:, PAIR_I] - r[:, PAIR_J]
+    XD     = X[:, PAIR_I] - X[:, PAIR_J]
+    print(f"  {len(dates)} days ({dates[0]} → {dates[-1]}), {len(CCYS)} currencies, {len(PAIRS)} pairs")
+    print("  feature coverage: " + "  ".join(f"{k} {v:.0%}" for k, v in coverage.items()))
+
+    settings = {"top_k": args.top_k, "min_spread": args.min_spread, "cost_bp": args.cost_bp}
+    live     = np.array([[LIVE_WEIGHTS[f] for f in FEATURES]], dtype=float)
+    grid     = build_grid(args.sweep) if args.sweep else live
+
+    with profiling.phase("compute"):
+        t0      = datetime.now()
+        base    = evaluate(XD, R_pair, live, **settings)
+        metrics = run_grid(XD, R_pair, grid, settings, args.workers)
+        elapsed = (datetime.now() - t0).total_seconds()
+
+    print(f"\nLive model: {_fmt(base, 0)}")
+    print(f"Evaluated {len(grid)} weight combinations in {elapsed:.2f}s")
+    ranked = np.argsort(-metrics["sharpe"], kind="stable")
+    print(f"\nTop {min(args.top, len(grid))} by Sharpe:")
+    for i in ranked[:args.top]:
+        weights = " ".join(f"{f}={grid[i, n]:g}" for n, f in enumerate(FEATURES))
+        print(f"  {_fmt(metrics, i)}   {weights}")
+
+    with profiling.phase("write"):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(RESULTS_PATH, "w") as f:
+            json.dump({
+                "features": FEATURES,
+                "settings": {**settings, "from": dates[0], "to": dates[-1], "days": len(dates)},
+                "coverage": coverage,
+                "live":     {k: float(v[0]) for k, v in base.items()},
+                "results":  [{"weights": grid[i].tolist(),
+                              **{k: round(float(v[i]), 6) for k, v in metrics.items()}}
+                             for i in ranked],
+                "generatedAt": datetime.now(timezone.utc).isoformat(),
+            }, f, separators=(",", ":"))
+    print(f"\nWrote {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Local / self-hosted HTTP server for the generated public/ artifacts.
+
+netlify/functions/cot-proxy.js reads and JSON.parses cot-data.json on every
+request just to check it, and clients have to poll to notice new data. This
+server does that work once per artifact version instead:
+
+  * every public/**/*.json is loaded into memory and validated once, when it
+    appears or changes — an invalid new version is rejected and the last good
+    one keeps being served
+  * responses carry a strong ETag (sha256 of the body); If-None-Match → 304
+  * gzip (and brotli, when the module is installed) bodies are precomputed
+    at load and picked from Accept-Encoding
+  * GET /events is a server-sent event stream: one `artifact` event per
+    changed file, e.g.  data: {"path": "/cot-data.json", "etag": "\"…\""}
+
+The /api/* routes that only ever wrapped a committed artifact are answered
+from the same store (/api/cot, /api/cb-rates, /api/yields, /api/markets,
+/api/calendar, /api/news), so `npm run dev` can point its /api proxy here
+instead of at Netlify (see vite.config.js).
+
+Changes are picked up by polling file mtimes, or — with --daemon — straight
+from an embedded RefreshDaemon (scripts/refresh_daemon.py) as soon as a job
+writes a file. Either way reloading (validation + gzip/brotli) runs on a
+worker thread, never on the event loop that is serving requests.
+
+Usage:
+  python scripts/data_server.py                    # http://127.0.0.1:8787
+  python scripts/data_server.py --port 9000 --host 0.0.0.0
+  python scripts/data_server.py --daemon           # also run the fetchers
+
+Stdlib only (brotli optional).
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import signal
+import sys
+import threading
+from datetime import datetime, timezone
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import profiling
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT       = Path(__file__).parent.parent
+PUBLIC_DIR = ROOT / "public"
+
+POLL_INTERVAL_S  = 2
+SSE_KEEPALIVE_S  = 25
+MIN_COMPRESS_LEN = 512
+MAX_HEADER_BYTES = 16 * 1024
+
+# /api/* route → artifact it serves (the Netlify functions it stands in for)
+API_ROUTES = {
+    "/api/cot":       "cot-data.json",
+    "/api/cot-pairs": "cot-pairs.json",
+    "/api/cb-rates":  "cb-rates.json",
+    "/api/yields":    "yields.json",
+    "/api/markets":   "markets.json",
+    "/api/calendar":  "calendar.json",
+    "/api/news":      "news/all.json",
+}
+
+BASE_HEADERS = {
+    "Access-Control-Allow-Origin":  "*",
+    "Access-Control-Allow-Headers": "Content-Type, If-None-Match",
+    "Access-Control-Expose-Headers": "ETag",
+}
+
+REASONS = {200: "OK", 204: "No Content", 304: "Not Modified", 400: "Bad Request",
+           404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+
+
+# ── Validation ────────────────────────────────────────────────────────────────
+# Same checks the proxies make, done once per version instead of per request.
+
+def _require(key, kind=dict):
+    def check(data):
+        value = data.get(key)
+        if not isinstance(value, kind) or not value:
+            raise ValueError(f"'{key}' missing or empty")
+    return check
+
+
+VALIDATORS = {
+    "cot-data.json":  _require("cot"),
+    "cot-pairs.json": _require("pairs"),
+    "cb-rates.json":  _require("rates"),
+    "atr-data.json":  _require("atr"),
+    "yields.json":    _require("yields"),
+    "macro.json":     _require("usMacro"),
+    "markets.json":   _require("markets"),
+    "calendar.json":  _require("events", list),
+    "news/all.json":  _require("articles", list),
+}
+
+
+def validate(name, raw):
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError("top level is not an object")
+    check = VALIDATORS.get(name)
+    if check:
+        check(data)
+
+
+# ── Artifact store ────────────────────────────────────────────────────────────
+
+class Artifact:
+    """One validated file version with its precomputed encodings."""
+
+    def __init__(self, name, raw, mtime):
+        self.name          = name
+        self.etag          = '"' + hashlib.sha256(raw).hexdigest()[:32] + '"'
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.mtime         = mtime
+        self.bodies        = {"identity": raw}
+        if len(raw) >= MIN_COMPRESS_LEN:
+            self.bodies["gzip"] = gzip.compress(raw, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.bodies["br"] = brotli.compress(raw)
+
+    def body_for(self, accept_encoding):
+        """Pick the smallest body the client accepts → (encoding, bytes)."""
+        accepted = {"identity"}
+        for part in (accept_encoding or "").split(","):
+            coding, _, params = part.strip().partition(";")
+            if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(coding.strip().lower())
+        options = [(len(b), enc, b) for enc, b in self.bodies.items() if enc in accepted]
+        _, enc, body = min(options)
+        return enc, body
+
+
+class ArtifactStore:
+
+    def __init__(self, public_dir):
+        self.public_dir = public_dir
+        self.artifacts  = {}        # "cot-data.json" → Artifact
+        self.errors     = {}        # "cot-data.json" → last validation error
+        self._mtimes    = {}
+        self._lock      = threading.Lock()   # poller and daemon reloads run on threads
+
+    def _name(self, path):
+        return path.relative_to(self.public_dir).as_posix()
+
+    def load(self, path):
+        """(Re)load one file. Returns its name if the served version changed."""
+        with self._lock:
+            return self._load(path)
+
+    def _load(self, path):
+        name = self._name(path)
+        try:
+            mtime = path.stat().st_mtime
+            raw   = path.read_bytes()
+        except OSError:
+            self._mtimes.pop(name, None)
+            return name if self.artifacts.pop(name, None) else None
+        self._mtimes[name] = mtime
+
+        current = self.artifacts.get(name)
+        try:
+            validate(name, raw)
+        except ValueError as e:
+            self.errors[name] = str(e)
+            kept = "keeping last good version" if current else "not served"
+            print(f"[server] {name} rejected ({e}) — {kept}", file=sys.stderr)
+            return None
+        self.errors.pop(name, None)
+
+        artifact = Artifact(name, raw, mtime)
+        if current and current.etag == artifact.etag:
+            return None
+        self.artifacts[name] = artifact
+        return name
+
+    def scan(self):
+        """Stat every artifact; reload the new or modified ones. Returns changed names."""
+        seen, changed = set(), []
+        for path in self.public_dir.rglob("*.json"):
+            name = self._name(path)
+            seen.add(name)
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if self._mtimes.get(name) != mtime and self.load(path):
+                changed.append(name)
+        for name in set(self._mtimes) - seen:
+            if self.load(self.public_dir / name):
+                changed.append(name)
+        return changed
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+
+async def read_request(reader):
+    """Parse one request head → (method, path, query, headers) or None on EOF."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise ValueError("request head too large")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise ValueError("malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    path, _, query = target.partition("?")
+    return method.upper(), path, parse_qs(query), headers
+
+
+def write_response(writer, status, headers, body=b""):
+    out = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+    out += [f"{k}: {v}" for k, v in {**BASE_HEADERS, **headers}.items()]
+    writer.write(("\r\n".join(out) + "\r\n\r\n").encode("latin-1") + body)
+
+
+def _error(status, message, **extra):
+    body = json.dumps({"error": message, **extra}).encode()
+    return status, {"Content-Type": "application/json", "Cache-Control": "no-store",
+                    "Content-Length": str(len(body))}, body
+
+
+class DataServer:
+
+    def __init__(self, store):
+        self.store       = store
+        self.subscribers = set()     # asyncio.Queue per open /events stream
+        self.writers     = set()     # open connections, closed on shutdown
+        self.news_views  = {}        # ("AUD", "EUR") → (shard etags, Artifact)
+
+    # ── Change fan-out ────────────────────────────────────────────────────────
+
+    def publish(self, names):
+        for name in names:
+            artifact = self.store.artifacts.get(name)
+            event = {"path": "/" + name, "etag": artifact.etag if artifact else None}
+            print(f"[server] updated /{name}")
+            for queue in self.subscribers:
+                queue.put_nowait(event)
+
+    def _load_changed(self, paths):
+        changed = [self.store.load(p) for p in paths
+                   if p.suffix == ".json" and PUBLIC_DIR in p.parents]
+        return [n for n in changed if n]
+
+    async def _reload(self, paths):
+        self.publish(await asyncio.to_thread(self._load_changed, paths))
+
+    def on_daemon_change(self, job, paths):
+        # Called on the event loop — recompressing here would stall every client
+        asyncio.ensure_future(self._reload(paths))
+
+    async def poll(self):
+        while True:
+            await asyncio.sleep(POLL_INTERVAL_S)
+            changed = await asyncio.to_thread(self.store.scan)
+            if changed:
+                self.publish(changed)
+
+    # ── Handlers ──────────────────────────────────────────────────────────────
+
+    def serve_artifact(self, method, path, headers):
+        name = API_ROUTES.get(path) or path.lstrip("/")
+        if name == "" or name == "index.json":
+            return self.serve_index()
+        artifact = self.store.artifacts.get(name)
+        if artifact is None:
+            if name in VALIDATORS or path in API_ROUTES:
+                return _error(503, f"{name} not found or invalid",
+                              detail=self.store.errors.get(name, "missing"))
+            return _error(404, "not found")
+        return self.respond(method, artifact, headers)
+
+    def respond(self, method, artifact, headers):
+        common = {
+            "ETag":          artifact.etag,
+            "Last-Modified": artifact.last_modified,
+            "Cache-Control": "no-cache",
+            "Vary":          "Accept-Encoding",
+        }
+        inm = headers.get("if-none-match", "")
+        if inm == "*" or artifact.etag in (t.strip() for t in inm.split(",")):
+            return 304, common, b""
+
+        encoding, body = artifact.body_for(headers.get("accept-encoding"))
+        common["Content-Type"]   = "application/json"
+        common["Content-Length"] = str(len(body))
+        if encoding != "identity":
+            common["Content-Encoding"] = encoding
+        return 200, common, b"" if method == "HEAD" else body
+
+    def _build_news(self, ccys, shards):
+        """news-proxy.js's ?ccy= response, merged from the per-currency shards."""
+        seen, articles = set(), []
+        for shard in shards:
+            for a in json.loads(shard.bodies["identity"])["articles"]:
+                if a["link"] not in seen:
+                    seen.add(a["link"])
+                    articles.append(a)
+        articles.sort(key=lambda a: a.get("publishedAt") or "", reverse=True)
+        articles = articles[:80]
+        by_currency = {}
+        for a in articles:
+            for ccy in a["currencies"]:
+                if len(by_currency.setdefault(ccy, [])) < 8:
+                    by_currency[ccy].append(a)
+        fetched = max((json.loads(s.bodies["identity"]).get("fetchedAt") or "" for s in shards),
+                      default=None)
+        raw = json.dumps({"articles": articles, "byCurrency": by_currency, "total": len(articles),
+                          "currencies": list(ccys), "fetchedAt": fetched},
+                         separators=(",", ":")).encode()
+        return Artifact(f"news?ccy={','.join(ccys)}", raw, max((s.mtime for s in shards), default=0))
+
+    async def serve_news(self, method, query, headers):
+        """/api/news?ccy=AUD,EUR — cached per currency set until one of its shards changes."""
+        ccys = tuple(sorted({c.strip().upper() for v in query["ccy"] for c in v.split(",") if c.strip()}))
+        if not ccys:
+            return self.serve_artifact(method, "/api/news", headers)
+        if "news/all.json" not in self.store.artifacts:
+            return self.serve_artifact(method, "/api/news", headers)      # the usual 503
+        shards = [a for a in (self.store.artifacts.get(f"news/{c}.json") for c in ccys) if a]
+        etags  = tuple(a.etag for a in shards)
+        cached = self.news_views.get(ccys)
+        if cached is None or cached[0] != etags:
+            cached = self.news_views[ccys] = (etags, await asyncio.to_thread(self._build_news, ccys, shards))
+        return self.respond(method, cached[1], headers)
+
+    def serve_index(self):
+        body = json.dumps({
+            "artifacts": {
+                "/" + n: {"etag": a.etag,
+                          "modified": datetime.fromtimestamp(a.mtime, timezone.utc).isoformat()}
+                for n, a in sorted(self.store.artifacts.items())
+            },
+            "rejected": self.store.errors,
+            "routes":   API_ROUTES,
+        }, indent=2).encode()
+        return 200, {"Content-Type": "application/json", "Cache-Control": "no-store",
+                     "Content-Length": str(len(body))}, body
+
+    async def stream_events(self, writer):
+        queue = asyncio.Queue()
+        self.subscribers.add(queue)
+        write_response(writer, 200, {
+            "Content-Type":  "text/event-stream",
+            "Cache-Control": "no-store",
+            "Connection":    "keep-alive",
+        })
+        writer.write(b"retry: 5000\n\n")
+        try:
+            await writer.drain()
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_S)
+                    writer.write(f"event: artifact\ndata: {json.dumps(event)}\n\n".encode())
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                await writer.drain()
+        finally:
+            self.subscribers.discard(queue)
+
+    async def handle(self, reader, writer):
+        self.writers.add(writer)
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except ValueError as e:
+                    write_response(writer, *_error(400, str(e)))
+                    break
+                if request is None:
+                    break
+                method, path, query, headers = request
+
+                if method == "OPTIONS":
+                    write_response(writer, 204, {"Content-Length": "0"})
+                elif method not in ("GET", "HEAD"):
+                    write_response(writer, *_error(405, "method not allowed"))
+                elif path == "/events":
+                    await self.stream_events(writer)
+                    break
+                elif path == "/api/news" and "ccy" in query:
+                    write_response(writer, *await self.serve_news(method, query, headers))
+                else:
+                    write_response(writer, *self.serve_artifact(method, path, headers))
+
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    def close_connections(self):
+        for writer in list(self.writers):
+            writer.close()
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+async def serve(host, port, with_daemon):
+    store = ArtifactStore(PUBLIC_DIR)
+    store.scan()
+    print(f"Loaded {len(store.artifacts)} artifacts from {PUBLIC_DIR}"
+          + (f"  ({len(store.errors)} rejected)" if store.errors else ""))
+    print(f"Encodings: gzip{', br' if brotli else ''}")
+
+    app    = DataServer(store)
+    server = await asyncio.start_server(app.handle, host, port, limit=MAX_HEADER_BYTES)
+    stop   = asyncio.Event()
+    loop   = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    poller  = asyncio.create_task(app.poll())
+    waiters = [asyncio.create_task(stop.wait())]
+    if with_daemon:
+        # The daemon installs its own SIGINT/SIGTERM handlers; when it stops, so do we
+        import refresh_daemon
+        daemon = refresh_daemon.RefreshDaemon(refresh_daemon.select_jobs(None))
+        daemon.add_listener(app.on_daemon_change)
+        waiters.append(asyncio.create_task(daemon.run()))
+
+    print(f"Serving on http://{host}:{port}  (GET /events for change notifications)")
+    try:
+        await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        server.close()
+        app.close_connections()
+        for task in (poller, *waiters):
+            task.cancel()
+        await server.wait_closed()
+    print("Data server stopped")
+
+
+@profiling.profiled("data_server")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default=os.environ.get("DATA_SERVER_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("DATA_SERVER_PORT", 8787)))
+    parser.add_argument("--daemon", action="store_true",
+                        help="also run scripts/refresh_daemon.py in-process")
+    parser.add_argument("--profile", action="store_true", help="sample the whole process (see profiling.py)")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    asyncio.run(serve(args.host, args.port, args.daemon))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,166 +1,320 @@
 #!/usr/bin/env python3
 """
-fetch_atr.py — Calculate 14-day ATR for G10 FX pairs from Yahoo Finance
+fetch_atr.py — Calculate 14-day ATR for every instrument in the registry
 =======================================================================
 Runs via GitHub Actions weekly (Saturday) + on every push to main.
 No dependencies beyond stdlib + urllib.
 
+Input:  scripts/instruments.json  (symbol, Yahoo ticker, class, pip/tick size)
 Output: public/atr-data.json
 
-ATR (Average True Range) = mean of (high - low) over 14 sessions, in pips.
-Pip values:
-  JPY pairs: 1 pip = 0.01   (e.g. USD/JPY 149.50: 1 pip = 0.01 = ~$0.67)
-  All others: 1 pip = 0.0001
+ATR (Average True Range) = mean True Range over 14 sessions, in pips/points.
+Pip size comes from the registry, never from the symbol name:
+  EUR/USD  pip = 0.0001      USD/JPY  pip = 0.01
+  XAU/USD  point = 0.10      SPX      point = 1.0
 
-Volatility classification:
-  < 50  pips = low
-  50–89 pips = medium
-  90+   pips = high
+Volatility classification uses the per-class bands in the registry
+(FX: < 50 low, 50–89 medium, 90+ high).
+
+The same bars' last closes (plus the registry's conversion-only quotes,
+USD/SEK and USD/NOK) are kept as "spot", and feed the position-sizing
+grid in risk_grid.py: pip value per standard lot, ATR-multiple stops and
+lot sizes per risk % for every instrument in every G10 account currency.
+A spot that fails to download keeps its previous value.
+
+Nothing is written directly: validate.publish() checks the bars, ATRs and
+spots against the last artifact and its archived history first, and keeps
+the last good atr-data.json if anything looks wrong.
+
+Scaling: instruments are downloaded in batches of BATCH_SIZE on a pool of
+MAX_WORKERS threads; batches run one after another, so wall time grows
+with registry size ÷ MAX_WORKERS. The whole run is capped by one
+WALL_BUDGET_S deadline (retry sleeps and batch pauses included). Anything
+the budget cuts off uses its fallback and is reported in the step summary,
+and if that is more than MAX_BUDGET_CUT of the registry the run fails —
+raise ATR_WALL_BUDGET / ATR_MAX_WORKERS as the registry grows rather than
+quietly publishing fallbacks.
+
+Runs where no daily FX bar has closed since the last write (weekends, repeat
+pushes) exit before touching the network; pass --force (or FORCE_FETCH=1)
+to fetch regardless.
 """
 
 import json
+import os
 import sys
 import time
-import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from urllib.request import urlopen, Request
+from pathlib import Path
+from urllib.request import Request
 from urllib.error import URLError
 
-# ── Yahoo Finance ticker map ──────────────────────────────────────────
-PAIRS = {
-    'EUR/USD': 'EURUSD=X',
-    'GBP/USD': 'GBPUSD=X',
-    'USD/JPY': 'JPY=X',
-    'USD/CHF': 'CHF=X',
-    'USD/CAD': 'CAD=X',
-    'AUD/USD': 'AUDUSD=X',
-    'NZD/USD': 'NZDUSD=X',
-    'GBP/JPY': 'GBPJPY=X',
-}
+import fetch_metrics
+import profiling
+import risk_grid
+import validate
+from http_pool import urlopen
+from instruments import load_conversions, load_registry, pip_multiplier, vol_label
+from market_calendar import force_requested, fx_bar_due, parse_ts, read_artifact
 
-# ── Current ATR fallback (updated manually when automation is unavailable) ──
-# These were measured the week of Feb 24, 2026.
-FALLBACK = {
-    'EUR/USD': {'atr': 68,  'vol': 'medium'},
-    'GBP/USD': {'atr': 85,  'vol': 'medium'},
-    'USD/JPY': {'atr': 112, 'vol': 'high'},
-    'USD/CHF': {'atr': 58,  'vol': 'low'},
-    'USD/CAD': {'atr': 78,  'vol': 'medium'},
-    'AUD/USD': {'atr': 52,  'vol': 'low'},
-    'NZD/USD': {'atr': 48,  'vol': 'low'},
-    'GBP/JPY': {'atr': 145, 'vol': 'high'},
-}
+# ── Scaling knobs (env-overridable for local runs) ────────────────────
+MAX_WORKERS   = int(os.environ.get('ATR_MAX_WORKERS', 8))
+BATCH_SIZE    = int(os.environ.get('ATR_BATCH_SIZE', 25))
+BATCH_PAUSE   = 0.5     # polite pacing between batches, seconds
+WALL_BUDGET_S = float(os.environ.get('ATR_WALL_BUDGET', 120))
+MAX_BUDGET_CUT = float(os.environ.get('ATR_MAX_BUDGET_CUT', 0.05))   # share of the registry
 
-def pip_multiplier(pair: str) -> float:
-    """JPY pairs: 100 pips per 1.0; all others: 10,000 pips per 1.0"""
-    return 100.0 if 'JPY' in pair else 10_000.0
-
-
-def vol_label(pips: int) -> str:
-    if pips < 50:  return 'low'
-    if pips < 90:  return 'medium'
-    return 'high'
+HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (compatible; FX-Dashboard-ATR/1.0; '
+        '+https://github.com/actions/fetch-atr)'
+    ),
+}
 
 
-def fetch_atr(pair: str, ticker: str, retries: int = 3) -> dict | None:
+def fetch_bars(ticker: str, timeout: float = 12) -> list[tuple]:
     """
     Fetch 30 days of daily OHLC from Yahoo Finance chart API.
-    Returns {'atr': int_pips, 'vol': str} or None on failure.
+    Returns [(timestamp, high, low, close), ...] oldest first, gaps removed.
     """
     url = (
         f'https://query1.finance.yahoo.com/v8/finance/chart/{ticker}'
         f'?interval=1d&range=30d'
     )
-    headers = {
-        'User-Agent': (
-            'Mozilla/5.0 (compatible; FX-Dashboard-ATR/1.0; '
-            '+https://github.com/actions/fetch-atr)'
-        ),
-    }
+    with urlopen(Request(url, headers=HEADERS), timeout=timeout) as resp:
+        raw = resp.read()
+    with fetch_metrics.timed('parse', ticker):
+        data = json.loads(raw.decode())
+
+    result = data.get('chart', {}).get('result', [])
+    if not result:
+        raise ValueError('No result in Yahoo response')
+
+    timestamps = result[0].get('timestamp', [])
+    indicators = result[0].get('indicators', {})
+    quote       = indicators.get('quote', [{}])[0]
+    highs       = quote.get('high', [])
+    lows        = quote.get('low',  [])
+    closes      = quote.get('close',[])
+
+    # Filter None values (gaps / non-trading days)
+    return [
+        (t, h, l, c)
+        for t, h, l, c in zip(timestamps, highs, lows, closes)
+        if h is not None and l is not None and c is not None
+    ]
+
+
+def compute_atr(rows: list[tuple], inst: dict) -> dict:
+    """14-session ATR in the instrument's pip/point unit."""
+    if len(rows) < 2:
+        raise ValueError(f'Only {len(rows)} valid rows for {inst["symbol"]}')
+
+    # True Range = max(high-low, |high-prev_close|, |low-prev_close|)
+    trs = []
+    for i in range(1, len(rows)):
+        _, h, l, _ = rows[i]
+        prev_c      = rows[i - 1][3]
+        tr = max(h - l, abs(h - prev_c), abs(l - prev_c))
+        trs.append(tr)
+
+    # Use last 14 TR values for ATR
+    atr_raw  = sum(trs[-14:]) / min(14, len(trs))
+    atr_pips = max(1, round(atr_raw * pip_multiplier(inst)))
+
+    return {'atr': atr_pips, 'vol': vol_label(atr_pips, inst['volBands'])}
+
+
+class BudgetExhausted(Exception):
+    """The run's WALL_BUDGET_S ran out before this instrument was fetched."""
+
+
+def _pause(seconds: float, deadline: float, source: str):
+    """fetch_metrics.sleep, never past the deadline."""
+    seconds = min(seconds, deadline - time.monotonic())
+    if seconds > 0:
+        fetch_metrics.sleep(seconds, source)
 
+
+def fetch_instrument(inst: dict, deadline: float, retries: int = 3) -> list[tuple] | None:
+    """
+    Fetch daily bars for one registry instrument, retrying short or failed reads.
+    Returns [(timestamp, high, low, close), ...] or None on failure; raises
+    BudgetExhausted when the deadline cuts it off before a successful read.
+    """
+    symbol = inst['symbol']
     for attempt in range(retries):
+        remaining = deadline - time.monotonic()
+        if remaining <= 1:
+            print(f'  [{symbol}] wall budget exhausted', file=sys.stderr)
+            raise BudgetExhausted(symbol)
         try:
-            req = Request(url, headers=headers)
-            with urlopen(req, timeout=12) as resp:
-                data = json.loads(resp.read().decode())
-
-            result = data.get('chart', {}).get('result', [])
-            if not result:
-                raise ValueError('No result in Yahoo response')
-
-            indicators = result[0].get('indicators', {})
-            quote       = indicators.get('quote', [{}])[0]
-            highs       = quote.get('high', [])
-            lows        = quote.get('low',  [])
-            closes      = quote.get('close',[])
-
-            # Filter None values (gaps / non-trading days)
-            rows = [
-                (h, l, c)
-                for h, l, c in zip(highs, lows, closes)
-                if h is not None and l is not None and c is not None
-            ]
-
+            rows = fetch_bars(inst['yahoo'], timeout=min(12, remaining))
             if len(rows) < 2:
-                raise ValueError(f'Only {len(rows)} valid rows for {pair}')
+                raise ValueError(f'Only {len(rows)} valid rows')
+            return rows
 
-            # True Range = max(high-low, |high-prev_close|, |low-prev_close|)
-            trs = []
-            for i in range(1, len(rows)):
-                h, l, _ = rows[i]
-                prev_c   = rows[i - 1][2]
-                tr = max(h - l, abs(h - prev_c), abs(l - prev_c))
-                trs.append(tr)
+        except (URLError, TimeoutError, ValueError, KeyError) as e:
+            print(f'  [{symbol}] attempt {attempt + 1} failed: {e}', file=sys.stderr)
+            fetch_metrics.retry(symbol, attempt + 1, e)
+            if attempt < retries - 1:
+                _pause(2, deadline, symbol)
 
-            # Use last 14 TR values for ATR
-            atr_raw = sum(trs[-14:]) / min(14, len(trs))
-            atr_pips = max(1, round(atr_raw * pip_multiplier(pair)))
+    return None
 
-            return {'atr': atr_pips, 'vol': vol_label(atr_pips)}
 
-        except (URLError, ValueError, KeyError) as e:
-            print(f'  [{pair}] attempt {attempt + 1} failed: {e}', file=sys.stderr)
-            if attempt < retries - 1:
-                time.sleep(4)
+def fetch_all(instruments: list[dict], deadline: float) -> tuple[dict, list[str]]:
+    """
+    Run fetch_instrument over the registry in batches on a bounded thread pool.
+    Batches are submitted one at a time so a throttled upstream sees at most
+    MAX_WORKERS concurrent requests and a short pause between bursts.
+    Returns (bars by symbol, symbols the wall budget cut off).
+    """
+    results, cut = {}, []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for start in range(0, len(instruments), BATCH_SIZE):
+            batch = instruments[start:start + BATCH_SIZE]
+            if time.monotonic() >= deadline:
+                cut += [inst['symbol'] for inst in batch]
+                continue
+            futures = {pool.submit(fetch_metrics.bind(fetch_instrument), inst, deadline): inst for inst in batch}
+            for fut in as_completed(futures):
+                symbol = futures[fut]['symbol']
+                try:
+                    results[symbol] = fut.result()
+                except BudgetExhausted:
+                    results[symbol] = None
+                    cut.append(symbol)
+            if start + BATCH_SIZE < len(instruments):
+                _pause(BATCH_PAUSE, deadline, 'batch pause')
+    return results, cut
+
+
+def report_budget_cut(cut: list[str], total: int) -> bool:
+    """Warn (step summary included) about budget-cut symbols; True if over MAX_BUDGET_CUT."""
+    if not cut:
+        return False
+    over = len(cut) > MAX_BUDGET_CUT * total
+    line = (f'{len(cut)}/{total} instruments not fetched within the {WALL_BUDGET_S:.0f}s '
+            f'wall budget: {", ".join(sorted(cut))}')
+    print(f"{'ERROR' if over else 'WARNING'}: {line}", file=sys.stderr)
+    if os.environ.get('GITHUB_STEP_SUMMARY'):
+        with open(os.environ['GITHUB_STEP_SUMMARY'], 'a') as f:
+            f.write(f"### atr wall budget\n\n**{'error' if over else 'warning'}** {line}\n\n")
+    return over
 
+
+def latest_spots(entries: list[dict], bars: dict, previous: dict) -> dict:
+    """
+    Last close per FX / conversion symbol; previous values stand in for
+    failed downloads so the risk grid always covers every account currency.
+    """
+    spot = {}
+    for entry in entries:
+        if entry.get('class', 'fx') != 'fx':
+            continue
+        symbol = entry['symbol']
+        rows   = bars.get(symbol)
+        if rows:
+            spot[symbol] = rows[-1][3]
+        elif previous.get(symbol):
+            spot[symbol] = previous[symbol]
+            print(f'  {symbol:<8} spot carried over ({previous[symbol]})')
+    return spot
+
+
+def refresh_reason(previous: dict | None, instruments: list[dict]) -> str | None:
+    """Why a network run is needed, or None if atr-data.json is already current."""
+    if not previous:
+        return 'no existing atr-data.json'
+    if previous.get('fallbackUsed') or previous.get('missing'):
+        return 'last run used fallback values'
+    if 'riskGrid' not in previous:
+        return 'no risk grid yet'
+    new = [i['symbol'] for i in instruments if i['symbol'] not in previous.get('atr', {})]
+    if new:
+        return f'new registry instruments: {", ".join(new)}'
+    if fx_bar_due(parse_ts(previous.get('fetchedAt'))):
+        return 'a daily bar has closed since last fetch'
     return None
 
 
+@profiling.profiled('atr')
+@fetch_metrics.instrumented('atr')
 def main():
-    output_path = 'public/atr-data.json'
+    output_path = Path(__file__).parent.parent / 'public' / 'atr-data.json'
+    instruments = load_registry()
+    conversions = load_conversions()
+    previous    = read_artifact(output_path)
+
+    reason = 'forced' if force_requested() else refresh_reason(previous, instruments)
+    if not reason:
+        print('SKIP: no daily bar has closed since atr-data.json was written')
+        return
+    print(f'Refreshing ATR ({reason})')
+
+    deadline    = time.monotonic() + WALL_BUDGET_S
+
+    print(f'Fetching 14-day ATR for {len(instruments)} instruments '
+          f'({MAX_WORKERS} workers, batches of {BATCH_SIZE}, {WALL_BUDGET_S:.0f}s budget)...')
+    with profiling.phase('fetch'):
+        bars, cut = fetch_all(instruments + conversions, deadline)
+
+    with profiling.phase('compute'):
+        fetched = {inst['symbol']: compute_atr(bars[inst['symbol']], inst)
+                   for inst in instruments if bars.get(inst['symbol'])}
 
-    print(f'Fetching 14-day ATR for {len(PAIRS)} pairs...')
     results  = {}
     fallback_used = []
+    missing  = []
 
-    for pair, ticker in PAIRS.items():
-        print(f'  {pair} ({ticker})...', end=' ', flush=True)
-        data = fetch_atr(pair, ticker)
+    for inst in instruments:
+        symbol = inst['symbol']
+        data   = fetched.get(symbol)
         if data:
-            results[pair] = data
-            print(f"{data['atr']} pips ({data['vol']})")
+            results[symbol] = data
+            print(f"  {symbol:<8} {data['atr']} {inst['unit']} ({data['vol']})")
+        elif inst.get('fallback'):
+            results[symbol] = inst['fallback']
+            fallback_used.append(symbol)
+            print(f"  {symbol:<8} FALLBACK {inst['fallback']['atr']} {inst['unit']}")
         else:
-            results[pair] = FALLBACK[pair]
-            fallback_used.append(pair)
-            print(f"FALLBACK {FALLBACK[pair]['atr']} pips")
-        time.sleep(0.8)   # polite pacing
+            missing.append(symbol)
+            print(f'  {symbol:<8} FAILED (no fallback)')
+
+    with profiling.phase('compute'):
+        spot  = latest_spots(instruments + conversions, bars, (previous or {}).get('spot', {}))
+        rates = risk_grid.Rates({(i['base'], i['quote']): spot.get(i['symbol'])
+                                 for i in instruments + conversions if i['symbol'] in spot})
+        grid  = risk_grid.build_grid(instruments, results, rates)
+    print(f"  risk grid: {len(grid['pairs'])} instruments × {len(grid['accounts'])} account currencies")
 
     payload = {
         'atr':          results,
+        'spot':         spot,
+        'riskGrid':     grid,
         'fetchedAt':    datetime.now(timezone.utc).isoformat(),
         'fallbackUsed': fallback_used,
     }
+    if missing:
+        payload['missing'] = missing
 
-    with open(output_path, 'w') as f:
-        json.dump(payload, f, indent=2)
+    with profiling.phase('write'):
+        validate.publish('atr', {output_path: payload}, context={'bars': bars})
 
     print(f'\nWrote {output_path}')
     if fallback_used:
         print(f'WARNING: fallback used for: {", ".join(fallback_used)}')
+    if missing:
+        print(f'WARNING: no data for: {", ".join(missing)}')
 
-    # Exit 1 if ALL pairs fell back (likely a connectivity issue worth surfacing)
-    if len(fallback_used) == len(PAIRS):
-        print('ERROR: all pairs used fallback — likely network failure', file=sys.stderr)
+    # Exit 1 if NOTHING was fetched live (likely a connectivity issue worth surfacing)
+    if len(fallback_used) + len(missing) == len(instruments):
+        print('ERROR: every instrument failed — likely network failure', file=sys.stderr)
+        sys.exit(1)
+    # ...or if the registry has outgrown the wall budget
+    if report_budget_cut(cut, len(instruments) + len(conversions)):
         sys.exit(1)
 
 
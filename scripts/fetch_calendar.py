@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Fetch this week's and next week's economic calendar and write public/calendar.json.
+
+Runs via GitHub Actions every 30 minutes on weekdays. Replaces the work
+netlify/functions/calendar-proxy.js repeats on every cold start (fetch both
+ForexFactory weeks, normalise, filter, group by currency) with one job that
+keeps a persistent event store and publishes a precomputed file.
+
+Both weeks are fetched concurrently and merged into data/calendar-store.json,
+keyed by event ID (currency + title + ISO week + occurrence within that week).
+The scheduled time is deliberately not part of the key: when FF reschedules
+an event it keeps its ID and the new date / time arrive as a delta like
+actual / forecast / previous, so a run where nothing changed rewrites nothing.
+
+Output: public/calendar.json — same shape as /api/calendar
+  { "events": [...], "byCurrency": { "AUD": [...], ... }, "total": N, "fetchedAt": "..." }
+
+Uses urllib only (stdlib).
+"""
+
+import hashlib
+import json
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import http_pool
+import profiling
+
+ROOT        = Path(__file__).parent.parent
+OUTPUT_PATH = ROOT / "public" / "calendar.json"
+STORE_PATH  = ROOT / "data" / "calendar-store.json"
+
+G10   = {"AUD", "USD", "EUR", "GBP", "JPY", "CHF", "CAD", "NZD"}
+WEEKS = ["this", "next"]
+
+# Fields that can change after an event is first listed
+DELTA_FIELDS = ("time", "date", "isoDate", "forecast", "previous", "actual", "impact")
+
+STORE_DAYS = 14   # keep last week's events so late actuals still merge
+STORE_VERSION = 2  # bump when event_id() changes — older stores are rebuilt
+
+
+# ── Normalisation (mirrors calendar-proxy.js) ─────────────────────────────────
+
+def normalise_impact(value):
+    s = (value or "").lower()
+    if "high" in s:                        return "high"
+    if "medium" in s or "moderate" in s:   return "medium"
+    return "low"
+
+
+def _parse_iso(value):
+    try:
+        dt = datetime.fromisoformat((value or "").replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).astimezone(timezone.utc)
+
+
+# en-AU short names, as toLocaleDateString('en-AU') prints them in the proxy
+_DAYS   = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "June", "July", "Aug", "Sept", "Oct", "Nov", "Dec")
+
+
+def fmt_date(value):
+    """"Tue, 20 Oct" — identical to calendar-proxy.js's fmtDate."""
+    dt = _parse_iso(value)
+    if not dt:
+        return value or ""
+    return f"{_DAYS[dt.weekday()]}, {dt.day} {_MONTHS[dt.month - 1]}"
+
+
+def fmt_time(value):
+    dt = _parse_iso(value)
+    if not dt:
+        return ""
+    if dt.hour == 0 and dt.minute == 0:
+        return "All Day"
+    hh = dt.hour % 12 or 12
+    return f"{hh}:{dt.minute:02d}{'am' if dt.hour < 12 else 'pm'} UTC"
+
+
+def iso_week(dt):
+    year, week, _ = dt.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def event_id(currency, title, week, occurrence=0):
+    # FF has no stable id. Title + week survives a reschedule within the week;
+    # occurrence tells apart same-titled releases in one week (e.g. two speeches)
+    key = f"{currency}|{title}|{week}|{occurrence}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def transform(raw_events):
+    """Filter to medium/high-impact G10 events and normalise into dashboard rows."""
+    rows = []
+    for e in raw_events:
+        currency = (e.get("country") or "").upper()
+        impact   = normalise_impact(e.get("impact"))
+        if currency not in G10 or impact not in ("high", "medium"):
+            continue
+        title = (e.get("title") or "").strip()
+        # Normalise to UTC so both FF URL variants produce the same event id
+        dt    = _parse_iso(e.get("date"))
+        iso   = dt.isoformat() if dt else (e.get("date") or None)
+        rows.append((dt, {
+            "currency": currency,
+            "date":     fmt_date(iso),
+            "time":     fmt_time(iso),
+            "isoDate":  iso,
+            "event":    title,
+            "impact":   impact,
+            "forecast": e.get("forecast") or "—",
+            "previous": e.get("previous") or "—",
+            "actual":   e.get("actual") or None,
+        }))
+
+    # Number same-titled events per currency and week in schedule order
+    seen = {}
+    for dt, row in sorted(rows, key=lambda r: r[1]["isoDate"] or ""):
+        group = (row["currency"], row["event"], iso_week(dt) if dt else None)
+        occurrence = seen[group] = seen.get(group, -1) + 1
+        yield {"id": event_id(*group, occurrence), **row}
+
+
+# ── Fetch ─────────────────────────────────────────────────────────────────────
+
+def fetch_ff_week(which, timeout=15):
+    urls = [
+        f"https://nfs.faireconomy.media/ff_calendar_{which}week.json?timezone=UTC",
+        f"https://nfs.faireconomy.media/ff_calendar_{which}week.json",
+    ]
+    last_error = None
+    for url in urls:
+        try:
+            req = urllib.request.Request(
+                url,
+                headers={
+                    "User-Agent": "Mozilla/5.0 (compatible; FXDashboard/2.0)",
+                    "Accept":     "application/json, */*",
+                    "Referer":    "https://www.forexfactory.com/",
+                }
+            )
+            with http_pool.urlopen(req, timeout=timeout) as resp:
+                data = json.loads(resp.read().decode("utf-8"))
+            if not isinstance(data, list):
+                raise ValueError("Not an array")
+            return data
+        except (urllib.error.URLError, ValueError, TimeoutError) as e:
+            last_error = e
+    raise RuntimeError(f"FF {which}week: {last_error}")
+
+
+# ── Store ─────────────────────────────────────────────────────────────────────
+
+def load_store():
+    try:
+        with open(STORE_PATH) as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if doc.get("version") != STORE_VERSION:
+        print("  Store written with older event IDs — rebuilding from the feed")
+        return {}
+    return doc.get("events", {})
+
+
+def merge(store, fresh, now):
+    """Apply fresh rows to the store as deltas. Returns (added, updated)."""
+    added = updated = 0
+    for row in fresh:
+        cur = store.get(row["id"])
+        if cur is None:
+            store[row["id"]] = {**row, "updatedAt": now}
+            added += 1
+            continue
+        delta = {k: row[k] for k in DELTA_FIELDS if row[k] != cur.get(k)}
+        if delta:
+            cur.update(delta, updatedAt=now)
+            updated += 1
+    return added, updated
+
+
+def prune(store, now):
+    cutoff = now - timedelta(days=STORE_DAYS)
+    for eid in [eid for eid, e in store.items()
+                if (_parse_iso(e.get("isoDate")) or now) < cutoff]:
+        del store[eid]
+
+
+def build_payload(store, now):
+    """Events from this week's Monday onwards, time-ordered and indexed by currency."""
+    monday = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    events = sorted(
+        (e for e in store.values() if (_parse_iso(e.get("isoDate")) or now) >= monday),
+        key=lambda e: e.get("isoDate") or "",
+    )
+    by_currency = {}
+    for e in events:
+        by_currency.setdefault(e["currency"], []).append(e)
+    return {"events": events, "byCurrency": by_currency, "total": len(events)}
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+@profiling.profiled("calendar")
+def main():
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    print("Fetching ForexFactory calendar (this + next week)...")
+
+    def work(which):
+        try:
+            return which, fetch_ff_week(which), None
+        except RuntimeError as e:
+            return which, [], str(e)
+
+    with profiling.phase("fetch"), ThreadPoolExecutor(max_workers=len(WEEKS)) as pool:
+        results = list(pool.map(work, WEEKS))
+
+    raw, errors = [], []
+    for which, data, error in results:
+        if error:
+            errors.append(error)
+            print(f"  WARN {error}")
+        else:
+            raw.extend(data)
+            print(f"  OK  [{which}week] {len(data)} raw events")
+
+    if not raw:
+        print(f"FATAL: ForexFactory calendar unavailable. Errors: {errors}")
+        if OUTPUT_PATH.exists():
+            print("Keeping existing calendar.json")
+            sys.exit(0)
+        sys.exit(1)
+
+    now   = datetime.now(timezone.utc)
+    store = load_store()
+    with profiling.phase("compute"):
+        added, updated = merge(store, transform(raw), now.isoformat())
+        before = len(store)
+        prune(store, now)
+        removed = before - len(store)
+
+    with open(STORE_PATH, "w") as f:
+        json.dump({"version": STORE_VERSION, "events": store}, f, separators=(",", ":"))
+
+    print(f"  Store: +{added} new, {updated} updated, -{removed} expired  ({len(store)} total)")
+    if not (added or updated or removed) and OUTPUT_PATH.exists():
+        print("\nNo changes — calendar.json unchanged")
+        return
+
+    with profiling.phase("compute"):
+        result = {**build_payload(store, now), "fetchedAt": now.isoformat()}
+    if errors:
+        result["errors"] = errors
+
+    with profiling.phase("write"), open(OUTPUT_PATH, "w") as f:
+        json.dump(result, f, separators=(",", ":"))
+
+    print(f"\nWrote {OUTPUT_PATH}")
+    print(f"  {result['total']} events  |  " +
+          "  ".join(f"{c}:{len(v)}" for c, v in sorted(result["byCurrency"].items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,18 @@ and write public/cb-rates.json.
 
 Runs via GitHub Actions on a schedule (weekly) AND on every push to main,
 so rates update automatically after each CB meeting once the site is redeployed.
+Runs with no G10 decision since the last scrape (see market_calendar.CB_MEETINGS)
+exit before touching the network, unless the last scrape is over CB_MAX_AGE_DAYS
+old; pass --force (or FORCE_FETCH=1) to scrape anyway. Once a currency has no
+future meeting listed every run warns (Actions annotation + step summary)
+until the table is updated.
 
 Uses urllib only (stdlib) — no pip install needed.
 
+Beyond the 5-currency minimum, validate.publish() gates the write: rates
+must parse as plausible percentages, no currency may drop out, and a move
+bigger than the rate's history allows keeps the last good cb-rates.json.
+
 Output: public/cb-rates.json
   {
     "rates": {
@@ -20,15 +29,21 @@ Output: public/cb-rates.json
   }
 """
 
-import json
+import os
 import sys
-import time
 import urllib.request
 import urllib.error
 from datetime import datetime, timezone
 from html.parser import HTMLParser
 from pathlib import Path
 
+import fetch_metrics
+import http_pool
+import profiling
+import validate
+from market_calendar import (CB_MAX_AGE_DAYS, cb_decision_due, cb_schedule_exhausted,
+                             force_requested, parse_ts, read_artifact)
+
 
 # ── Target currencies ─────────────────────────────────────────────────────────
 # Maps the "Country/Region" column text in global-rates.com table → CCY code
@@ -149,8 +164,8 @@ def http_get_html(url, timeout=20):
             "Cache-Control":   "no-cache",
         }
     )
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        # Follow redirects (urlopen does this automatically)
+    with http_pool.urlopen(req, timeout=timeout) as resp:
+        # Follow redirects (http_pool.urlopen does this automatically)
         html = resp.read().decode("utf-8", errors="replace")
     return html
 
@@ -162,7 +177,8 @@ def scrape_global_rates(retries=3, delay=4):
     for attempt in range(1, retries + 1):
         try:
             print(f"  Attempt {attempt}/{retries}: GET {URL}")
-            html = http_get_html(URL)
+            with profiling.phase("fetch"):
+                html = http_get_html(URL)
 
             if len(html) < 5000:
                 raise ValueError(f"Response suspiciously short ({len(html)} chars) — likely blocked")
@@ -170,8 +186,9 @@ def scrape_global_rates(retries=3, delay=4):
             if "Central Bank" not in html and "central-bank" not in html:
                 raise ValueError("Expected page content not found — URL may have changed")
 
-            parser = CBRateParser()
-            parser.feed(html)
+            with profiling.phase("parse"), fetch_metrics.timed("parse", "CBRateParser"):
+                parser = CBRateParser()
+                parser.feed(html)
 
             found = len(parser.rates)
             if found < 5:
@@ -186,26 +203,57 @@ def scrape_global_rates(retries=3, delay=4):
         except urllib.error.HTTPError as e:
             last_error = f"HTTP {e.code}: {e.reason}"
             print(f"  WARN attempt {attempt}: {last_error}")
+            fetch_metrics.retry("global-rates.com", attempt, last_error)
         except urllib.error.URLError as e:
             last_error = f"URLError: {e.reason}"
             print(f"  WARN attempt {attempt}: {last_error}")
+            fetch_metrics.retry("global-rates.com", attempt, last_error)
         except Exception as e:
             last_error = str(e)
             print(f"  WARN attempt {attempt}: {last_error}")
+            fetch_metrics.retry("global-rates.com", attempt, last_error)
 
         if attempt < retries:
             print(f"  Waiting {delay}s before retry...")
-            time.sleep(delay)
+            fetch_metrics.sleep(delay, "global-rates.com")
 
     raise RuntimeError(f"All {retries} attempts failed. Last error: {last_error}")
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
+def warn_schedule_exhausted():
+    """Loud, non-fatal: the skip logic falls back to CB_MAX_AGE_DAYS meanwhile."""
+    stale = cb_schedule_exhausted()
+    if not stale:
+        return
+    msg = (f"market_calendar.CB_MEETINGS lists no upcoming decision for {', '.join(stale)} — "
+           f"update it; until then cb-rates.json refreshes only every {CB_MAX_AGE_DAYS} days")
+    print(f"::warning title=CB meeting calendar out of date::{msg}")
+    if os.environ.get("GITHUB_STEP_SUMMARY"):
+        with open(os.environ["GITHUB_STEP_SUMMARY"], "a") as f:
+            f.write(f"### cb_rates\n\n**warning** {msg}\n\n")
+
+
+@profiling.profiled("cb_rates")
+@fetch_metrics.instrumented("cb_rates")
 def main():
     output_path = Path(__file__).parent.parent / "public" / "cb-rates.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Rates only change at scheduled meetings — skip the scrape otherwise
+    warn_schedule_exhausted()
+    previous = read_artifact(output_path) or {}
+    if not force_requested() and previous.get("source") == "global-rates.com":
+        due = cb_decision_due(parse_ts(previous.get("fetchedAt")))
+        if not due:
+            print("SKIP: no G10 rate decision since cb-rates.json was written")
+            return
+        if due == [("*", None)]:
+            print(f"Last scrape is over {CB_MAX_AGE_DAYS} days old (or undated)")
+        else:
+            print("Decisions since last fetch: " + ", ".join(f"{c} {d}" for c, d in due))
+
     print("Fetching CB rates from global-rates.com...")
 
     scraped = {}
@@ -237,8 +285,8 @@ def main():
     if scrape_error:
         result["scrapeError"] = scrape_error
 
-    with open(output_path, "w") as f:
-        json.dump(result, f, indent=2)
+    with profiling.phase("write"):
+        validate.publish("cb_rates", {output_path: result})
 
     print(f"\nWrote {output_path}")
     for ccy, rate in rates.items():
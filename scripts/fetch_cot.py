@@ -1,18 +1,40 @@
 #!/usr/bin/env python3
 """
-Fetch CFTC COT data and write public/cot-data.json.
+Fetch CFTC COT data and write public/cot-data.json and public/cot-pairs.json.
 
-Runs via GitHub Actions every Friday at 4:30pm ET (21:30 UTC).
+Runs via GitHub Actions every Friday at 4:30pm ET (21:30 UTC), with Monday
+and Tuesday retries for holiday weeks. market_calendar decides whether a new
+report can exist yet; if not, the run exits before touching the network.
+Pass --force (or FORCE_FETCH=1) to fetch regardless.
 Uses urllib (stdlib only) — no pip install needed, URL sent exactly as-is.
+
+One request pulls HISTORY_WEEKS of reports for the tracked contracts. The
+latest two give cot-data.json; the whole history gives cot-pairs.json, the
+G10 pair matrix of positioning differentials (base net − quote net, in
+points of % OI) with week-over-week change and historical percentile:
+
+  { "fields": ["diff", "change", "pct"],
+    "pairs":  { "EUR/USD": [-20, 3, 12], "GBP/JPY": [-2, -9, 48], ... } }
+
+Pairs use market quoting order (EUR/USD, never USD/EUR); the inverse is
+the negated diff and change, and 100 − pct.
 """
 
 import json
 import sys
+import urllib.parse
 import urllib.request
 import urllib.error
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timezone
 from pathlib import Path
 
+import fetch_metrics
+import http_pool
+import profiling
+import validate
+from market_calendar import cot_release_due, force_requested, next_cot_release, parse_ts, read_artifact
+
 CONTRACTS = {
     "EURO FX - CHICAGO MERCANTILE EXCHANGE":                "EUR",
     "JAPANESE YEN - CHICAGO MERCANTILE EXCHANGE":           "JPY",
@@ -25,7 +47,14 @@ CONTRACTS = {
     "GOLD - COMMODITY EXCHANGE INC.":                       "XAU",
 }
 
-# Using urllib.request — does NOT re-encode the URL string.
+HISTORY_WEEKS = 156     # three years of weekly reports per contract
+
+# Market quoting order: the earlier currency is the base (EUR/USD, GBP/JPY, AUD/NZD)
+QUOTE_ORDER = ["EUR", "GBP", "AUD", "NZD", "USD", "CAD", "CHF", "JPY"]
+PAIR_I, PAIR_J = zip(*[(i, j) for i in range(len(QUOTE_ORDER)) for j in range(i + 1, len(QUOTE_ORDER))])
+PAIR_NAMES = [f"{QUOTE_ORDER[i]}/{QUOTE_ORDER[j]}" for i, j in zip(PAIR_I, PAIR_J)]
+
+# Using http_pool (http.client underneath) — does NOT re-encode the URL string.
 # requests.get(url_string) silently normalises/re-encodes even pre-encoded URLs.
 
 def http_get(url):
@@ -36,8 +65,10 @@ def http_get(url):
             "Accept":     "application/json",
         }
     )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    with http_pool.urlopen(req, timeout=30) as resp:
+        raw = resp.read()
+    with fetch_metrics.timed("parse", "json"):
+        return json.loads(raw.decode("utf-8"))
 
 
 def fetch_all_rows():
@@ -51,11 +82,15 @@ def fetch_all_rows():
         "noncomm_positions_long_all",
         "noncomm_positions_short_all",
     ])
+    # Only the tracked contracts, so the limit buys history rather than other markets
+    names = ",".join(f"'{name}'" for name in CONTRACTS)
+    where = urllib.parse.quote(f"market_and_exchange_names in({names})", safe="(),'")
     url = (
         "https://publicreporting.cftc.gov/resource/6dca-aqww.json"
         f"?$order=report_date_as_yyyy_mm_dd%20DESC"
-        f"&$limit=500"
+        f"&$limit={len(CONTRACTS) * HISTORY_WEEKS}"
         f"&$select={cols}"
+        f"&$where={where}"
     )
     print(f"  GET {url}")
     data = http_get(url)
@@ -119,13 +154,77 @@ def parse_rows(rows):
     return cot, as_of, errors
 
 
+def weekly_history(rows):
+    """Report dates (oldest first) and net % of OI per QUOTE_ORDER currency, forward-filled."""
+    by_date = {}
+    for row in rows:
+        ccy = CONTRACTS.get(row.get("market_and_exchange_names", ""))
+        if ccy not in QUOTE_ORDER:
+            continue
+        net = calc_net(row.get("open_interest_all"),
+                       row.get("noncomm_positions_long_all"),
+                       row.get("noncomm_positions_short_all"))
+        if net is not None:
+            by_date.setdefault(row.get("report_date_as_yyyy_mm_dd", "")[:10], {})[ccy] = net
+
+    dates, history, last = sorted(by_date), [], {}
+    for d in dates:
+        last = {**last, **by_date[d]}
+        history.append([last.get(ccy) for ccy in QUOTE_ORDER])
+    return dates, history
+
+
+def _sub(a, b):
+    return None if a is None or b is None else a - b
+
+
+def pair_matrix(history):
+    """
+    {pair: [diff, change, pct]} for the latest week.
+
+    Each week's differences are gathered straight into the 28 pairs through
+    the PAIR_I/PAIR_J index vectors; the transpose then gives each pair's
+    full history as one column, so the change and percentile are reads off
+    that column. With numpy this would be one broadcast (X[:, PAIR_I] -
+    X[:, PAIR_J]), but the fetchers are stdlib-only, so it stays a
+    comprehension — ~156 weeks × 28 pairs is well under a millisecond.
+    """
+    diffs   = [[_sub(week[i], week[j]) for i, j in zip(PAIR_I, PAIR_J)] for week in history]
+    columns = zip(*diffs)
+
+    pairs = {}
+    for name, column in zip(PAIR_NAMES, columns):
+        now = column[-1]
+        if now is None:
+            continue
+        prev   = column[-2] if len(column) > 1 and column[-2] is not None else now
+        ranked = sorted(v for v in column if v is not None)
+        # Mid-rank, so a value tied with half the history sits at the 50th
+        pct    = 100 * (bisect_left(ranked, now) + bisect_right(ranked, now)) / (2 * len(ranked))
+        pairs[name] = [now, now - prev, round(pct)]
+    return pairs
+
+
+@profiling.profiled("cot")
+@fetch_metrics.instrumented("cot")
 def main():
     output_path = Path(__file__).parent.parent / "public" / "cot-data.json"
+    pairs_path  = output_path.parent / "cot-pairs.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Skip the network entirely until the next report is actually published
+    previous   = read_artifact(output_path) or {}
+    last_as_of = parse_ts(previous.get("asOf"))
+    last_as_of = last_as_of.date() if last_as_of else None
+    if (not force_requested() and previous.get("cot") and (read_artifact(pairs_path) or {}).get("pairs")
+            and not cot_release_due(last_as_of)):
+        print(f"SKIP: report after {last_as_of} not due until {next_cot_release(last_as_of):%a %Y-%m-%d %H:%M} UTC")
+        return
+
     print("Fetching COT data from CFTC Socrata...")
     try:
-        rows = fetch_all_rows()
+        with profiling.phase("fetch"):
+            rows = fetch_all_rows()
     except urllib.error.HTTPError as e:
         body = e.read(500).decode("utf-8", errors="replace")
         print(f"FATAL: HTTP {e.code} {e.reason}")
@@ -141,7 +240,12 @@ def main():
             sys.exit(0)
         sys.exit(1)
 
-    cot, as_of, errors = parse_rows(rows)
+    with profiling.phase("parse"), fetch_metrics.timed("parse", "parse_rows"):
+        cot, as_of, errors = parse_rows(rows)
+        dates, history     = weekly_history(rows)
+
+    with profiling.phase("compute"):
+        pairs = pair_matrix(history)
 
     if not cot:
         print(f"FATAL: Parsed 0 contracts. Errors: {errors}")
@@ -160,11 +264,22 @@ def main():
     if errors:
         result["errors"] = errors
 
-    with open(output_path, "w") as f:
-        json.dump(result, f, indent=2)
+    pairs_result = {
+        "fields":    ["diff", "change", "pct"],
+        "pairs":     pairs,
+        "asOf":      as_of,
+        "weeks":     len(dates),
+        "from":      dates[0] if dates else None,
+        "fetchedAt": result["fetchedAt"],
+    }
+
+    with profiling.phase("write"):
+        validate.publish("cot", {output_path: result, pairs_path: pairs_result}, compact=[pairs_path])
 
     print(f"\nWrote {output_path}")
     print(f"  {len(cot)}/9 contracts  |  asOf: {as_of}")
+    print(f"Wrote {pairs_path}")
+    print(f"  {len(pairs)}/{len(PAIR_NAMES)} pairs  |  {len(dates)} weeks of history")
     if errors:
         print(f"  Errors: {errors}")
 
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Pre-fetch US macro series from FRED and write public/macro.json.
+
+Runs via GitHub Actions every weekday after the 8:30am ET US data window.
+Replaces per-browser FRED calls: one job pulls every series once, and the
+Netlify CDN serves the compact result to every viewer.
+
+Needs FRED_API_KEY in the environment (GitHub secret). Uses urllib only.
+
+Incremental: data/macro-history.json keeps recent observations per series.
+Each run only requests observations since the last stored date, minus a
+revision window (CPI/NFP/PCE are revised for ~2 months after release), and
+merges them in by date. With nothing stored yet it asks for HISTORY_DAYS
+back — everything older would be trimmed straight away.
+
+Output: public/macro.json
+  {
+    "fed":    { "lower": 3.5, "upper": 3.75, "effective": 3.58, "asOf": "..." },
+    "yields": { "m1": 4.1, ..., "US10Y": 4.42, "spread2s10s": 24, "asOf": "..." },
+    "usMacro": {
+      "cpi":          { "v": 2.9,  "prev": 2.7, "asOf": "2026-09-01" },   # YoY %
+      "coreCpi":      { ... }, "pce": { ... }, "corePCE": { ... },
+      "unemployment": { "v": 4.3,  "prev": 4.2, "asOf": "2026-09-01" },   # %
+      "nfp":          { "v": 142,  "prev": 89,  "asOf": "2026-09-01" }    # MoM change, k
+    },
+    "source": "FRED", "fetchedAt": "..."
+  }
+"""
+
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import http_pool
+import profiling
+import validate
+
+ROOT         = Path(__file__).parent.parent
+OUTPUT_PATH  = ROOT / "public" / "macro.json"
+HISTORY_PATH = ROOT / "data" / "macro-history.json"
+
+API_URL      = "https://api.stlouisfed.org/fred/series/observations"
+MAX_WORKERS  = 6          # FRED allows 120 req/min per key
+HISTORY_DAYS = 3 * 365    # enough for YoY on monthly series plus a chart window
+
+# ── Series map ────────────────────────────────────────────────────────────────
+# FRED series id → (output group, output key, revision window in days)
+SERIES = {
+    "DFEDTARL": ("fed",    "lower",     7),
+    "DFEDTARU": ("fed",    "upper",     7),
+    "DFF":      ("fed",    "effective", 7),
+
+    "DGS1MO":   ("yields", "m1",    7),
+    "DGS3MO":   ("yields", "m3",    7),
+    "DGS6MO":   ("yields", "m6",    7),
+    "DGS1":     ("yields", "y1",    7),
+    "DGS2":     ("yields", "US2Y",  7),
+    "DGS3":     ("yields", "y3",    7),
+    "DGS5":     ("yields", "US5Y",  7),
+    "DGS7":     ("yields", "y7",    7),
+    "DGS10":    ("yields", "US10Y", 7),
+    "DGS20":    ("yields", "US20Y", 7),
+    "DGS30":    ("yields", "US30Y", 7),
+
+    "CPIAUCSL": ("usMacro", "cpi",          100),
+    "CPILFESL": ("usMacro", "coreCpi",      100),
+    "PCEPI":    ("usMacro", "pce",          100),
+    "PCEPILFE": ("usMacro", "corePCE",      100),
+    "UNRATE":   ("usMacro", "unemployment", 100),
+    "PAYEMS":   ("usMacro", "nfp",          100),
+}
+
+# Index-level series reported as YoY %, and level series reported as MoM change
+YOY_SERIES    = {"CPIAUCSL", "CPILFESL", "PCEPI", "PCEPILFE"}
+CHANGE_SERIES = {"PAYEMS"}
+
+
+# ── Fetch helpers ─────────────────────────────────────────────────────────────
+
+def http_get_json(url, timeout=20):
+    req = urllib.request.Request(
+        url,
+        headers={
+            "User-Agent": "Mozilla/5.0 (compatible; FXDashboard-GHActions/1.0)",
+            "Accept":     "application/json",
+        }
+    )
+    with http_pool.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def fetch_series(series_id, api_key, since, retries=3, delay=3):
+    """Observations for one series since `since` (ISO date). Returns [[date, value], ...]."""
+    params = {"series_id": series_id, "api_key": api_key, "file_type": "json",
+              "observation_start": since}
+    url = f"{API_URL}?{urllib.parse.urlencode(params)}"
+
+    last_error = None
+    for attempt in range(1, retries + 1):
+        try:
+            data = http_get_json(url)
+            obs  = data.get("observations")
+            if obs is None:
+                raise ValueError(f"No observations in response: {json.dumps(data)[:200]}")
+            # FRED uses "." for missing values (holidays, not-yet-released)
+            return [[o["date"], float(o["value"])] for o in obs if o.get("value") not in (None, ".")]
+        except (urllib.error.URLError, ValueError, KeyError) as e:
+            last_error = e
+            print(f"  WARN [{series_id}] attempt {attempt}: {e}")
+            if attempt < retries:
+                time.sleep(delay)
+
+    raise RuntimeError(f"{series_id}: {last_error}")
+
+
+def merge_observations(existing, fresh):
+    """Merge by date (fresh wins, so revisions overwrite) and trim to HISTORY_DAYS."""
+    cutoff = (date.today() - timedelta(days=HISTORY_DAYS)).isoformat()
+    merged = {d: v for d, v in existing}
+    merged.update({d: v for d, v in fresh})
+    return [[d, merged[d]] for d in sorted(merged) if d >= cutoff]
+
+
+def load_history():
+    try:
+        with open(HISTORY_PATH) as f:
+            return json.load(f).get("series", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def update_all(history, api_key):
+    """Fetch every series concurrently, incrementally. Returns (history, errors)."""
+    def work(series_id):
+        obs = history.get(series_id, [])
+        if obs:
+            window = SERIES[series_id][2]
+            since  = (date.fromisoformat(obs[-1][0]) - timedelta(days=window)).isoformat()
+        else:
+            since  = (date.today() - timedelta(days=HISTORY_DAYS)).isoformat()
+        try:
+            return series_id, fetch_series(series_id, api_key, since), since, None
+        except RuntimeError as e:
+            return series_id, None, since, str(e)
+
+    updated = dict(history)
+    errors  = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for series_id, fresh, since, error in pool.map(work, SERIES):
+            if error:
+                errors[series_id] = error
+                continue
+            updated[series_id] = merge_observations(history.get(series_id, []), fresh)
+            print(f"  OK  [{series_id}] +{len(fresh)} obs since {since}")
+    return updated, errors
+
+
+# ── Derivations ───────────────────────────────────────────────────────────────
+
+def _year_ago(obs, idx):
+    """Value of the observation 12 months before obs[idx] (monthly series)."""
+    d = date.fromisoformat(obs[idx][0])
+    target = d.replace(year=d.year - 1).isoformat()
+    for od, ov in obs:
+        if od == target:
+            return ov
+    return None
+
+
+def _point(series_id, obs, idx):
+    if series_id in YOY_SERIES:
+        base = _year_ago(obs, idx)
+        return round((obs[idx][1] / base - 1) * 100, 1) if base else None
+    if series_id in CHANGE_SERIES:
+        return round(obs[idx][1] - obs[idx - 1][1]) if idx > 0 else None
+    return obs[idx][1]
+
+
+def build_payload(history):
+    out = {"fed": {}, "yields": {}, "usMacro": {}}
+
+    for series_id, (group, key, _) in SERIES.items():
+        obs = history.get(series_id)
+        if not obs:
+            continue
+        latest = _point(series_id, obs, len(obs) - 1)
+        if latest is None:
+            continue
+
+        if group == "usMacro":
+            out[group][key] = {
+                "v":    latest,
+                "prev": _point(series_id, obs, len(obs) - 2) if len(obs) > 1 else None,
+                "asOf": obs[-1][0],
+            }
+        else:
+            out[group][key] = latest
+            out[group]["asOf"] = max(out[group].get("asOf", ""), obs[-1][0])
+
+    y = out["yields"]
+    if "US2Y" in y and "US10Y" in y:
+        y["spread2s10s"] = round((y["US10Y"] - y["US2Y"]) * 100)
+
+    return out
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+@profiling.profiled("macro")
+def main():
+    api_key = os.environ.get("FRED_API_KEY")
+    if not api_key:
+        print("FATAL: FRED_API_KEY not set")
+        sys.exit(1)
+
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"Fetching {len(SERIES)} FRED series ({MAX_WORKERS} workers)...")
+    with profiling.phase("fetch"):
+        history, errors = update_all(load_history(), api_key)
+
+    if len(errors) == len(SERIES):
+        print(f"FATAL: every series failed. Errors: {errors}")
+        if OUTPUT_PATH.exists():
+            print("Keeping existing macro.json")
+            sys.exit(0)
+        sys.exit(1)
+
+    with profiling.phase("compute"):
+        payload = build_payload(history)
+    result = {
+        **payload,
+        "source":    "FRED",
+        "fetchedAt": datetime.now(timezone.utc).isoformat(),
+    }
+    if errors:
+        result["errors"] = errors
+
+    with profiling.phase("write"):
+        validate.publish("macro", {OUTPUT_PATH: result})
+        with open(HISTORY_PATH, "w") as f:
+            json.dump({"series": history}, f, separators=(",", ":"))
+
+    print(f"\nWrote {OUTPUT_PATH}")
+    print(f"  {len(SERIES) - len(errors)}/{len(SERIES)} series  |  fed: {result['fed']}")
+    if errors:
+        print(f"  Errors: {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Fetch intraday market quotes from Yahoo Finance and write public/markets.json.
+
+Python twin of netlify/functions/market-proxy.js, for the refresh daemon
+(scripts/refresh_daemon.py), which runs it every minute while FX trades.
+Same symbols, same output shape as /api/markets. The file is only rewritten
+when a price actually moved.
+
+Uses urllib + http_pool (stdlib only).
+"""
+
+import json
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+import http_pool
+import profiling
+from market_calendar import read_artifact
+
+OUTPUT_PATH = Path(__file__).parent.parent / "public" / "markets.json"
+
+# Yahoo symbol → output key (same list as market-proxy.js)
+SYMBOLS = {
+    "GC=F":     "xau",      # Gold $/oz
+    "CL=F":     "wti",      # WTI $/bbl
+    "^GSPC":    "spx",      # S&P 500
+    "^VIX":     "vix",      # VIX
+    "DX-Y.NYB": "dxy",      # DXY
+    "HG=F":     "copper",   # Copper: Yahoo returns USD/lb directly
+    "SI=F":     "silver",   # Silver $/oz
+}
+
+
+def fetch_quote(symbol, timeout=8):
+    url = (
+        f"https://query1.finance.yahoo.com/v8/finance/chart/"
+        f"{quote(symbol)}?interval=1d&range=2d"
+    )
+    req = urllib.request.Request(
+        url,
+        headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Accept":     "application/json",
+        }
+    )
+    with http_pool.urlopen(req, timeout=timeout) as resp:
+        data = json.loads(resp.read().decode("utf-8"))
+
+    result = (data.get("chart", {}).get("result") or [None])[0]
+    if not result:
+        raise ValueError(f"No result for {symbol}")
+    meta  = result.get("meta", {})
+    price = meta.get("regularMarketPrice")
+    prev  = meta.get("chartPreviousClose") or meta.get("previousClose") or price
+    if not price:
+        raise ValueError(f"No price for {symbol}")
+
+    chg = price - prev
+    return {
+        "price":     price,
+        "prev":      prev,
+        "change":    chg,
+        "changePct": (chg / prev) * 100 if prev > 0 else 0,
+    }
+
+
+@profiling.profiled("quotes")
+def main():
+    def work(item):
+        symbol, key = item
+        try:
+            return key, fetch_quote(symbol), None
+        except (urllib.error.URLError, ValueError, KeyError, TimeoutError) as e:
+            return key, None, str(e)
+
+    with profiling.phase("fetch"), ThreadPoolExecutor(max_workers=len(SYMBOLS)) as pool:
+        results = list(pool.map(work, SYMBOLS.items()))
+
+    markets = {key: quote for key, quote, _ in results if quote}
+    errors  = {key: err for key, _, err in results if err}
+
+    if not markets:
+        print(f"FATAL: all Yahoo Finance quotes failed. Errors: {errors}")
+        sys.exit(1)
+
+    previous = read_artifact(OUTPUT_PATH) or {}
+    if previous.get("markets") == markets:
+        print("Quotes unchanged")
+        return
+
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with profiling.phase("write"), open(OUTPUT_PATH, "w") as f:
+        json.dump({
+            "markets":   markets,
+            "errors":    errors,
+            "fetchedAt": datetime.now(timezone.utc).isoformat(),
+        }, f, separators=(",", ":"))
+
+    print(f"Wrote {OUTPUT_PATH}  ({len(markets)}/{len(SYMBOLS)} quotes)")
+
+
+if __name__ == "__main__":
+    main()
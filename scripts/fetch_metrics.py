@@ -0,0 +1,242 @@
+"""
+Per-run network and stage timings for the scripts/ fetchers.
+
+http_pool records one entry per HTTP exchange while a run is active:
+
+  dnsMs / connectMs / tlsMs   new connections only (0 when a pooled one is reused)
+  ttfbMs                      request sent → response headers received
+  downloadMs                  headers → body fully read
+  bytes / decodedBytes        on the wire / after Content-Encoding
+  decompressMs                time spent in zlib
+
+Fetchers add what only they know:
+
+  with fetch_metrics.timed("parse", "EURUSD=X"): ...
+  fetch_metrics.retry("EURUSD=X", attempt, error)
+  fetch_metrics.sleep(2, "EURUSD=X")             # time.sleep, recorded
+
+Wrap main() with @fetch_metrics.instrumented("atr") to get, at the end of
+every run that touched the network:
+
+  * data/fetch-metrics/<job>.json — the latest run (per-request logs capped
+    at MAX_LOG entries) plus a rolling HISTORY_RUNS summaries, so slow
+    upstreams and stages show up as trends. One file per job: the workflows
+    run on independent schedules and each commits only its own file
+  * a Markdown table appended to $GITHUB_STEP_SUMMARY (Actions job page)
+
+The active run lives in a ContextVar, so concurrent jobs in the refresh
+daemon keep separate books; use bind(fn) when handing work to a thread pool.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+METRICS_DIR  = Path(__file__).parent.parent / "data" / "fetch-metrics"
+HISTORY_RUNS = 100
+MAX_LOG      = 200     # entries kept per log of the latest run (summaries count them all)
+
+_current    = contextvars.ContextVar("fetch_metrics_run", default=None)
+_write_lock = threading.Lock()     # daemon jobs can finish at the same time
+
+
+class Run:
+
+    def __init__(self, job):
+        self.job        = job
+        self.started_at = datetime.now(timezone.utc)
+        self.t0         = time.perf_counter()
+        self.requests   = []
+        self.stages     = []     # {"stage", "source", "ms"}
+        self.retries    = []     # {"source", "attempt", "error"}
+        self.sleeps     = []     # {"source", "ms"}
+        self._lock      = threading.Lock()
+
+    def add(self, bucket, entry):
+        with self._lock:
+            getattr(self, bucket).append(entry)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+# ── Recording API ─────────────────────────────────────────────────────────────
+
+def record_request(entry):
+    """Called by http_pool once per exchange (no-op outside a run)."""
+    run = _current.get()
+    if run is not None:
+        run.add("requests", entry)
+
+
+@contextmanager
+def timed(stage, source=None):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        run = _current.get()
+        if run is not None:
+            run.add("stages", {"stage": stage, "source": source,
+                               "ms": _ms(time.perf_counter() - t0)})
+
+
+def retry(source, attempt, error):
+    run = _current.get()
+    if run is not None:
+        run.add("retries", {"source": source, "attempt": attempt, "error": str(error)[:200]})
+
+
+def sleep(seconds, source=None):
+    time.sleep(seconds)
+    run = _current.get()
+    if run is not None:
+        run.add("sleeps", {"source": source, "ms": _ms(seconds)})
+
+
+def bind(fn):
+    """Wrap fn so it runs in a copy of the caller's context (thread pools)."""
+    ctx = contextvars.copy_context()
+    return functools.wraps(fn)(lambda *a, **kw: ctx.copy().run(fn, *a, **kw))
+
+
+# ── Summaries ─────────────────────────────────────────────────────────────────
+
+def _host_rows(requests):
+    by_host = {}
+    for r in requests:
+        by_host.setdefault(r["host"], []).append(r)
+
+    rows = {}
+    for host, rs in sorted(by_host.items()):
+        fresh = [r for r in rs if not r.get("reused") and "connectMs" in r]
+        ttfb  = [r["ttfbMs"] for r in rs if "ttfbMs" in r]
+        rows[host] = {
+            "requests":     len(rs),
+            "errors":       sum(1 for r in rs if r.get("error") or r.get("status", 0) >= 400),
+            "newConns":     len(fresh),
+            "dnsMs":        round(sum(r["dnsMs"] for r in fresh), 1),
+            "connectMs":    round(sum(r["connectMs"] for r in fresh), 1),
+            "tlsMs":        round(sum(r.get("tlsMs", 0) for r in fresh), 1),
+            "ttfbP50Ms":    round(statistics.median(ttfb), 1) if ttfb else None,
+            "ttfbMaxMs":    max(ttfb) if ttfb else None,
+            "downloadMs":   round(sum(r.get("downloadMs", 0) for r in rs), 1),
+            "decompressMs": round(sum(r.get("decompressMs", 0) for r in rs), 1),
+            "bytes":        sum(r.get("bytes", 0) for r in rs),
+            "decodedBytes": sum(r.get("decodedBytes", 0) for r in rs),
+        }
+    return rows
+
+
+def summarise(run, exit_code):
+    stages = {}
+    for s in run.stages:
+        stages[s["stage"]] = round(stages.get(s["stage"], 0) + s["ms"], 1)
+    return {
+        "startedAt": run.started_at.isoformat(),
+        "wallMs":    _ms(time.perf_counter() - run.t0),
+        "exitCode":  exit_code,
+        "requests":  len(run.requests),
+        "bytes":     sum(r.get("bytes", 0) for r in run.requests),
+        "retries":   len(run.retries),
+        "sleepMs":   round(sum(s["ms"] for s in run.sleeps), 1),
+        "stagesMs":  stages,
+        "hosts":     _host_rows(run.requests),
+    }
+
+
+def step_summary(job, summary):
+    lines = [
+        f"### {job} fetch metrics",
+        "",
+        f"{summary['requests']} requests · {summary['bytes'] / 1024:.1f} KiB · "
+        f"{summary['retries']} retries · {summary['sleepMs'] / 1000:.1f}s sleeping · "
+        f"{summary['wallMs'] / 1000:.1f}s wall"
+        + "".join(f" · {k} {v:.0f}ms" for k, v in summary["stagesMs"].items()),
+        "",
+        "| Host | Req | Err | New conns | DNS ms | Connect ms | TLS ms | TTFB p50 / max ms "
+        "| Download ms | Decompress ms | KiB |",
+        "|---|--:|--:|--:|--:|--:|--:|--:|--:|--:|--:|",
+    ]
+    for host, h in summary["hosts"].items():
+        ttfb = f"{h['ttfbP50Ms']:.0f} / {h['ttfbMaxMs']:.0f}" if h["ttfbP50Ms"] is not None else "—"
+        lines.append(
+            f"| {host} | {h['requests']} | {h['errors']} | {h['newConns']} | {h['dnsMs']:.0f} "
+            f"| {h['connectMs']:.0f} | {h['tlsMs']:.0f} | {ttfb} | {h['downloadMs']:.0f} "
+            f"| {h['decompressMs']:.1f} | {h['bytes'] / 1024:.1f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _capped(log):
+    # The slowest exchanges are the interesting ones once a log overflows
+    if len(log) <= MAX_LOG:
+        return log
+    return sorted(log, key=lambda e: e.get("ttfbMs", 0) + e.get("downloadMs", 0) + e.get("ms", 0),
+                  reverse=True)[:MAX_LOG]
+
+
+def write_report(run, exit_code, metrics_dir=None):
+    summary = summarise(run, exit_code)
+    path    = (metrics_dir or METRICS_DIR) / f"{run.job}.json"
+    with _write_lock:
+        try:
+            with open(path) as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            doc = {}
+
+        doc = {
+            "job":    run.job,
+            "latest": {
+                **summary,
+                "requestLog": _capped(run.requests),
+                "retryLog":   run.retries[-MAX_LOG:],
+                "sleepLog":   run.sleeps[-MAX_LOG:],
+                "stageLog":   _capped(run.stages),
+            },
+            "history": (doc.get("history", []) + [summary])[-HISTORY_RUNS:],
+        }
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(doc, f, separators=(",", ":"))
+
+    table = step_summary(run.job, summary)
+    if os.environ.get("GITHUB_STEP_SUMMARY"):
+        with open(os.environ["GITHUB_STEP_SUMMARY"], "a") as f:
+            f.write(table + "\n")
+    print(f"\nFetch metrics → {path}")
+    print(table)
+
+
+def instrumented(job):
+    """Decorator for a fetcher's main(): collect metrics and write the report."""
+    def wrap(main):
+        @functools.wraps(main)
+        def run_main(*args, **kwargs):
+            run   = Run(job)
+            token = _current.set(run)
+            code  = 0
+            try:
+                return main(*args, **kwargs)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+                raise
+            except BaseException:
+                code = 1
+                raise
+            finally:
+                _current.reset(token)
+                if run.requests:          # SKIP runs never touch the network
+                    write_report(run, code)
+        return run_main
+    return wrap
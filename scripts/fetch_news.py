@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Aggregate G10 forex RSS feeds and write pre-partitioned news shards.
+
+Runs via GitHub Actions every 30 minutes on weekdays. Replaces the
+per-request work in netlify/functions/news-proxy.js (fetch every feed,
+parse, keyword-tag) with one batch job whose output is a set of static
+files:
+
+  public/news/all.json   { "articles": [...80 newest], "byCurrency": {CCY: [...8]}, ... }
+  public/news/AUD.json   { "currency": "AUD", "articles": [...20 newest], ... }
+  ...one shard per tagged currency
+
+Feeds are polled concurrently with conditional GETs (ETag / Last-Modified),
+so an unchanged feed costs a 304 and no parsing. Articles are deduplicated
+across feeds and runs with a persistent index of URL and title hashes, and
+tagged with currencies exactly once, when first seen.
+
+State: data/news-index.json (feed validators, seen hashes, retained articles)
+Uses urllib + xml.etree (stdlib only).
+"""
+
+import hashlib
+import html
+import json
+import re
+import sys
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+import http_pool
+import profiling
+
+ROOT       = Path(__file__).parent.parent
+OUTPUT_DIR = ROOT / "public" / "news"
+INDEX_PATH = ROOT / "data" / "news-index.json"
+
+# RSS feed sources — all free, no key required (same list as news-proxy.js)
+RSS_FEEDS = [
+    {"url": "https://www.fxstreet.com/rss/news", "source": "FXStreet"},
+    {"url": "https://forexlive.com/feed/news",   "source": "ForexLive"},
+    {"url": "https://www.dailyfx.com/feeds/all", "source": "DailyFX"},
+]
+
+# Currency keyword mapping for tagging articles (same list as news-proxy.js)
+CCY_KEYWORDS = {
+    "AUD": ["australia", "rba", "reserve bank of australia", "australian dollar", "aud/"],
+    "USD": ["federal reserve", "fed ", "fomc", "us dollar", "united states economy", "usd/", "us cpi", "us gdp", "nonfarm", "payrolls"],
+    "EUR": ["ecb", "european central bank", "eurozone", "euro area", "eur/", "german", "france economy"],
+    "GBP": ["bank of england", "boe", "uk economy", "britain", "sterling", "gbp/", "uk cpi", "uk gdp"],
+    "JPY": ["bank of japan", "boj", "japan economy", "japanese yen", "jpy/", "tokyo cpi", "tankan"],
+    "CHF": ["swiss national bank", "snb", "swiss franc", "switzerland economy", "chf/"],
+    "CAD": ["bank of canada", "boc ", "canadian dollar", "canada economy", "cad/", "canadian cpi"],
+    "NZD": ["reserve bank of new zealand", "rbnz", "new zealand economy", "kiwi dollar", "nzd/"],
+    "XAU": ["gold price", "gold rally", "gold drops", "xau/", "bullion", "precious metal"],
+}
+
+MAX_ALL       = 80
+MAX_PER_CCY   = 8       # byCurrency in all.json (matches news-proxy.js)
+MAX_SHARD     = 20      # per-currency shard files
+RETAIN_DAYS   = 7       # articles kept in the index for re-emitting on 304 runs
+SEEN_DAYS     = 14      # dedupe hashes kept this long
+
+
+# ── Tagging / normalising ─────────────────────────────────────────────────────
+
+def tag_currencies(text):
+    lower = text.lower()
+    return [ccy for ccy, kws in CCY_KEYWORDS.items() if any(kw in lower for kw in kws)]
+
+
+def url_key(link):
+    """Hash of the link without query/fragment, so tracking params don't defeat dedupe."""
+    parts = urlsplit(link.strip())
+    norm  = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+    return "u:" + hashlib.sha1(norm.encode()).hexdigest()[:16]
+
+
+def title_key(title):
+    norm = re.sub(r"[^a-z0-9]+", " ", title.lower()).strip()
+    return "t:" + hashlib.sha1(norm.encode()).hexdigest()[:16]
+
+
+def _text(elem, *names):
+    for name in names:
+        child = elem.find(name)
+        if child is not None and (child.text or child.get("href")):
+            return (child.text or child.get("href")).strip()
+    return ""
+
+
+def _iso(pub):
+    if not pub:
+        return None
+    try:
+        dt = parsedate_to_datetime(pub)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(pub.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).astimezone(timezone.utc).isoformat()
+
+
+def parse_feed(xml_bytes, source):
+    """Parse RSS 2.0 <item> or Atom <entry> elements into article dicts (untagged)."""
+    root  = ET.fromstring(xml_bytes)
+    atom  = "{http://www.w3.org/2005/Atom}"
+    items = root.iter("item") if root.find(".//item") is not None else root.iter(f"{atom}entry")
+
+    for item in items:
+        title = html.unescape(_text(item, "title", f"{atom}title"))
+        link  = _text(item, "link", f"{atom}link")
+        desc  = _text(item, "description", f"{atom}summary")
+        desc  = re.sub(r"\s+", " ", re.sub(r"<[^>]+>", " ", html.unescape(desc))).strip()[:280]
+        pub   = _text(item, "pubDate", "{http://purl.org/dc/elements/1.1/}date", f"{atom}updated")
+        if title and link:
+            yield {
+                "title":       title,
+                "description": desc,
+                "link":        link,
+                "pubDate":     pub,
+                "publishedAt": _iso(pub),
+                "source":      source,
+            }
+
+
+# ── Fetch ─────────────────────────────────────────────────────────────────────
+
+def fetch_feed(feed, validators, timeout=15):
+    """
+    Conditional GET. Returns (status, body, new_validators):
+    status is "ok", "not-modified" or an error string.
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (compatible; FXDashboard/1.0)",
+        "Accept":     "application/rss+xml, application/xml, text/xml, */*",
+    }
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("lastModified"):
+        headers["If-Modified-Since"] = validators["lastModified"]
+
+    try:
+        req = urllib.request.Request(feed["url"], headers=headers)
+        with http_pool.urlopen(req, timeout=timeout) as resp:
+            body = resp.read()
+            new  = {
+                "etag":         resp.headers.get("ETag"),
+                "lastModified": resp.headers.get("Last-Modified"),
+            }
+            return "ok", body, {k: v for k, v in new.items() if v}
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return "not-modified", None, validators
+        return f"HTTP {e.code}", None, validators
+    except (urllib.error.URLError, TimeoutError) as e:
+        return str(e), None, validators
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+
+def load_index():
+    try:
+        with open(INDEX_PATH) as f:
+            idx = json.load(f)
+    except (OSError, ValueError):
+        idx = {}
+    return {
+        "feeds":    idx.get("feeds", {}),
+        "seen":     idx.get("seen", {}),
+        "articles": idx.get("articles", []),
+    }
+
+
+def ingest(index, articles, now):
+    """Add unseen articles (tagged once, here) to the index. Returns count added."""
+    added = 0
+    for a in articles:
+        keys = (url_key(a["link"]), title_key(a["title"]))
+        if any(k in index["seen"] for k in keys):
+            continue
+        for k in keys:
+            index["seen"][k] = now.isoformat()
+
+        currencies = tag_currencies(f"{a['title']} {a['description']}")
+        # Include if relevant to at least one G10 currency, or if forex-specific source
+        if not currencies and a["source"] != "ForexLive":
+            continue
+        a["currencies"] = currencies or ["USD"]   # fallback for ForexLive
+        a["firstSeen"]  = now.isoformat()
+        index["articles"].append(a)
+        added += 1
+    return added
+
+
+def prune(index, now):
+    seen_cut   = (now - timedelta(days=SEEN_DAYS)).isoformat()
+    retain_cut = (now - timedelta(days=RETAIN_DAYS)).isoformat()
+    index["seen"]     = {k: t for k, t in index["seen"].items() if t >= seen_cut}
+    index["articles"] = [
+        a for a in index["articles"]
+        if (a.get("publishedAt") or a["firstSeen"]) >= retain_cut
+    ]
+
+
+# ── Output ────────────────────────────────────────────────────────────────────
+
+def write_shards(articles, fetched_at):
+    articles = sorted(articles, key=lambda a: a.get("publishedAt") or "", reverse=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    by_ccy = {}
+    for a in articles:
+        for ccy in a["currencies"]:
+            by_ccy.setdefault(ccy, []).append(a)
+
+    for ccy in CCY_KEYWORDS:
+        shard = OUTPUT_DIR / f"{ccy}.json"
+        if ccy not in by_ccy:
+            shard.unlink(missing_ok=True)
+            continue
+        with open(shard, "w") as f:
+            json.dump({"currency": ccy, "articles": by_ccy[ccy][:MAX_SHARD],
+                       "fetchedAt": fetched_at}, f, separators=(",", ":"))
+
+    top = articles[:MAX_ALL]
+    all_by_ccy = {}
+    for a in top:
+        for ccy in a["currencies"]:
+            if len(all_by_ccy.setdefault(ccy, [])) < MAX_PER_CCY:
+                all_by_ccy[ccy].append(a)
+
+    with open(OUTPUT_DIR / "all.json", "w") as f:
+        json.dump({"articles": top, "byCurrency": all_by_ccy, "total": len(top),
+                   "fetchedAt": fetched_at}, f, separators=(",", ":"))
+    return by_ccy
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+@profiling.profiled("news")
+def main():
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    index = load_index()
+    now   = datetime.now(timezone.utc)
+
+    print(f"Polling {len(RSS_FEEDS)} RSS feeds...")
+    with profiling.phase("fetch"), ThreadPoolExecutor(max_workers=len(RSS_FEEDS)) as pool:
+        results = list(pool.map(
+            lambda feed: (feed, *fetch_feed(feed, index["feeds"].get(feed["url"], {}))),
+            RSS_FEEDS,
+        ))
+
+    changed, failed = 0, 0
+    for feed, status, body, validators in results:
+        index["feeds"][feed["url"]] = validators
+        if status == "not-modified":
+            print(f"  304 [{feed['source']}]")
+            continue
+        if status != "ok":
+            failed += 1
+            print(f"  WARN [{feed['source']}] {status}")
+            continue
+        try:
+            with profiling.phase("parse"):
+                added = ingest(index, list(parse_feed(body, feed["source"])), now)
+        except ET.ParseError as e:
+            failed += 1
+            print(f"  WARN [{feed['source']}] bad XML: {e}")
+            continue
+        changed += added
+        print(f"  OK  [{feed['source']}] +{added} new")
+
+    before = len(index["articles"])
+    prune(index, now)
+    changed += before - len(index["articles"])
+
+    if failed == len(RSS_FEEDS) and not index["articles"]:
+        print("FATAL: all RSS feeds failed and no retained articles")
+        sys.exit(1)
+
+    with open(INDEX_PATH, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+    if changed == 0 and (OUTPUT_DIR / "all.json").exists():
+        print("\nNo new or expired articles — shards unchanged")
+        return
+
+    with profiling.phase("write"):
+        by_ccy = write_shards(index["articles"], now.isoformat())
+    print(f"\nWrote {OUTPUT_DIR}/all.json + {len(by_ccy)} currency shards")
+    print("  " + "  ".join(f"{c}:{len(v)}" for c, v in sorted(by_ccy.items())))
+
+
+if __name__ == "__main__":
+    main()
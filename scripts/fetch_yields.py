@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Fetch the US Treasury daily par yield curve and write public/yields.json.
+
+Runs via GitHub Actions each weekday evening, after Treasury posts the day's
+curve (~6pm ET). The feed changes once per business day, so the dashboard
+reads this static file instead of having netlify/functions/yields-proxy.js
+download and regex-parse the monthly XML on every cache miss.
+
+Uses urllib + xml.etree (stdlib only). The XML is parsed incrementally with
+iterparse straight off the socket — one <m:properties> row at a time — so a
+full month never has to be held as a string.
+
+State:  data/yield-history.json  {"curves": {"2026-10-16": {"US10Y": 4.1, ...}}}
+        Only months from the last stored curve onwards are re-downloaded.
+Output: public/yields.json
+  {
+    "yields":  { "m1": 4.2, ..., "US10Y": 4.42, "spread2s10s": 24, "spread3m10y": 10 },
+    "changes": { "US10Y": -3, "spread2s10s": 1, ... },     # bp vs previous curve
+    "asOf": "2026-10-16", "prevAsOf": "2026-10-15",
+    "source": "US Treasury", "fetchedAt": "..."
+  }
+"""
+
+import json
+import sys
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import http_pool
+import profiling
+import validate
+from market_calendar import force_requested, treasury_curve_due
+
+ROOT         = Path(__file__).parent.parent
+OUTPUT_PATH  = ROOT / "public" / "yields.json"
+HISTORY_PATH = ROOT / "data" / "yield-history.json"
+
+BASE_URL = (
+    "https://home.treasury.gov/resource-center/data-chart-center/interest-rates/pages/xml"
+    "?data=daily_treasury_yield_curve&field_tdr_date_value_month={ym}"
+)
+
+HISTORY_DAYS    = 2 * 365
+BACKFILL_MONTHS = 12      # first run only
+
+# Treasury XML field → our key (same keys as yields-proxy.js)
+FIELD_MAP = {
+    "BC_1MONTH":  "m1",
+    "BC_3MONTH":  "m3",
+    "BC_6MONTH":  "m6",
+    "BC_1YEAR":   "y1",
+    "BC_2YEAR":   "US2Y",
+    "BC_3YEAR":   "y3",
+    "BC_5YEAR":   "US5Y",
+    "BC_7YEAR":   "y7",
+    "BC_10YEAR":  "US10Y",
+    "BC_20YEAR":  "US20Y",
+    "BC_30YEAR":  "US30Y",
+}
+
+# Spread key → (long tenor, short tenor), reported in bp
+SPREADS = {
+    "spread2s10s": ("US10Y", "US2Y"),
+    "spread3m10y": ("US10Y", "m3"),
+}
+
+
+# ── Streaming XML parse ───────────────────────────────────────────────────────
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_curves(stream):
+    """
+    Yield (date_str, {key: value}) for each daily row in a Treasury XML stream.
+    Elements are cleared as soon as a row is read to keep memory flat.
+    """
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if _local(elem.tag) != "properties":
+            continue
+        row, day = {}, None
+        for child in elem:
+            name = _local(child.tag)
+            if name == "NEW_DATE" and child.text:
+                day = child.text.split("T")[0]
+            elif name in FIELD_MAP and child.text:
+                try:
+                    row[FIELD_MAP[name]] = float(child.text)
+                except ValueError:
+                    pass
+        elem.clear()
+        if day and "US10Y" in row:
+            yield day, row
+
+
+def fetch_month(ym, timeout=20):
+    req = urllib.request.Request(
+        BASE_URL.format(ym=ym),
+        headers={
+            "User-Agent": "Mozilla/5.0 (compatible; FXDashboard-GHActions/1.0)",
+            "Accept":     "application/xml, text/xml, */*",
+        }
+    )
+    with http_pool.urlopen(req, timeout=timeout) as resp:
+        return dict(parse_curves(resp))
+
+
+# ── History ───────────────────────────────────────────────────────────────────
+
+def load_history():
+    try:
+        with open(HISTORY_PATH) as f:
+            return json.load(f).get("curves", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def months_to_fetch(history, today):
+    """YYYYMM strings from the month of the last stored curve through today."""
+    if history:
+        start = date.fromisoformat(max(history)).replace(day=1)
+    else:
+        start = today.replace(day=1)
+        for _ in range(BACKFILL_MONTHS - 1):
+            start = (start - timedelta(days=1)).replace(day=1)
+
+    months, d = [], start
+    while d <= today:
+        months.append(f"{d.year}{d.month:02d}")
+        d = (d + timedelta(days=32)).replace(day=1)
+    return months
+
+
+def update_history(history, today):
+    months = months_to_fetch(history, today)
+    print(f"  Months to fetch: {', '.join(months)}")
+
+    def work(ym):
+        try:
+            return ym, fetch_month(ym), None
+        except (urllib.error.URLError, ET.ParseError, TimeoutError) as e:
+            return ym, {}, str(e)
+
+    merged, errors = dict(history), {}
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for ym, curves, error in pool.map(work, months):
+            if error:
+                errors[ym] = error
+                print(f"  WARN [{ym}] {error}")
+                continue
+            merged.update(curves)
+            print(f"  OK  [{ym}] {len(curves)} curves")
+
+    cutoff = (today - timedelta(days=HISTORY_DAYS)).isoformat()
+    return {d: merged[d] for d in sorted(merged) if d >= cutoff}, errors
+
+
+# ── Derivations ───────────────────────────────────────────────────────────────
+
+def with_spreads(curve):
+    out = dict(curve)
+    for key, (long_t, short_t) in SPREADS.items():
+        if long_t in curve and short_t in curve:
+            out[key] = round((curve[long_t] - curve[short_t]) * 100)
+    return out
+
+
+def build_payload(history):
+    dates  = sorted(history)
+    latest = with_spreads(history[dates[-1]])
+    result = {"yields": latest, "asOf": dates[-1]}
+
+    if len(dates) > 1:
+        prev = with_spreads(history[dates[-2]])
+        result["prevAsOf"] = dates[-2]
+        result["changes"]  = {
+            k: round(v - prev[k]) if k in SPREADS else round((v - prev[k]) * 100)
+            for k, v in latest.items() if k in prev
+        }
+    return result
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+@profiling.profiled("yields")
+def main():
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    history  = load_history()
+    last_day = date.fromisoformat(max(history)) if history else None
+    if not force_requested() and OUTPUT_PATH.exists() and not treasury_curve_due(last_day):
+        print(f"SKIP: already have the latest published curve ({last_day})")
+        return
+
+    print("Fetching Treasury daily par yield curve...")
+    with profiling.phase("fetch"):          # parse is streamed inside the fetch
+        history, errors = update_history(history, datetime.now(timezone.utc).date())
+
+    if not history:
+        print(f"FATAL: no curves parsed. Errors: {errors}")
+        if OUTPUT_PATH.exists():
+            print("Keeping existing yields.json")
+            sys.exit(0)
+        sys.exit(1)
+
+    with profiling.phase("compute"):
+        payload = build_payload(history)
+    result = {
+        **payload,
+        "source":    "US Treasury",
+        "fetchedAt": datetime.now(timezone.utc).isoformat(),
+    }
+    if errors:
+        result["errors"] = errors
+
+    with profiling.phase("write"):
+        validate.publish("yields", {OUTPUT_PATH: result})
+        with open(HISTORY_PATH, "w") as f:
+            json.dump({"curves": history}, f, separators=(",", ":"))
+
+    print(f"\nWrote {OUTPUT_PATH}")
+    print(f"  asOf: {result['asOf']}  |  {len(history)} curves in history")
+    if errors:
+        print(f"  Errors: {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Keep-alive HTTP(S) connection pool shared by the scripts/ fetchers.
+
+`urlopen(req, timeout)` is a drop-in for urllib.request.urlopen: it accepts
+a URL or urllib.request.Request, follows redirects, raises HTTPError for
+4xx/5xx and 304, and URLError for connection failures, so existing
+except clauses keep working. The difference is that connections are kept
+per host and reused, so eight Yahoo tickers or a long-running refresh
+daemon pay DNS + TCP + TLS once instead of on every request.
+
+The response streams (fetch_yields feeds it straight into iterparse). A
+connection only goes back to the pool once its response has been read to
+the end; a partly read one is closed.
+
+Proxies are honoured the way urllib.request.urlopen honours them:
+HTTP(S)_PROXY / NO_PROXY (urllib.request.getproxies / proxy_bypass). HTTPS
+goes through a CONNECT tunnel, plain HTTP is sent to the proxy with the
+absolute URL, and pooled connections are keyed by proxy as well as host.
+
+Requests ask for gzip unless the caller set Accept-Encoding itself, and the
+body is decoded transparently. Every exchange is timed (DNS, connect, TLS,
+TTFB, download, bytes, decompression) and handed to fetch_metrics, which
+keeps it if a run is being recorded.
+
+Stdlib only (http.client).
+"""
+
+import base64
+import http.client
+import io
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from urllib.parse import unquote, urljoin, urlsplit
+
+import fetch_metrics
+
+MAX_IDLE_PER_HOST = 4
+MAX_REDIRECTS     = 5
+
+_idle = {}                 # (scheme, host, port, proxy) → [HTTPConnection, ...]
+_lock = threading.Lock()
+
+# Connection dropped by the server while idle in the pool — retry on a fresh one
+_STALE = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+          ConnectionResetError, BrokenPipeError)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+# ── Timed connections ─────────────────────────────────────────────────────────
+# http.client resolves and connects in one call; splitting it lets DNS, TCP and
+# TLS be measured separately. TLS = whole connect() minus the TCP part (and,
+# through a proxy, includes the CONNECT round trip).
+
+class _TimedConnect:
+
+    def _timed_create_connection(self, address, timeout=None, source_address=None):
+        host, port = address
+        t0    = time.perf_counter()
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        t1    = time.perf_counter()
+        error = None
+        for *_, sockaddr in infos:
+            try:
+                sock = socket.create_connection(sockaddr[:2], timeout, source_address)
+                break
+            except OSError as e:
+                error = e
+        else:
+            raise error or OSError(f"getaddrinfo returned nothing for {host}")
+        self.timing = {"dnsMs": _ms(t1 - t0), "connectMs": _ms(time.perf_counter() - t1)}
+        return sock
+
+    def connect(self):
+        self._create_connection = self._timed_create_connection
+        t0 = time.perf_counter()
+        super().connect()
+        total = _ms(time.perf_counter() - t0)
+        if isinstance(self, http.client.HTTPSConnection):
+            self.timing["tlsMs"] = round(total - self.timing["dnsMs"] - self.timing["connectMs"], 1)
+
+
+class _HTTPConnection(_TimedConnect, http.client.HTTPConnection):
+    pass
+
+
+class _HTTPSConnection(_TimedConnect, http.client.HTTPSConnection):
+    pass
+
+
+def _proxy(scheme, host):
+    """(host, port, Proxy-Authorization or None) for this target, or None to go direct."""
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    auth  = None
+    if parts.username:
+        creds = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        auth  = "Basic " + base64.b64encode(creds.encode()).decode()
+    return parts.hostname, parts.port or 80, auth
+
+
+def _key(url):
+    parts = urlsplit(url)
+    port  = parts.port or (443 if parts.scheme == "https" else 80)
+    return parts.scheme, parts.hostname, port, _proxy(parts.scheme, parts.hostname or "")
+
+
+def _checkout(key, timeout):
+    with _lock:
+        conns = _idle.get(key)
+        if conns:
+            conn = conns.pop()
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+    scheme, host, port, proxy = key
+    cls = _HTTPSConnection if scheme == "https" else _HTTPConnection
+    if proxy is None:
+        return cls(host, port, timeout=timeout), False
+    proxy_host, proxy_port, auth = proxy
+    conn = cls(proxy_host, proxy_port, timeout=timeout)
+    if scheme == "https":
+        conn.set_tunnel(host, port, headers={"Proxy-Authorization": auth} if auth else None)
+    return conn, False
+
+
+def _checkin(key, conn):
+    with _lock:
+        conns = _idle.setdefault(key, [])
+        if len(conns) < MAX_IDLE_PER_HOST:
+            conns.append(conn)
+            return
+    conn.close()
+
+
+class PooledResponse:
+    """
+    File-like, transparently decoded response. Returns its connection to the
+    pool and reports its timings when closed.
+    """
+
+    def __init__(self, key, conn, resp, url, metrics):
+        self._key, self._conn, self._resp = key, conn, resp
+        self.url     = url
+        self.status  = resp.status
+        self.headers = resp.headers
+        self.metrics = metrics
+
+        encoding      = (resp.getheader("Content-Encoding") or "").lower()
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding in ("gzip", "x-gzip") \
+            else zlib.decompressobj() if encoding == "deflate" else None
+        self._buffer  = b""
+        self._t0      = time.perf_counter()
+        self._done_at = None
+        self._flushed = False
+        metrics.update(bytes=0, decodedBytes=0, decompressMs=0.0)
+
+    def _raw(self, amt):
+        if self._done_at is not None:
+            return b""
+        data = self._resp.read(amt)
+        self.metrics["bytes"] += len(data)
+        if not data or self._resp.isclosed():
+            self._done_at = time.perf_counter()
+        return data
+
+    def _decode(self, data, final=False):
+        t0  = time.perf_counter()
+        out = self._decoder.decompress(data)
+        if final:
+            out += self._decoder.flush()
+        self.metrics["decompressMs"] += _ms(time.perf_counter() - t0)
+        return out
+
+    def read(self, amt=None):
+        if self._decoder is None:
+            data = self._raw(amt)
+        else:
+            whole = amt is None or amt < 0
+            while (whole or len(self._buffer) < amt) and not self._flushed:
+                chunk = self._raw(None if whole else max(amt, 16 * 1024))
+                self._flushed = self._done_at is not None
+                self._buffer += self._decode(chunk, final=self._flushed)
+            if whole:
+                data, self._buffer = self._buffer, b""
+            else:
+                data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        self.metrics["decodedBytes"] += len(data)
+        return data
+
+    def getcode(self):
+        return self.status
+
+    def close(self):
+        if self._conn is None:
+            return
+        if self._resp.isclosed() and not self._resp.will_close:
+            _checkin(self._key, self._conn)
+        else:
+            self._conn.close()
+            self.metrics["complete"] = False
+        self._conn = None
+        self.metrics["downloadMs"]   = _ms((self._done_at or time.perf_counter()) - self._t0)
+        self.metrics["decompressMs"] = round(self.metrics["decompressMs"], 1)
+        fetch_metrics.record_request(self.metrics)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _request(url, method, headers, body, timeout):
+    key   = _key(url)
+    parts = urlsplit(url)
+    path  = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    proxy = key[3]
+    if proxy and parts.scheme == "http":
+        # Plain HTTP through a proxy: absolute-form request line, auth per request
+        path = f"http://{parts.netloc}{path}"
+        if proxy[2]:
+            headers = {**headers, "Proxy-Authorization": proxy[2]}
+
+    for attempt in range(2):
+        conn, reused = _checkout(key, timeout)
+        conn.timing  = {}
+        try:
+            t0   = time.perf_counter()
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+        except _STALE:
+            conn.close()
+            if not reused or attempt:
+                raise
+            continue
+        except Exception:
+            conn.close()
+            raise
+        # Time to first byte: from the request going out, excluding connect
+        sent_at = t0 + sum(conn.timing.get(k, 0) for k in ("dnsMs", "connectMs", "tlsMs")) / 1000
+        metrics = {"host": key[1], "method": method, "path": parts.path, "status": resp.status,
+                   "reused": reused, "staleRetry": bool(attempt), **conn.timing,
+                   "ttfbMs": _ms(time.perf_counter() - sent_at)}
+        return key, conn, resp, metrics
+
+
+def urlopen(req, timeout=30):
+    if isinstance(req, str):
+        req = urllib.request.Request(req)
+    url     = req.full_url
+    headers = {"Connection": "keep-alive", **dict(req.header_items())}
+    if not any(k.lower() == "accept-encoding" for k in headers):
+        headers["Accept-Encoding"] = "gzip"
+    method  = req.get_method()
+    data    = req.data
+
+    for _ in range(MAX_REDIRECTS + 1):
+        try:
+            key, conn, resp, metrics = _request(url, method, headers, data, timeout)
+        except OSError as e:
+            split = urlsplit(url)
+            fetch_metrics.record_request({"host": split.hostname, "method": method,
+                                          "path": split.path, "error": repr(e)})
+            raise urllib.error.URLError(e) from e
+
+        pooled = PooledResponse(key, conn, resp, url, metrics)
+        if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location"):
+            pooled.read()
+            pooled.close()
+            url = urljoin(url, resp.getheader("Location"))
+            if resp.status == 303:
+                method, data = "GET", None
+            continue
+
+        if resp.status >= 400 or resp.status == 304:
+            body = pooled.read()
+            pooled.close()
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+
+        return pooled
+
+    raise urllib.error.URLError(f"Too many redirects for {req.full_url}")
+
+
+def close_all():
+    """Drop every idle connection (daemon shutdown)."""
+    with _lock:
+        for conns in _idle.values():
+            for conn in conns:
+                conn.close()
+        _idle.clear()
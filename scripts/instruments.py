@@ -0,0 +1,71 @@
+"""
+Instrument registry loader for the scripts/ data jobs.
+
+Reads scripts/instruments.json and returns one dict per instrument with the
+class defaults (unit, volBands) already merged in, so callers never have to
+special-case JPY pairs, metals or indices by name.
+
+Stdlib only.
+"""
+
+import json
+from pathlib import Path
+
+REGISTRY_PATH = Path(__file__).parent / "instruments.json"
+
+REQUIRED = ("symbol", "yahoo", "class", "quote", "pip", "tick", "lotSize")
+CONVERSION_REQUIRED = ("symbol", "yahoo", "base", "quote")
+
+
+def load_registry(path=REGISTRY_PATH, asset_class=None):
+    """
+    Load the registry. Optionally filter to one asset class ("fx", "metal", ...).
+    Raises ValueError on a malformed entry so a bad edit fails the job loudly.
+    """
+    with open(path) as f:
+        raw = json.load(f)
+
+    classes     = raw.get("classes", {})
+    instruments = []
+    seen        = set()
+
+    for entry in raw.get("instruments", []):
+        missing = [k for k in REQUIRED if k not in entry]
+        if missing:
+            raise ValueError(f"Registry entry {entry.get('symbol')!r} missing {missing}")
+        if entry["symbol"] in seen:
+            raise ValueError(f"Duplicate registry symbol {entry['symbol']!r}")
+        if entry["class"] not in classes:
+            raise ValueError(f"Unknown asset class {entry['class']!r} for {entry['symbol']}")
+        seen.add(entry["symbol"])
+
+        if asset_class and entry["class"] != asset_class:
+            continue
+        instruments.append({**classes[entry["class"]], **entry})
+
+    return instruments
+
+
+def load_conversions(path=REGISTRY_PATH):
+    """Spot quotes fetched only for currency conversion (no ATR of their own)."""
+    with open(path) as f:
+        raw = json.load(f)
+
+    conversions = raw.get("conversions", [])
+    for entry in conversions:
+        missing = [k for k in CONVERSION_REQUIRED if k not in entry]
+        if missing:
+            raise ValueError(f"Conversion entry {entry.get('symbol')!r} missing {missing}")
+    return conversions
+
+
+def pip_multiplier(inst):
+    """Pips (or points) per 1.0 of price, e.g. 10,000 for EUR/USD, 100 for USD/JPY."""
+    return 1.0 / inst["pip"]
+
+
+def vol_label(pips, bands=(50, 90)):
+    low, high = bands
+    if pips < low:  return "low"
+    if pips < high: return "medium"
+    return "high"
@@ -0,0 +1,284 @@
+"""
+Release calendar for the scripts/ data jobs.
+
+Knows when new upstream data can exist, so each fetcher can check before it
+touches the network and exit in milliseconds when nothing can have changed:
+
+  FX trading days    Mon–Fri except Jan 1 and Dec 25; the daily bar closes at
+                     17:00 New York (treated as 22:00 UTC year-round so DST
+                     never makes us think a bar closed before it did)
+  CFTC COT releases  Friday 15:30 ET for the prior Tuesday's positions, pushed
+                     back one business day per US federal holiday that falls
+                     in the processing week (Thanksgiving → Monday release)
+  Treasury curve     each US business day, posted by ~18:00 ET
+  CB meetings        G10 policy decision dates, updated each January from the
+                     banks' published schedules; a scrape older than
+                     CB_MAX_AGE_DAYS is refetched regardless, so a schedule
+                     nobody updated degrades to a monthly refresh, not none
+
+Stdlib only.
+"""
+
+import contextvars
+import json
+import os
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+
+
+# ── G10 policy decision dates ────────────────────────────────────────────────
+# Announcement day (local) of each scheduled rate decision. Update every
+# January from the central banks' published calendars.
+CB_MEETINGS = {
+    "USD": ["2026-01-28", "2026-03-18", "2026-04-29", "2026-06-17",
+            "2026-07-29", "2026-09-16", "2026-10-28", "2026-12-09"],
+    "EUR": ["2026-02-05", "2026-03-19", "2026-04-30", "2026-06-11",
+            "2026-07-23", "2026-09-10", "2026-10-29", "2026-12-17"],
+    "GBP": ["2026-02-05", "2026-03-19", "2026-04-30", "2026-06-18",
+            "2026-07-30", "2026-09-17", "2026-11-05", "2026-12-17"],
+    "JPY": ["2026-01-23", "2026-03-19", "2026-04-28", "2026-06-16",
+            "2026-07-31", "2026-09-18", "2026-10-30", "2026-12-18"],
+    "AUD": ["2026-02-03", "2026-03-17", "2026-05-05", "2026-06-16",
+            "2026-08-11", "2026-09-29", "2026-11-03", "2026-12-08"],
+    "CAD": ["2026-01-28", "2026-03-18", "2026-04-29", "2026-06-10",
+            "2026-07-15", "2026-09-09", "2026-10-28", "2026-12-09"],
+    "NZD": ["2026-02-18", "2026-04-08", "2026-05-27", "2026-07-08",
+            "2026-08-19", "2026-10-07", "2026-11-25"],
+    "CHF": ["2026-03-19", "2026-06-18", "2026-09-24", "2026-12-10"],
+}
+
+# global-rates.com typically reflects a decision within a day or two
+CB_SOURCE_LAG_DAYS = 2
+
+# Refetch at least this often even with no listed decision (unscheduled
+# moves, or a CB_MEETINGS table that has run out of dates)
+CB_MAX_AGE_DAYS = 45
+
+# CFTC publishes at 15:30 ET — 20:30 UTC covers both EST and EDT
+COT_RELEASE_UTC = time(20, 30)
+
+# Explicit CFTC schedule corrections {as-of Tuesday: release date}, for the
+# rare weeks the holiday rule below gets wrong (e.g. government shutdowns).
+COT_RELEASE_OVERRIDES = {}
+
+# Treasury posts the day's par yield curve by ~18:00 ET
+TREASURY_POST_UTC = time(23, 0)
+
+FX_CLOSE_UTC = time(22, 0)
+FX_HOLIDAYS  = {(1, 1), (12, 25)}
+
+
+# ── Generic helpers ──────────────────────────────────────────────────────────
+
+# Explicit per-run answer for force_requested(), so fetchers called in-process
+# (the refresh daemon's worker threads) don't read the host process's argv/env
+force_override = contextvars.ContextVar("force_override", default=None)
+
+
+def force_requested():
+    """True for manual runs: `--force` on the command line or FORCE_FETCH=1/true."""
+    if force_override.get() is not None:
+        return force_override.get()
+    return "--force" in sys.argv or os.environ.get("FORCE_FETCH", "").lower() in ("1", "true")
+
+
+def read_artifact(path):
+    """Load a previously published JSON artifact, or None if missing/corrupt."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def parse_ts(value):
+    """Parse an ISO timestamp/date from an artifact into an aware UTC datetime."""
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+# ── US federal holidays (CFTC schedule) ──────────────────────────────────────
+
+def _nth_weekday(year, month, weekday, n):
+    """n-th given weekday of a month (n=-1 for the last one)."""
+    if n > 0:
+        d = date(year, month, 1)
+        d += timedelta(days=(weekday - d.weekday()) % 7)
+        return d + timedelta(weeks=n - 1)
+    d = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def _observed(d):
+    if d.weekday() == 5: return d - timedelta(days=1)
+    if d.weekday() == 6: return d + timedelta(days=1)
+    return d
+
+
+def us_federal_holidays(year):
+    return {
+        _observed(date(year, 1, 1)),
+        _nth_weekday(year, 1, 0, 3),            # MLK Day
+        _nth_weekday(year, 2, 0, 3),            # Presidents' Day
+        _nth_weekday(year, 5, 0, -1),           # Memorial Day
+        _observed(date(year, 6, 19)),           # Juneteenth
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),            # Labor Day
+        _nth_weekday(year, 10, 0, 2),           # Columbus Day
+        _observed(date(year, 11, 11)),          # Veterans Day
+        _nth_weekday(year, 11, 3, 4),           # Thanksgiving
+        _observed(date(year, 12, 25)),
+    }
+
+
+def _is_us_business_day(d):
+    return d.weekday() < 5 and d not in us_federal_holidays(d.year)
+
+
+def last_treasury_curve_date(now=None):
+    """Date of the newest Treasury yield curve that should be published by now."""
+    now = now or _utcnow()
+    d   = now.date()
+    if now.time() < TREASURY_POST_UTC:
+        d -= timedelta(days=1)
+    while not _is_us_business_day(d):
+        d -= timedelta(days=1)
+    return d
+
+
+def next_treasury_post(now=None):
+    """Next time a new Treasury curve is expected to be posted, strictly after now."""
+    now = now or _utcnow()
+    d   = now.date()
+    if now.time() >= TREASURY_POST_UTC:
+        d += timedelta(days=1)
+    while not _is_us_business_day(d):
+        d += timedelta(days=1)
+    return datetime.combine(d, TREASURY_POST_UTC, tzinfo=timezone.utc)
+
+
+def treasury_curve_due(last_as_of, now=None):
+    """True if a yield curve newer than last_as_of should exist by now."""
+    return last_as_of is None or last_treasury_curve_date(now) > last_as_of
+
+
+# ── FX trading days ──────────────────────────────────────────────────────────
+
+def is_fx_trading_day(d):
+    return d.weekday() < 5 and (d.month, d.day) not in FX_HOLIDAYS
+
+
+def last_fx_close(now=None):
+    """Most recent daily FX close (22:00 UTC on a trading day) at or before now."""
+    now = now or _utcnow()
+    d   = now.date()
+    if now.time() < FX_CLOSE_UTC:
+        d -= timedelta(days=1)
+    while not is_fx_trading_day(d):
+        d -= timedelta(days=1)
+    return datetime.combine(d, FX_CLOSE_UTC, tzinfo=timezone.utc)
+
+
+def next_fx_close(now=None):
+    """Next daily FX close strictly after now."""
+    now = now or _utcnow()
+    d   = now.date()
+    if now.time() >= FX_CLOSE_UTC:
+        d += timedelta(days=1)
+    while not is_fx_trading_day(d):
+        d += timedelta(days=1)
+    return datetime.combine(d, FX_CLOSE_UTC, tzinfo=timezone.utc)
+
+
+def fx_market_open(now=None):
+    """Spot FX trades from Sunday 22:00 UTC to Friday 22:00 UTC."""
+    now = now or _utcnow()
+    wd  = now.weekday()
+    if wd == 5:
+        return False
+    if wd == 6:
+        return now.time() >= FX_CLOSE_UTC
+    if wd == 4:
+        return now.time() < FX_CLOSE_UTC
+    return True
+
+
+def fx_bar_due(last_fetched, now=None):
+    """True if a daily FX bar has closed since last_fetched."""
+    return last_fetched is None or last_fx_close(now) > last_fetched
+
+
+# ── CFTC COT releases ────────────────────────────────────────────────────────
+
+def cot_release_at(as_of):
+    """
+    UTC datetime the COT report for positions as of Tuesday `as_of` is published.
+    Normally the following Friday; each federal holiday between that week's
+    Monday and the Friday release pushes it one US business day later.
+    """
+    if as_of in COT_RELEASE_OVERRIDES:
+        return datetime.combine(COT_RELEASE_OVERRIDES[as_of], COT_RELEASE_UTC, tzinfo=timezone.utc)
+
+    monday   = as_of - timedelta(days=as_of.weekday())
+    release  = monday + timedelta(days=4)
+    holidays = us_federal_holidays(monday.year) | us_federal_holidays(release.year)
+    delay    = sum(1 for i in range(5) if monday + timedelta(days=i) in holidays)
+    while delay:
+        release += timedelta(days=1)
+        if _is_us_business_day(release):
+            delay -= 1
+    return datetime.combine(release, COT_RELEASE_UTC, tzinfo=timezone.utc)
+
+
+def next_cot_release(last_as_of):
+    """Release datetime of the report following the one dated last_as_of."""
+    return cot_release_at(last_as_of + timedelta(days=7))
+
+
+def cot_release_due(last_as_of, now=None):
+    """True if a COT report newer than last_as_of should be published by now."""
+    if last_as_of is None:
+        return True
+    return (now or _utcnow()) >= next_cot_release(last_as_of)
+
+
+# ── Central bank meetings ────────────────────────────────────────────────────
+
+def cb_meetings_between(start, end):
+    """[(ccy, date), ...] for every scheduled decision with start <= date <= end."""
+    hits = []
+    for ccy, days in CB_MEETINGS.items():
+        for day in days:
+            d = date.fromisoformat(day)
+            if start <= d <= end:
+                hits.append((ccy, d))
+    return sorted(hits, key=lambda h: h[1])
+
+
+def cb_schedule_exhausted(now=None):
+    """Currencies with no decision listed on or after today — CB_MEETINGS needs updating."""
+    today = (now or _utcnow()).date().isoformat()
+    return sorted(ccy for ccy, days in CB_MEETINGS.items() if not days or max(days) < today)
+
+
+def cb_decision_due(last_fetched, now=None):
+    """
+    Meetings that may not be reflected in an artifact fetched at last_fetched.
+    Includes decisions up to CB_SOURCE_LAG_DAYS before the last fetch, since
+    the scraped site can trail the announcement. An unknown or older than
+    CB_MAX_AGE_DAYS fetch is always due, reported as ("*", None).
+    """
+    now = now or _utcnow()
+    if last_fetched is None or now - last_fetched > timedelta(days=CB_MAX_AGE_DAYS):
+        return [("*", None)]
+    start = last_fetched.date() - timedelta(days=CB_SOURCE_LAG_DAYS)
+    return cb_meetings_between(start, now.date())
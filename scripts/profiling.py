@@ -0,0 +1,266 @@
+"""
+Opt-in CPU and memory profiling for the scripts/ entry points.
+
+Enable with --profile on the command line or PROFILE=1 in the environment:
+
+  PROFILE=1 FORCE_FETCH=1 python scripts/fetch_cb_rates.py
+
+While enabled, a run gets:
+
+  * a sampling profiler — a background thread reads every thread's stack
+    every PROFILE_INTERVAL_MS (default 5). Unlike cProfile it sees the
+    fetchers' worker threads too. Stacks are rooted at the current phase.
+  * tracemalloc, with a snapshot at the start and end of each phase
+  * per-phase wall time, CPU time (process-wide, so worker threads count,
+    minus the sampler thread's own CPU) and traced peak memory
+
+A main() opts in with @profiling.profiled("cot") and marks its phases:
+
+  with profiling.phase("parse"):
+      cot, as_of, errors = parse_rows(rows)
+
+Phases are conventionally fetch / parse / compute / write. Repeating a
+phase (once per retry, say) adds up its time; its peak is the max.
+
+Reports go to PROFILE_DIR (default profile/):
+
+  <job>.collapsed     "phase:parse;fetch_cot:main;fetch_cot:parse_rows 42"
+                      (flamegraph.pl / speedscope / inferno input;
+                      snapshot overhead is under phase:profiler)
+  <job>-alloc.txt     top allocation sites per phase, by bytes still held
+  <job>-profile.json  per-phase numbers, limits and any violations
+
+Limits live in scripts/profile-limits.json, per job and phase ("total" is
+the whole run): {"cpuS": …, "peakMB": …}. A profiled run that goes over a
+limit exits with status 3, after the reports are written.
+PROFILE_LIMITS=warn only reports the violations.
+
+Profiling is per process: when a profiled main() runs inside another one
+(fetchers inside the refresh daemon) the inner one is a no-op, and phases
+entered on threads other than the profiled one are ignored.
+"""
+
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+LIMITS_PATH     = Path(__file__).parent / "profile-limits.json"
+INTERVAL_S      = float(os.environ.get("PROFILE_INTERVAL_MS", 5)) / 1000
+TRACE_FRAMES    = int(os.environ.get("PROFILE_TRACE_FRAMES", 10))
+TOP_ALLOCS      = 15
+EXIT_OVER_LIMIT = 3
+OVERHEAD        = "profiler"   # phase label for samples taken while snapshotting
+
+_active = None
+
+
+def requested():
+    return "--profile" in sys.argv[1:] or os.environ.get("PROFILE", "").lower() in ("1", "true", "yes")
+
+
+def _frame_label(code):
+    module = Path(code.co_filename).stem
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class Sampler(threading.Thread):
+    """Wall-clock stack sampler over all threads → collapsed stack counts."""
+
+    def __init__(self, profile):
+        super().__init__(name="profiling-sampler", daemon=True)
+        self.profile = profile
+        self.counts  = {}
+        self.cpu     = 0.0      # this thread's own CPU seconds, subtracted from the phases
+        self._halt   = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._halt.wait(INTERVAL_S):
+            self._sample(own)
+            self.cpu = time.thread_time()
+
+    def _sample(self, own):
+        phase = self.profile.current or "unphased"
+        # Pool workers differ only by suffix (ThreadPoolExecutor-0_3) — fold them
+        names = {t.ident: re.sub(r"_\d+$", "", t.name) for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            key = ";".join([f"phase:{phase}", f"thread:{names.get(ident, ident)}", *reversed(stack)])
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+
+class Profile:
+
+    def __init__(self, job):
+        self.job     = job
+        self.thread  = threading.get_ident()
+        self.current = None
+        self.peak    = 0        # whole-run traced peak (phases reset tracemalloc's)
+        self.phases  = {}       # name → {"wallS", "cpuS", "peakMB", "calls"}
+        self.allocs  = {}       # name → [(bytes, count, site)]
+        self.sampler = Sampler(self)
+
+    def _cpu(self):
+        """Process CPU seconds, less what the sampler thread itself has burned."""
+        return time.process_time() - self.sampler.cpu
+
+    def start(self):
+        tracemalloc.start(TRACE_FRAMES)
+        self.t0, self.cpu0 = time.perf_counter(), self._cpu()
+        self.snap0 = tracemalloc.take_snapshot()
+        self.sampler.start()
+
+    @contextmanager
+    def phase(self, name):
+        self.current = OVERHEAD            # snapshots are our own cost, not the phase's
+        self.peak    = max(self.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        base       = tracemalloc.get_traced_memory()[0]
+        before     = tracemalloc.take_snapshot()
+        t0, cpu0   = time.perf_counter(), self._cpu()
+        self.current = name
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - t0, self._cpu() - cpu0
+            self.current = OVERHEAD
+            peak      = tracemalloc.get_traced_memory()[1]
+            peak_mb   = (peak - base) / 2**20
+            self.peak = max(self.peak, peak)
+            after     = tracemalloc.take_snapshot()
+            self.current = None
+
+            p = self.phases.setdefault(name, {"wallS": 0.0, "cpuS": 0.0, "peakMB": 0.0, "calls": 0})
+            p["wallS"]  += wall
+            p["cpuS"]   += cpu
+            p["peakMB"]  = max(p["peakMB"], peak_mb)
+            p["calls"]  += 1
+            self.allocs[name] = _top_allocations(after, before)
+
+    def finish(self):
+        self.sampler.stop()
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        self.phases["total"] = {
+            "wallS":  time.perf_counter() - self.t0,
+            "cpuS":   self._cpu() - self.cpu0,
+            "peakMB": self.peak / 2**20,
+            "calls":  1,
+        }
+        self.allocs["total"] = _top_allocations(tracemalloc.take_snapshot(), self.snap0)
+        tracemalloc.stop()
+
+
+def _top_allocations(after, before):
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+               tracemalloc.Filter(False, __file__)]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    return [(s.size_diff, s.count_diff, str(s.traceback[0]))
+            for s in stats[:TOP_ALLOCS] if s.size_diff > 0]
+
+
+# ── Limits and reports ────────────────────────────────────────────────────────
+
+def load_limits(job):
+    try:
+        with open(LIMITS_PATH) as f:
+            return json.load(f).get(job, {})
+    except (OSError, ValueError):
+        return {}
+
+
+def check_limits(phases, limits):
+    violations = []
+    for name, caps in limits.items():
+        got = phases.get(name)
+        if not got:
+            continue
+        for key, cap in caps.items():
+            if got.get(key, 0) > cap:
+                violations.append(f"{name}.{key} = {got[key]:.3f} > {cap}")
+    return violations
+
+
+def write_reports(prof, out_dir):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    limits     = load_limits(prof.job)
+    violations = check_limits(prof.phases, limits)
+
+    with open(out_dir / f"{prof.job}.collapsed", "w") as f:
+        for stack, n in sorted(prof.sampler.counts.items()):
+            f.write(f"{stack} {n}\n")
+
+    with open(out_dir / f"{prof.job}-alloc.txt", "w") as f:
+        for name, top in prof.allocs.items():
+            f.write(f"== {name} ==\n")
+            for size, count, site in top:
+                f.write(f"{size / 1024:10.1f} KiB  {count:+7d} blocks  {site}\n")
+            f.write("\n")
+
+    phases = {n: {k: round(v, 4) if isinstance(v, float) else v for k, v in p.items()}
+              for n, p in prof.phases.items()}
+    with open(out_dir / f"{prof.job}-profile.json", "w") as f:
+        json.dump({"job": prof.job, "phases": phases, "limits": limits,
+                   "violations": violations, "samples": sum(prof.sampler.counts.values()),
+                   "intervalMs": INTERVAL_S * 1000}, f, indent=2)
+
+    print(f"\nProfile [{prof.job}] → {out_dir}/")
+    print(f"  {'phase':<10} {'calls':>5} {'wall s':>8} {'cpu s':>8} {'peak MB':>8}")
+    for name, p in prof.phases.items():
+        print(f"  {name:<10} {p['calls']:>5} {p['wallS']:>8.3f} {p['cpuS']:>8.3f} {p['peakMB']:>8.2f}")
+    for v in violations:
+        print(f"  OVER LIMIT: {v}", file=sys.stderr)
+    return violations
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+@contextmanager
+def phase(name):
+    """Mark a named phase of the profiled run (no-op when not profiling)."""
+    prof = _active
+    if prof is None or prof.thread != threading.get_ident():
+        yield
+        return
+    with prof.phase(name):
+        yield
+
+
+def profiled(job):
+    """Decorator for an entry point's main(): profile the run when requested."""
+    def wrap(main):
+        @functools.wraps(main)
+        def run_main(*args, **kwargs):
+            global _active
+            if _active is not None or not requested():
+                return main(*args, **kwargs)
+
+            _active = prof = Profile(job)
+            prof.start()
+            try:
+                result = main(*args, **kwargs)
+            finally:
+                prof.finish()
+                _active = None
+                violations = write_reports(prof, Path(os.environ.get("PROFILE_DIR", "profile")))
+            if violations and os.environ.get("PROFILE_LIMITS", "").lower() != "warn":
+                sys.exit(EXIT_OVER_LIMIT)
+            return result
+        return run_main
+    return wrap
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Long-running refresh daemon for the scripts/ fetchers.
+
+The GitHub Actions jobs are cold cron runs: fresh interpreter, fresh DNS,
+TCP and TLS for every request, fixed schedules. For self-hosting, this
+keeps one asyncio process alive instead:
+
+  * every fetcher module is imported once and its main() is called in a
+    worker thread, so http_pool's keep-alive connections stay warm across
+    runs and the per-run cost is just the requests that are actually needed.
+    Jobs run concurrently, so nothing process-global is touched per run:
+    fetchers resolve their files from their own location (never the cwd)
+    and get force_requested() explicitly instead of the daemon's argv/env
+  * each dataset wakes on its own cadence or event, from market_calendar:
+
+      quotes    every minute while spot FX trades
+      news      every 5 minutes
+      calendar  every 15 minutes
+      macro     hourly (needs FRED_API_KEY)
+      atr       at each daily FX close
+      yields    when Treasury posts the day's curve
+      cot       at the CFTC release time, holiday-shifted
+      cb_rates  on G10 decision days (and the lag days after)
+
+    While an event is due but its data hasn't appeared yet, the job polls
+    every POLL_WHILE_DUE instead of waiting for the next event.
+
+  * overlapping triggers are coalesced: a trigger that arrives while the job
+    is running sets a pending flag and produces exactly one follow-up run
+  * when a run changes one of its output files, registered listeners are
+    told immediately via add_listener(); changed snapshots are always
+    appended to the archive (scripts/archive.py)
+
+Usage:
+  python scripts/refresh_daemon.py                 # run all jobs forever
+  python scripts/refresh_daemon.py --jobs news,cot # subset
+  python scripts/refresh_daemon.py --once          # run each job once and exit
+
+SIGHUP triggers every job now (coalesced). SIGINT/SIGTERM stop cleanly.
+Stdlib only.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib
+import os
+import signal
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import archive
+import http_pool
+import market_calendar as cal
+import profiling
+
+ROOT = Path(__file__).parent.parent
+
+POLL_WHILE_DUE = timedelta(minutes=30)
+MIN_SLEEP_S    = 5
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _artifact(name):
+    return cal.read_artifact(ROOT / "public" / name) or {}
+
+
+# ── Wake-up rules ─────────────────────────────────────────────────────────────
+# Each returns the next datetime the job should run, given now.
+
+def every(**interval):
+    step = timedelta(**interval)
+    return lambda now: now + step
+
+
+def quotes_next(now):
+    if cal.fx_market_open(now):
+        return now + timedelta(minutes=1)
+    # Sleep until the Sunday open
+    d = now.date()
+    while d.weekday() != 6:
+        d += timedelta(days=1)
+    return datetime.combine(d, cal.FX_CLOSE_UTC, tzinfo=timezone.utc)
+
+
+def atr_next(now):
+    if cal.fx_bar_due(cal.parse_ts(_artifact("atr-data.json").get("fetchedAt")), now):
+        return now + POLL_WHILE_DUE
+    return cal.next_fx_close(now) + timedelta(minutes=5)
+
+
+def yields_next(now):
+    as_of = _artifact("yields.json").get("asOf")
+    if cal.treasury_curve_due(date.fromisoformat(as_of) if as_of else None, now):
+        return now + POLL_WHILE_DUE
+    return cal.next_treasury_post(now)
+
+
+def cot_next(now):
+    as_of = cal.parse_ts(_artifact("cot-data.json").get("asOf"))
+    as_of = as_of.date() if as_of else None
+    if cal.cot_release_due(as_of, now):
+        return now + POLL_WHILE_DUE
+    return cal.next_cot_release(as_of) + timedelta(minutes=5)
+
+
+def cb_rates_next(now):
+    today = now.date()
+    if cal.cb_meetings_between(today - timedelta(days=cal.CB_SOURCE_LAG_DAYS), today):
+        return now + timedelta(hours=3)
+    upcoming = cal.cb_meetings_between(today + timedelta(days=1), today + timedelta(days=400))
+    if not upcoming:
+        return now + timedelta(days=1)
+    return datetime.combine(upcoming[0][1], datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=12)
+
+
+# ── Jobs ──────────────────────────────────────────────────────────────────────
+
+class Job:
+    """One dataset: a fetcher module, its wake-up rule and the files it writes."""
+
+    def __init__(self, name, module, next_run, outputs):
+        self.name     = name
+        self.module   = module
+        self.next_run = next_run
+        self.outputs  = [ROOT / p for p in outputs]
+        self.running  = False
+        self.pending  = False
+        self.runs     = 0
+
+    def _fingerprint(self):
+        out = []
+        for path in self.outputs:
+            files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+            for f in files:
+                try:
+                    out.append((str(f), hashlib.sha1(f.read_bytes()).hexdigest()))
+                except OSError:
+                    pass
+        return out
+
+    def _run_sync(self):
+        mod = importlib.import_module(self.module)
+        # to_thread runs this in a copy of the context, so the override is per run
+        cal.force_override.set(False)
+        try:
+            mod.main()
+            return 0
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 1
+
+    async def trigger(self, daemon):
+        """Run now, or — if already running — queue exactly one follow-up run."""
+        if self.running:
+            self.pending = True
+            return
+        self.running = True
+        try:
+            while True:
+                self.pending = False
+                before = set(self._fingerprint())
+                t0     = time.monotonic()
+                try:
+                    code = await asyncio.to_thread(self._run_sync)
+                except Exception as e:       # a crashing fetcher must not kill the daemon
+                    print(f"[{self.name}] crashed: {e!r}", file=sys.stderr)
+                    code = 1
+                self.runs += 1
+                changed = [p for p in dict(self._fingerprint()).items() if p not in before]
+                print(f"[{self.name}] run {self.runs} exit={code} "
+                      f"{time.monotonic() - t0:.1f}s  changed={len(changed)}")
+                if changed:
+                    daemon.notify(self, [Path(p) for p, _ in changed])
+                if not self.pending:
+                    break
+        finally:
+            self.running = False
+
+
+JOBS = [
+    Job("quotes",   "fetch_markets",  quotes_next,       ["public/markets.json"]),
+    Job("news",     "fetch_news",     every(minutes=5),  ["public/news"]),
+    Job("calendar", "fetch_calendar", every(minutes=15), ["public/calendar.json"]),
+    Job("macro",    "fetch_macro",    every(hours=1),    ["public/macro.json"]),
+    Job("atr",      "fetch_atr",      atr_next,          ["public/atr-data.json"]),
+    Job("yields",   "fetch_yields",   yields_next,       ["public/yields.json"]),
+    Job("cot",      "fetch_cot",      cot_next,          ["public/cot-data.json", "public/cot-pairs.json"]),
+    Job("cb_rates", "fetch_cb_rates", cb_rates_next,     ["public/cb-rates.json"]),
+]
+
+
+# ── Daemon ────────────────────────────────────────────────────────────────────
+
+class RefreshDaemon:
+
+    def __init__(self, jobs):
+        self.jobs      = jobs
+        self.listeners = [archive.on_artifacts_changed]
+        self._stop     = None
+
+    def add_listener(self, callback):
+        """callback(job_name, [changed Paths]) — called on the event loop."""
+        self.listeners.append(callback)
+
+    def notify(self, job, paths):
+        for cb in self.listeners:
+            try:
+                cb(job.name, paths)
+            except Exception as e:
+                print(f"[daemon] listener failed: {e!r}", file=sys.stderr)
+
+    def trigger_all(self):
+        for job in self.jobs:
+            asyncio.ensure_future(job.trigger(self))
+
+    async def _schedule(self, job):
+        while not self._stop.is_set():
+            await job.trigger(self)
+            now   = _now()
+            delay = max(MIN_SLEEP_S, (job.next_run(now) - now).total_seconds())
+            print(f"[{job.name}] next run {now + timedelta(seconds=delay):%a %H:%M:%S} UTC")
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, once=False):
+        self._stop = asyncio.Event()
+        if once:
+            await asyncio.gather(*(job.trigger(self) for job in self.jobs))
+            http_pool.close_all()
+            return
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stop.set)
+        if hasattr(signal, "SIGHUP"):
+            loop.add_signal_handler(signal.SIGHUP, self.trigger_all)
+
+        print(f"Refresh daemon: {', '.join(j.name for j in self.jobs)}")
+        try:
+            await asyncio.gather(*(self._schedule(job) for job in self.jobs))
+        finally:
+            http_pool.close_all()
+            print("Refresh daemon stopped")
+
+
+def select_jobs(names):
+    jobs = JOBS
+    if names:
+        wanted = set(names.split(","))
+        unknown = wanted - {j.name for j in JOBS}
+        if unknown:
+            raise SystemExit(f"Unknown job(s): {', '.join(sorted(unknown))}")
+        jobs = [j for j in JOBS if j.name in wanted]
+    if not os.environ.get("FRED_API_KEY"):
+        jobs = [j for j in jobs if j.name != "macro"]
+    return jobs
+
+
+@profiling.profiled("daemon")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", help="comma-separated subset of: " + ",".join(j.name for j in JOBS))
+    parser.add_argument("--once", action="store_true", help="run each job once and exit")
+    parser.add_argument("--profile", action="store_true", help="sample the whole process (see profiling.py)")
+    args = parser.parse_args()
+
+    asyncio.run(RefreshDaemon(select_jobs(args.jobs)).run(once=args.once))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Position-sizing grid for the ATR job: pip values, ATR stop distances and
+lot sizes for every registry instrument in every G10 account currency.
+
+  pipValue = pip × lotSize                  quote ccy, per standard lot
+           × quote → account rate           exact cross from the latest closes
+  stop     = round(ATR × multiple)          pips / points
+  lots     = ACCOUNT_SIZE × risk% ÷ (stop × pipValue)
+
+Lot sizes are for an ACCOUNT_SIZE balance in the account currency and scale
+linearly, so the dashboard only looks values up (and multiplies by
+balance / ACCOUNT_SIZE for other balances).
+
+Cross rates are exact: the quote → account conversion multiplies along the
+shortest chain of quoted pairs, so GBP/JPY converts JPY → GBP directly and
+USD is only the bridge when no direct quote exists.
+
+Stdlib only.
+"""
+
+from collections import deque
+
+G10           = ("USD", "EUR", "JPY", "GBP", "CHF", "CAD", "AUD", "NZD", "SEK", "NOK")
+ATR_MULTIPLES = (1, 1.25, 1.5, 2, 3)
+RISK_PCTS     = (0.25, 0.5, 1, 2, 3)
+ACCOUNT_SIZE  = 10_000
+
+
+def _sig(x, digits=6):
+    return float(f"{x:.{digits}g}")
+
+
+class Rates:
+    """Spot prices keyed by (base, quote); converts between any two linked currencies."""
+
+    def __init__(self, spots):
+        self.quotes = {pair: px for pair, px in spots.items() if px and px > 0}
+        self.links  = {}
+        for base, quote in self.quotes:
+            self.links.setdefault(base, set()).add(quote)
+            self.links.setdefault(quote, set()).add(base)
+
+    def _leg(self, frm, to):
+        if (frm, to) in self.quotes:
+            return self.quotes[(frm, to)]
+        return 1.0 / self.quotes[(to, frm)]
+
+    def convert(self, frm, to):
+        """Units of `to` per unit of `frm`, or None when no chain of quotes links them."""
+        if frm == to:
+            return 1.0
+        prev, queue = {frm: None}, deque([frm])
+        while queue:
+            ccy = queue.popleft()
+            for nxt in sorted(self.links.get(ccy, ())):
+                if nxt in prev:
+                    continue
+                prev[nxt] = ccy
+                if nxt == to:
+                    rate = 1.0
+                    while prev[nxt] is not None:
+                        rate *= self._leg(prev[nxt], nxt)
+                        nxt = prev[nxt]
+                    return rate
+                queue.append(nxt)
+        return None
+
+
+def stop_distances(atr):
+    # int(x + 0.5) rounds halves up, as Math.round does in the dashboard
+    return [max(1, int(atr * m + 0.5)) for m in ATR_MULTIPLES]
+
+
+def build_grid(instruments, atr, rates):
+    """
+    instruments: registry entries; atr: {symbol: {"atr": n, ...}}; rates: Rates.
+    Instruments without an ATR, and account currencies the rates can't reach,
+    are left out rather than guessed.
+    """
+    accounts = [a for a in G10 if rates.convert("USD", a) is not None]
+    pairs    = {}
+    for inst in instruments:
+        entry = atr.get(inst["symbol"])
+        if not entry:
+            continue
+        stops       = stop_distances(entry["atr"])
+        quote_value = inst["pip"] * inst["lotSize"]
+        by_account  = {}
+        for acct in accounts:
+            rate = rates.convert(inst["quote"], acct)
+            if rate is None:
+                continue
+            pip_value = quote_value * rate
+            by_account[acct] = {
+                "pipValue": _sig(pip_value),
+                "lots": [[_sig(ACCOUNT_SIZE * pct / 100 / (stop * pip_value), 4) for pct in RISK_PCTS]
+                         for stop in stops],
+            }
+        pairs[inst["symbol"]] = {"unit": inst["unit"], "atr": entry["atr"],
+                                 "stops": stops, "accounts": by_account}
+
+    return {
+        "accountSize":  ACCOUNT_SIZE,
+        "accounts":     accounts,
+        "atrMultiples": list(ATR_MULTIPLES),
+        "riskPcts":     list(RISK_PCTS),
+        "pairs":        pairs,
+    }
@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Validation gate between the fetchers and public/.
+
+Fetchers hand their finished payloads to publish() instead of writing them.
+Every output is checked — in parallel, on a small thread pool — against the
+last published artifact and a rolling window of archived snapshots
+(scripts/archive.py):
+
+  jumps      a value moving more than max(floor, JUMP_K × its median move
+             over the last HISTORY_SNAPSHOTS snapshots)
+  units      values outside their unit's plausible range, or off from the
+             previous value by a power of ten (pips vs points, % vs bp)
+  missing    currencies / tenors / instruments that were published last time
+             but are gone now; too few or gapped daily bars behind an ATR
+  stale      report dates that go backwards or are older than their cadence
+  bad ticks  high < low, close outside the bar; true-range spikes only
+             warn, since a real shock bar stays in the ATR window for weeks
+
+Errors block the write: every output of the run is kept at its last good
+version and the job exits 0, so the next scheduled run simply tries again.
+Warnings are reported and the write goes ahead. Either way the result is
+recorded in data/validation/<job>.json (latest run per dataset, one file per
+job so independently scheduled workflows never commit the same file) and
+appended to $GITHUB_STEP_SUMMARY. Writes that pass are atomic (temp file +
+rename), so a reader never sees half an artifact either.
+
+A genuine big move fails the same checks on every run, so blocks don't go
+on forever. The report counts each dataset's consecutive blocked runs and
+how many of them failed the same checks on the same labels (symbol,
+currency, tenor), ignoring the numbers in the messages, which drift from
+run to run. Once ACCEPT_AFTER runs in a row agree, the values
+are accepted and published. Once ACCEPT_AFTER runs are blocked without
+agreeing (upstream flapping), the job exits 1 so someone looks. To accept
+by hand, set VALIDATE_ACCEPT to "all" or to a comma-separated list of
+filenames (the workflows expose it as a manual-run input).
+
+Run it directly to check what is in public/ now against the archive:
+
+  python scripts/validate.py                 # every gated artifact
+  python scripts/validate.py cot-data.json   # just one
+
+Stdlib only.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import archive
+from market_calendar import CB_SOURCE_LAG_DAYS, cb_meetings_between, parse_ts, read_artifact
+
+ROOT        = Path(__file__).parent.parent
+PUBLIC_DIR  = ROOT / "public"
+REPORT_DIR  = ROOT / "data" / "validation"
+
+HISTORY_SNAPSHOTS = 26     # rolling window of archived versions per dataset
+JUMP_K            = 6      # × median historical move before a change is a jump
+MAX_WORKERS       = 4
+
+MIN_BARS          = 15     # 14 true ranges for a 14-session ATR
+MAX_BAR_AGE_DAYS  = 5      # newest daily bar (long weekends included)
+MAX_BAR_GAP_DAYS  = 5
+TICK_SPIKE_K      = 8      # true range vs median true range
+
+ACCEPT_AFTER      = int(os.environ.get("VALIDATE_ACCEPT_AFTER", 3))   # agreeing blocked runs
+
+_report_lock = threading.Lock()
+
+
+def err(msg):
+    return ("error", msg)
+
+
+def warn(msg):
+    return ("warn", msg)
+
+
+# ── Shared checks ─────────────────────────────────────────────────────────────
+
+def _typical_move(series):
+    values = [v for v in series if v is not None]
+    moves  = [abs(b - a) for a, b in zip(values, values[1:]) if b != a]
+    return statistics.median(moves) if len(moves) >= 3 else None
+
+
+def _power_of_ten(new, old):
+    """k when new ≈ old × 10^k for k ≠ 0 (a unit slip), else None."""
+    if not new or not old or (new > 0) != (old > 0):
+        return None
+    k = round(math.log10(abs(new / old)))
+    if k and abs(abs(new / old) / 10 ** k - 1) < 0.2:
+        return k
+    return None
+
+
+def compare(label, new, old, series, floor, unit=""):
+    """Jump and unit-slip check of one value against its last published value."""
+    if new is None or old is None:
+        return []
+    k = _power_of_ten(new, old)
+    if k and abs(old) > floor:
+        return [err(f"{label}: {old:g} → {new:g}{unit} looks like a unit change (×10^{k})")]
+    typical = _typical_move(series)
+    limit   = max(floor, JUMP_K * typical) if typical else floor
+    if abs(new - old) > limit:
+        return [err(f"{label}: jumped {old:g} → {new:g}{unit} (limit ±{limit:g})")]
+    return []
+
+
+def in_range(label, value, lo, hi, unit=""):
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+        return [err(f"{label}: {value!r} is not a number")]
+    if not lo <= value <= hi:
+        return [err(f"{label}: {value:g}{unit} outside {lo:g}…{hi:g}{unit} — wrong unit?")]
+    return []
+
+
+def dropped(label, new_keys, old_keys, allowed=()):
+    gone = sorted(set(old_keys) - set(new_keys) - set(allowed))
+    return [err(f"{label}: {', '.join(gone)} published last time but missing now")] if gone else []
+
+
+def dates_forward(label, new, old, max_age=None):
+    new_d, old_d = parse_ts(new), parse_ts(old)
+    out = []
+    if new_d and old_d and new_d < old_d:
+        out.append(err(f"{label}: {new} is older than the published {old}"))
+    if new_d and max_age and datetime.now(timezone.utc) - new_d > max_age:
+        out.append(warn(f"{label}: {new} is more than {max_age.days} days old"))
+    return out
+
+
+def _series(history, *path):
+    out = []
+    for snap in history:
+        node = snap
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+        out.append(node if isinstance(node, (int, float)) else None)
+    return out
+
+
+# ── Per-dataset rules ─────────────────────────────────────────────────────────
+# check(new, prev, history, ctx) → [(level, message)]
+# prev is the published artifact ({} if none), history the archived snapshots
+# (oldest first), ctx["outputs"] every payload of the same run by filename.
+
+def check_bars(symbol, bars):
+    """Raw Yahoo bars [(ts, high, low, close)] behind one ATR value."""
+    out = []
+    if len(bars) < MIN_BARS:
+        out.append(err(f"{symbol}: only {len(bars)} daily bars (need {MIN_BARS})"))
+    if not bars:
+        return out
+
+    last = datetime.fromtimestamp(bars[-1][0], timezone.utc)
+    if datetime.now(timezone.utc) - last > timedelta(days=MAX_BAR_AGE_DAYS):
+        out.append(err(f"{symbol}: newest bar is {last:%Y-%m-%d}"))
+    gaps = [(a[0], b[0]) for a, b in zip(bars, bars[1:]) if b[0] - a[0] > MAX_BAR_GAP_DAYS * 86400]
+    if gaps:
+        out.append(warn(f"{symbol}: {len(gaps)} gap(s) over {MAX_BAR_GAP_DAYS} days in the bars"))
+
+    bad = [ts for ts, h, l, c in bars if min(h, l, c) <= 0 or h < l or not l * 0.999 <= c <= h * 1.001]
+    if bad:
+        day = datetime.fromtimestamp(bad[0], timezone.utc)
+        out.append(err(f"{symbol}: {len(bad)} malformed bar(s), first {day:%Y-%m-%d}"))
+    trs = [max(h - l, abs(h - pc), abs(l - pc)) for (_, h, l, _), (_, _, _, pc) in zip(bars[1:], bars)]
+    med = statistics.median(trs) if trs else 0
+    if med > 0 and max(trs) > TICK_SPIKE_K * med:
+        # A real event bar looks the same — warn rather than hold every instrument's ATR back
+        out.append(warn(f"{symbol}: true range {max(trs):g} is {max(trs) / med:.0f}× the median — bad tick?"))
+    return out
+
+
+def check_atr(new, prev, history, ctx):
+    atr, old = new.get("atr", {}), prev.get("atr", {})
+    out  = dropped("atr", atr, old, allowed=new.get("missing", ()))
+    live = set(atr) - set(new.get("fallbackUsed", ()))
+
+    for symbol, bars in sorted(ctx.get("bars", {}).items()):
+        if symbol in live and bars:
+            out += check_bars(symbol, bars)
+
+    for symbol in sorted(live):
+        value = atr[symbol].get("atr")
+        out  += in_range(f"atr {symbol}", value, 1, 100_000)
+        was   = old.get(symbol, {}).get("atr")
+        if isinstance(value, (int, float)) and value > 0 and was:
+            # Volatility moves in ratios: compare log ATRs, at least ×2.5 apart
+            logs = [math.log(v) if v else None for v in _series(history, "atr", symbol, "atr")]
+            for level, msg in compare(f"atr {symbol}", math.log(value), math.log(was), logs, math.log(2.5)):
+                out.append((level, f"atr {symbol}: {was} → {value} pips/points "
+                                   f"({'unit change?' if _power_of_ten(value, was) else 'jump'})"))
+
+    spot, old_spot = new.get("spot", {}), prev.get("spot", {})
+    out += dropped("spot", spot, old_spot)
+    for symbol, px in sorted(spot.items()):
+        out += in_range(f"spot {symbol}", px, 1e-6, 1e6)
+        if isinstance(px, (int, float)) and px > 0 and old_spot.get(symbol):
+            out += compare(f"spot {symbol}", px, old_spot[symbol], _series(history, "spot", symbol),
+                           0.1 * old_spot[symbol])
+    return out
+
+
+def check_cot(new, prev, history, ctx):
+    cot, old = new.get("cot", {}), prev.get("cot", {})
+    out = dropped("cot", cot, old)
+    out += dates_forward("cot asOf", new.get("asOf"), prev.get("asOf"), max_age=timedelta(days=17))
+    same_week = new.get("asOf") == prev.get("asOf")
+
+    for ccy, entry in sorted(cot.items()):
+        out += in_range(f"cot {ccy} net", entry.get("net"), -100, 100, "%")
+        out += in_range(f"cot {ccy} prev", entry.get("prev"), -100, 100, "%")
+        was = old.get(ccy, {})
+        if not was:
+            continue
+        if same_week and entry != was:
+            out.append(warn(f"cot {ccy}: week {new.get('asOf')} revised {was} → {entry}"))
+        elif not same_week and entry.get("prev") != was.get("net"):
+            out.append(warn(f"cot {ccy}: prev {entry.get('prev')} ≠ last published net {was.get('net')}"))
+        out += compare(f"cot {ccy} net", entry.get("net"), was.get("net"),
+                       _series(history, "cot", ccy, "net"), 30, "%")
+    return out
+
+
+def check_cot_pairs(new, prev, history, ctx):
+    pairs, old = new.get("pairs", {}), prev.get("pairs", {})
+    out = dropped("cot pairs", pairs, old)
+    cot = ctx["outputs"].get("cot-data.json", {}).get("cot", {})
+    fields = new.get("fields", [])
+    if fields != ["diff", "change", "pct"]:
+        return out + [err(f"cot pairs: unexpected fields {fields}")]
+
+    for name, (diff, change, pct) in sorted(pairs.items()):
+        out += in_range(f"cot pair {name} diff", diff, -200, 200)
+        out += in_range(f"cot pair {name} pct", pct, 0, 100)
+        base, quote = name.split("/")
+        if base in cot and quote in cot and diff != cot[base]["net"] - cot[quote]["net"]:
+            out.append(err(f"cot pair {name}: diff {diff} ≠ {base} {cot[base]['net']} − {quote} {cot[quote]['net']}"))
+    return out
+
+
+_NUMBER = re.compile(r"(?<![\d.])-?\d+(?:\.\d+)?")     # "3.50-3.75": the dash is a range, not a sign
+
+
+def _policy_rate(text):
+    nums = _NUMBER.findall(text or "")
+    return float(nums[-1]) if nums else None      # ranges like 3.50-3.75% → upper bound
+
+
+def check_cb_rates(new, prev, history, ctx):
+    rates, old = new.get("rates", {}), prev.get("rates", {})
+    out = dropped("cb rates", rates, old)
+    if new.get("source") == "fallback" and prev.get("source") not in (None, "fallback"):
+        out.append(err("cb rates: hardcoded fallback would replace scraped rates"))
+
+    since = (parse_ts(prev.get("fetchedAt")) or datetime.now(timezone.utc)).date()
+    met   = {ccy for ccy, _ in cb_meetings_between(since - timedelta(days=CB_SOURCE_LAG_DAYS),
+                                                   datetime.now(timezone.utc).date())}
+    for ccy, text in sorted(rates.items()):
+        rate = _policy_rate(text)
+        if rate is None or "%" not in str(text):
+            out.append(err(f"cb rates {ccy}: {text!r} is not a percentage"))
+            continue
+        out += in_range(f"cb rates {ccy}", rate, -1, 25, "%")
+        was = _policy_rate(old.get(ccy))
+        out += compare(f"cb rates {ccy}", rate, was,
+                       [_policy_rate(h.get("rates", {}).get(ccy)) for h in history], 1.0, "%")
+        if was is not None and rate != was and ccy not in met:
+            out.append(warn(f"cb rates {ccy}: {old[ccy]} → {text} with no scheduled decision"))
+    return out
+
+
+def _check_curve(label, curve, old, history_key, history):
+    out = dropped(label, curve, old, allowed=("asOf",))
+    for key, value in sorted(curve.items()):
+        if key == "asOf":
+            continue
+        bps = key.startswith("spread")
+        out += in_range(f"{label} {key}", value, *((-500, 500, "bp") if bps else (-1, 20, "%")))
+        out += compare(f"{label} {key}", value, old.get(key),
+                       _series(history, history_key, key), 50 if bps else 0.5, "bp" if bps else "%")
+    return out
+
+
+def check_yields(new, prev, history, ctx):
+    out = dates_forward("yields asOf", new.get("asOf"), prev.get("asOf"), max_age=timedelta(days=7))
+    return out + _check_curve("yields", new.get("yields", {}), prev.get("yields", {}), "yields", history)
+
+
+def check_macro(new, prev, history, ctx):
+    out = _check_curve("macro yields", new.get("yields", {}), prev.get("yields", {}), "yields", history)
+    fed, old_fed = new.get("fed", {}), prev.get("fed", {})
+    out += dropped("macro fed", fed, old_fed)
+    for key in ("lower", "upper", "effective"):
+        if key in fed:
+            out += in_range(f"macro fed {key}", fed[key], -1, 25, "%")
+            out += compare(f"macro fed {key}", fed[key], old_fed.get(key),
+                           _series(history, "fed", key), 1.0, "%")
+
+    macro, old_macro = new.get("usMacro", {}), prev.get("usMacro", {})
+    out += dropped("macro usMacro", macro, old_macro)
+    for key, entry in sorted(macro.items()):
+        value = entry.get("v") if isinstance(entry, dict) else entry
+        if not isinstance(value, (int, float)) or not math.isfinite(value):
+            out.append(err(f"macro {key}: {value!r} is not a number"))
+        if isinstance(entry, dict) and isinstance(old_macro.get(key), dict):
+            out += dates_forward(f"macro {key} asOf", entry.get("asOf"), old_macro[key].get("asOf"))
+    return out
+
+
+RULES = {
+    "atr-data.json":  check_atr,
+    "cot-data.json":  check_cot,
+    "cot-pairs.json": check_cot_pairs,
+    "cb-rates.json":  check_cb_rates,
+    "yields.json":    check_yields,
+    "macro.json":     check_macro,
+}
+
+_ARCHIVED = {file: name for name, file in archive.ARTIFACTS.items()}
+
+
+def rolling_history(filename):
+    name = _ARCHIVED.get(filename)
+    if not name:
+        return []
+    return [snap for _, snap in deque(archive.Archive(name).replay(), maxlen=HISTORY_SNAPSHOTS)]
+
+
+# ── Gate ──────────────────────────────────────────────────────────────────────
+
+def validate(filename, payload, prev, ctx):
+    rule = RULES.get(filename)
+    if rule is None:
+        return []
+    try:
+        return rule(payload, prev or {}, rolling_history(filename), ctx)
+    except Exception as e:             # a broken rule must not wave a payload through
+        return [err(f"{filename}: validator crashed: {e!r}")]
+
+
+def validate_all(payloads, prevs, ctx=None):
+    """{filename: [(level, msg)]}, one thread per dataset."""
+    ctx = {**(ctx or {}), "outputs": payloads}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {f: pool.submit(validate, f, p, prevs.get(f), ctx) for f, p in payloads.items()}
+        return {f: fut.result() for f, fut in futures.items()}
+
+
+def _write_atomic(path, payload, compact):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        if compact:
+            json.dump(payload, f, separators=(",", ":"))
+        else:
+            json.dump(payload, f, indent=2)
+    os.replace(tmp, path)
+
+
+def report_path(job):
+    return REPORT_DIR / f"{job}.json"
+
+
+def load_report(job):
+    try:
+        with open(report_path(job)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _errors(found):
+    return [m for level, m in found if level == "error"]
+
+
+def _fingerprint(errors):
+    """Which checks failed where: each message's label plus its wording, numbers blanked."""
+    keys = sorted({f"{label}: {_NUMBER.sub('#', detail)}"
+                   for label, _, detail in (m.partition(": ") for m in errors)})
+    return hashlib.sha1("\n".join(keys).encode()).hexdigest()[:16]
+
+
+def block_streaks(report, findings):
+    """
+    {filename: {"runs", "agreeing", "fingerprint", "since"}} for every dataset
+    with errors this run, continuing the streaks in the job's last report.
+    """
+    now     = datetime.now(timezone.utc).isoformat()
+    streaks = {}
+    for filename, found in findings.items():
+        errors = _errors(found)
+        if not errors:
+            continue
+        fingerprint = _fingerprint(errors)
+        last = report.get("datasets", {}).get(filename, {}).get("blocked")
+        if last:
+            same = last["fingerprint"] == fingerprint
+            streaks[filename] = {"runs": last["runs"] + 1, "agreeing": last["agreeing"] + 1 if same else 1,
+                                 "fingerprint": fingerprint, "since": last["since"]}
+        else:
+            streaks[filename] = {"runs": 1, "agreeing": 1, "fingerprint": fingerprint, "since": now}
+    return streaks
+
+
+def accept_override():
+    """Filenames accepted by hand through VALIDATE_ACCEPT ("all" → every one)."""
+    value = os.environ.get("VALIDATE_ACCEPT", "").strip()
+    if value.lower() in ("all", "1", "true", "yes"):
+        return {"all"}
+    return {v.strip() for v in value.split(",") if v.strip()}
+
+
+def record(job, findings, blocked, streaks=None, accepted=None):
+    streaks, accepted = streaks or {}, accepted or {}
+    now  = datetime.now(timezone.utc).isoformat()
+    path = report_path(job)
+    with _report_lock:
+        doc = load_report(job)
+        doc["job"] = job
+        for filename, found in findings.items():
+            entry = {
+                "checkedAt": now,
+                "published": not blocked,
+                "errors":    _errors(found),
+                "warnings":  [m for level, m in found if level == "warn"],
+            }
+            if filename in accepted and not blocked:
+                entry["accepted"] = accepted[filename]
+            elif blocked and filename in streaks:
+                entry["blocked"] = streaks[filename]
+            doc.setdefault("datasets", {})[filename] = entry
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(doc, f, indent=2)
+
+    lines = [f"### {job} validation — {'BLOCKED, last good artifacts kept' if blocked else 'passed'}", ""]
+    lines += [f"- **{level}** `{filename}` {msg}"
+              for filename, found in findings.items() for level, msg in found]
+    if blocked:
+        lines += [f"- `{filename}` blocked {s['runs']} run(s) in a row, the last {s['agreeing']} "
+                  f"with the same errors (accepted at {ACCEPT_AFTER})" for filename, s in streaks.items()]
+    else:
+        lines += [f"- `{filename}` errors accepted ({why})" for filename, why in accepted.items()]
+    if os.environ.get("GITHUB_STEP_SUMMARY"):
+        with open(os.environ["GITHUB_STEP_SUMMARY"], "a") as f:
+            f.write("\n".join(lines) + "\n\n")
+
+
+def publish(job, outputs, context=None, compact=()):
+    """
+    Validate then write {Path: payload} as one unit. On any error nothing is
+    written and the run exits — 0 when every output still has its last good
+    version on disk, 1 when there is nothing to fall back to or a dataset
+    has been blocked ACCEPT_AFTER runs in a row without the runs agreeing.
+    Errors that ACCEPT_AFTER runs agreed on, or that VALIDATE_ACCEPT names,
+    don't block.
+    """
+    paths    = {Path(p).name: Path(p) for p in outputs}
+    payloads = {Path(p).name: payload for p, payload in outputs.items()}
+    prevs    = {name: read_artifact(path) for name, path in paths.items()}
+    findings = validate_all(payloads, prevs, context)
+
+    for filename, found in findings.items():
+        for level, msg in found:
+            print(f"  {'ERROR' if level == 'error' else 'WARN '} [validate] {msg}")
+
+    streaks  = block_streaks(load_report(job), findings)
+    override = accept_override()
+    accepted = {}
+    for filename, streak in streaks.items():
+        if "all" in override or filename in override:
+            accepted[filename] = "VALIDATE_ACCEPT"
+        elif streak["agreeing"] >= ACCEPT_AFTER:
+            accepted[filename] = f"{streak['agreeing']} runs agreed"
+    blocking = [f for f in streaks if f not in accepted]
+    record(job, findings, blocked=bool(blocking), streaks=streaks, accepted=accepted)
+
+    for filename, why in accepted.items():
+        print(f"  [validate] accepting {filename} despite its errors: {why}")
+    if blocking:
+        errors   = sum(len(_errors(findings[f])) for f in blocking)
+        kept     = all(p.exists() for p in paths.values())
+        stuck    = [f for f in blocking if streaks[f]["runs"] >= ACCEPT_AFTER]
+        print(f"BLOCKED: {errors} validation error(s) — "
+              + ("keeping the last good artifacts" if kept else "no previous artifact to keep"))
+        if stuck:
+            print(f"FATAL: {', '.join(stuck)} blocked {ACCEPT_AFTER}+ runs in a row with changing errors — "
+                  "check the source, or rerun with VALIDATE_ACCEPT")
+        sys.exit(0 if kept and not stuck else 1)
+
+    compact = {Path(p).name for p in compact}
+    for name, path in paths.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, payloads[name], name in compact)
+    print(f"  [validate] {len(paths)} artifact(s) passed ({sum(len(f) for f in findings.values())} warnings)")
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main():
+    """Check what is in public/ now against the archive's latest version and history."""
+    names    = sys.argv[1:] or list(RULES)
+    payloads = {n: read_artifact(PUBLIC_DIR / n) for n in names}
+    payloads = {n: p for n, p in payloads.items() if p}
+    prevs    = {}
+    for n in payloads:
+        hist = rolling_history(n)
+        # The newest archived version may be this very file; compare with the one before
+        prevs[n] = next((h for h in reversed(hist) if h.get("fetchedAt") != payloads[n].get("fetchedAt")), {})
+
+    findings = validate_all(payloads, prevs)
+    errors   = 0
+    for name, found in findings.items():
+        print(f"{name}: {'ok' if not found else ''}")
+        for level, msg in found:
+            print(f"  {level.upper():<5} {msg}")
+            errors += level == "error"
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
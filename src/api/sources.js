@@ -29,11 +29,37 @@ export async function fetchFX() {
   };
 }
 
-// ── US Treasury Yield Curve — /api/yields proxy ────────────────────
+// ── Static-first JSON with a proxy fallback ────────────────────────
+// A missing static file does NOT 404: netlify.toml rewrites /* to
+// /index.html with a 200 (Vite's dev server does the same), so res.ok is
+// true and the body is HTML. Only a JSON content-type that also parses
+// counts as the static file; anything else falls through to the proxy.
+// With maxAgeMs, a file whose fetchedAt is older than that also falls
+// through: the CDN only has what the last deploy shipped, and the bot may
+// have stopped committing (or its commits may not have deployed).
+async function fetchStaticFirst(path, proxy, label, maxAgeMs) {
+  try {
+    const res = await fetch(path);
+    if (res.ok && (res.headers.get('content-type') || '').includes('json')) {
+      const data = await res.json();
+      const age  = Date.now() - new Date(data.fetchedAt).getTime();
+      if (!maxAgeMs || age <= maxAgeMs) return data;
+    }
+  } catch {
+    // network error or truncated JSON — the proxy is the fallback either way
+  }
+  const res = await fetch(proxy);
+  if (!res.ok) throw new Error(`${label} HTTP ${res.status}`);
+  return res.json();
+}
+
+// ── US Treasury Yield Curve — /yields.json, /api/yields fallback ───
+// public/yields.json is committed by GitHub Actions each weekday evening via
+// scripts/fetch_yields.py (spreads + day-over-day changes precomputed).
+// The proxy is hit when the static file is absent (SPA fallback HTML), not
+// JSON, or fails to parse.
 export async function fetchYields() {
-  const res = await fetch('/api/yields');
-  if (!res.ok) throw new Error(`Yields proxy HTTP ${res.status}`);
-  const { yields } = await res.json();
+  const { yields } = await fetchStaticFirst('/yields.json', '/api/yields', 'Yields');
   if (!yields || Object.keys(yields).length === 0) throw new Error('No yield data');
   return { yields };
 }
@@ -70,7 +96,12 @@ export async function fetchCOT() {
   if (!res.ok) throw new Error(`cot-data.json HTTP ${res.status}`);
   const { cot, asOf } = await res.json();
   if (!cot || Object.keys(cot).length === 0) throw new Error('No COT data');
-  return { cot, cotAsOf: asOf || null };
+  // Pair matrix is optional — §07 falls back to per-currency differences
+  const pairs = await fetch('/cot-pairs.json')
+    .then(r => (r.ok ? r.json() : null))
+    .catch(() => null);
+  const hasPairs = pairs?.pairs && Object.keys(pairs.pairs).length > 0;
+  return { cot, cotAsOf: asOf || null, cotPairs: hasPairs ? pairs : null };
 }
 
 // ── ATR (Average True Range) — /atr-data.json (static, GitHub Actions) ──
@@ -78,26 +109,80 @@ export async function fetchCOT() {
 // scripts/fetch_atr.py, which calculates 14-day ATR from Yahoo Finance OHLC
 // data. Also runs on every push to main. No proxy needed — same-origin static.
 // Used by §10 Position Sizer to validate stop-loss distance vs daily range.
+// riskGrid carries precomputed pip values, ATR stops and lot sizes per G10
+// account currency (scripts/risk_grid.py) — §08/§10 only look values up.
 export async function fetchATR() {
   const res = await fetch('/atr-data.json');
   if (!res.ok) throw new Error(`atr-data.json HTTP ${res.status}`);
-  const { atr, fetchedAt, fallbackUsed } = await res.json();
+  const { atr, riskGrid, fetchedAt, fallbackUsed } = await res.json();
   if (!atr || Object.keys(atr).length === 0) throw new Error('No ATR data');
-  return { atr, atrFetchedAt: fetchedAt || null, atrFallbackUsed: fallbackUsed || [] };
+  return {
+    atr,
+    atrRiskGrid:     riskGrid || null,
+    atrFetchedAt:    fetchedAt || null,
+    atrFallbackUsed: fallbackUsed || [],
+  };
+}
+
+// ── US Macro — /macro.json (static, GitHub Actions) ─────────────────
+// public/macro.json is committed by GitHub Actions every weekday via
+// scripts/fetch_macro.py, which pulls the Fed rate, full Treasury curve and
+// CPI/PCE/unemployment/NFP from FRED once for all viewers. No browser key.
+// The FRED curve lags Treasury by a day, so /api/yields stays the live source.
+export async function fetchMacro() {
+  const res = await fetch('/macro.json');
+  if (!res.ok) throw new Error(`macro.json HTTP ${res.status}`);
+  const { fed, usMacro } = await res.json();
+  if (!usMacro || Object.keys(usMacro).length === 0) throw new Error('No macro data');
+  return { usMacro: { ...usMacro, fed: fed || {} } };
 }
+
+// ── Economic Calendar — /calendar.json, /api/calendar fallback ─────
+// public/calendar.json is written every 30 min on weekdays by
+// scripts/fetch_calendar.py: both FF weeks merged into a persistent event
+// store, normalised and grouped by currency once, not per cold Lambda.
+// Older than CALENDAR_MAX_AGE_MS (a missed run or two, plus the deploy) →
+// the live proxy, so actuals never freeze at the last deploy.
+const CALENDAR_MAX_AGE_MS = 2 * 60 * 60 * 1000;
+
 export async function fetchCalendar() {
-  const res = await fetch('/api/calendar');
-  if (!res.ok) throw new Error(`Calendar proxy HTTP ${res.status}`);
-  const { byCurrency, fetchedAt } = await res.json();
+  const { byCurrency, fetchedAt } = await fetchStaticFirst('/calendar.json', '/api/calendar', 'Calendar',
+                                                           CALENDAR_MAX_AGE_MS);
   if (!byCurrency) throw new Error('No calendar data');
   return { calendar: byCurrency, _calendarFetchedAt: fetchedAt };
 }
 
-// ── News Headlines — /api/news proxy (RSS aggregation) ─────────────
+// ── News Headlines — /news/all.json, /api/news fallback ────────────
+// public/news/*.json are written every 30 min on weekdays by scripts/fetch_news.py
+// (RSS polled with conditional GETs, deduped, currency-tagged once).
+// all.json carries byCurrency; per-currency shards live at /news/{CCY}.json.
+// Static files can't carry a relative "2h ago", so it's derived here.
+function timeAgo(isoStr) {
+  if (!isoStr) return '';
+  const diff  = Date.now() - new Date(isoStr).getTime();
+  const mins  = Math.floor(diff / 60000);
+  const hours = Math.floor(mins / 60);
+  const days  = Math.floor(hours / 24);
+  if (isNaN(mins)) return '';
+  if (mins < 2)    return 'just now';
+  if (mins < 60)   return `${mins}m ago`;
+  if (hours < 24)  return `${hours}h ago`;
+  if (days < 7)    return `${days}d ago`;
+  return new Date(isoStr).toLocaleDateString('en-AU', { month: 'short', day: 'numeric' });
+}
+
+// Older than NEWS_MAX_AGE_MS (the job runs every 30 min on weekdays, plus
+// the deploy) → the live proxy, e.g. over the weekend.
+const NEWS_MAX_AGE_MS = 60 * 60 * 1000;
+
 export async function fetchNews() {
-  const res = await fetch('/api/news');
-  if (!res.ok) throw new Error(`News proxy HTTP ${res.status}`);
-  const { byCurrency, fetchedAt } = await res.json();
+  const { byCurrency, fetchedAt } = await fetchStaticFirst('/news/all.json', '/api/news', 'News', NEWS_MAX_AGE_MS);
   if (!byCurrency) throw new Error('No news data');
-  return { news: byCurrency, _newsFetchedAt: fetchedAt };
+  const news = Object.fromEntries(
+    Object.entries(byCurrency).map(([ccy, articles]) => [
+      ccy,
+      articles.map(a => ({ ...a, timeAgo: timeAgo(a.publishedAt) })),
+    ])
+  );
+  return { news, _newsFetchedAt: fetchedAt };
 }
@@ -18,6 +18,7 @@ function useMergedATR() {
         liveAtr[pair] ?? staticEntry,
       ])
     ),
+    riskGrid: live.atrRiskGrid,
     src: live.status?.atr || 'stale',
     fetchedAt: live.atrFetchedAt,
     fallbackUsed: live.atrFallbackUsed || [],
@@ -37,16 +38,24 @@ const CHECKLIST = [
   { id: 'c10', main: 'Weekly drawdown limit checked',     sub: 'Still within max weekly loss limit. Not trading on tilt.' },
 ];
 
-function PositionSizer({ atrData }) {
+// Pip values come precomputed per account currency from atr-data.json's
+// riskGrid; without it, fall back to the USD-quoted $10 per standard lot.
+function PositionSizer({ atrData, riskGrid }) {
   const [account,  setAccount]  = useState(10000);
+  const [acctCcy,  setAcctCcy]  = useState('USD');
   const [riskPct,  setRiskPct]  = useState(1);
   const [stopPips, setStopPips] = useState(80);
   const [pair,     setPair]     = useState('EUR/USD');
 
-  const riskAmt = account * (riskPct / 100);
-  const lots    = riskAmt / (stopPips * 10);
-  const atrD    = atrData[pair];
-  const atrStop = atrD ? Math.round(atrD.atr * 1.25) : stopPips;
+  const gridPair = riskGrid?.pairs?.[pair];
+  const gridAcct = gridPair?.accounts?.[acctCcy];
+  const pipValue = gridAcct?.pipValue ?? 10;
+  const ccyLabel = gridAcct ? acctCcy : 'USD';
+  const riskAmt  = account * (riskPct / 100);
+  const lots     = riskAmt / (stopPips * pipValue);
+  const atrD     = atrData[pair];
+  const m125     = riskGrid?.atrMultiples?.indexOf(1.25) ?? -1;
+  const atrStop  = gridPair && m125 >= 0 ? gridPair.stops[m125] : atrD ? Math.round(atrD.atr * 1.25) : stopPips;
   const stopOk  = atrD ? stopPips >= atrD.atr : true;
   const rating  = riskPct <= 1 ? 'CONSERVATIVE ✓' : riskPct <= 2 ? 'MODERATE ✓' : 'AGGRESSIVE ⚠';
   const ratCls  = riskPct <= 1 ? 'good' : riskPct <= 2 ? 'caution' : 'warn';
@@ -60,7 +69,7 @@ function PositionSizer({ atrData }) {
       </div>
       <div className="sizer-grid">
         {[
-          { label: 'ACCOUNT SIZE ($)', type: 'number', value: account, setter: v => setAccount(+v) },
+          { label: `ACCOUNT SIZE (${ccyLabel})`, type: 'number', value: account, setter: v => setAccount(+v) },
           { label: 'RISK PER TRADE (%)', type: 'number', value: riskPct, step: 0.1, setter: v => setRiskPct(+v) },
           { label: 'STOP LOSS (PIPS)', type: 'number', value: stopPips, setter: v => setStopPips(+v) },
         ].map(({ label, ...props }, i) => (
@@ -69,6 +78,12 @@ function PositionSizer({ atrData }) {
             <input className="fld-in" {...props} onChange={e => props.setter(e.target.value)} />
           </div>
         ))}
+        <div className="sz-inp" style={{ marginBottom: '0.4rem' }}>
+          <label className="fld-lbl">ACCOUNT CURRENCY</label>
+          <select className="fld-sel" value={acctCcy} onChange={e => setAcctCcy(e.target.value)}>
+            {(riskGrid?.accounts || ['USD']).map(c => <option key={c}>{c}</option>)}
+          </select>
+        </div>
         <div className="sz-inp" style={{ marginBottom: '0.4rem' }}>
           <label className="fld-lbl">PAIR</label>
           <select className="fld-sel" value={pair} onChange={e => setPair(e.target.value)}>
@@ -79,12 +94,13 @@ function PositionSizer({ atrData }) {
 
       <div className="sz-results">
         {[
-          { label: 'Risk Amount',              val: `$${riskAmt.toFixed(2)}`,                    cls: '' },
+          { label: 'Risk Amount',              val: `${riskAmt.toFixed(2)} ${ccyLabel}`,         cls: '' },
+          { label: 'Pip Value (1 lot)',        val: `${pipValue.toFixed(2)} ${ccyLabel}`,        cls: '' },
           { label: 'Position Size',            val: `${lots.toFixed(2)} lots`,                   cls: 'good' },
           { label: 'In Mini Lots',             val: `${Math.round(lots * 10) / 10} mini lots`,   cls: '' },
           { label: 'Suggested Stop (1.25× ATR)', val: `${atrStop} pips`,                        cls: 'caution' },
           { label: 'Stop vs ATR',              val: stopOk ? '✓ ADEQUATE' : '⚠ TOO TIGHT',      cls: stopOk ? 'good' : 'warn' },
-          { label: 'Max 5-Trade Drawdown',     val: `$${(riskAmt * 5).toFixed(0)} (${(riskPct * 5).toFixed(1)}%)`, cls: 'warn' },
+          { label: 'Max 5-Trade Drawdown',     val: `${(riskAmt * 5).toFixed(0)} ${ccyLabel} (${(riskPct * 5).toFixed(1)}%)`, cls: 'warn' },
           { label: 'Risk Rating',              val: rating,                                       cls: ratCls },
         ].map(({ label, val, cls }, i) => (
           <div key={i} className="res-row">
@@ -182,7 +198,7 @@ function TradeJournal() {
 }
 
 export function S10Exec() {
-  const { data: atrData, src: atrSrc, fetchedAt: atrTs, fallbackUsed } = useMergedATR();
+  const { data: atrData, src: atrSrc, fetchedAt: atrTs, fallbackUsed, riskGrid } = useMergedATR();
   const atrIsLive = atrSrc === 'live';
 
   return (
@@ -228,7 +244,7 @@ export function S10Exec() {
         </div>
       </Card>
 
-      <PositionSizer atrData={atrData} />
+      <PositionSizer atrData={atrData} riskGrid={riskGrid} />
 
       <div style={{ display: 'grid', gridTemplateColumns: '1fr 1fr', gap: '0.65rem' }}>
         <PreTradeChecklist />
@@ -20,6 +20,52 @@ function useMergedCOT() {
   );
 }
 
+// Pair differential from cot-pairs.json. Pairs are stored in market quoting
+// order (EUR/USD); the inverse is the negated diff/change and 100 − percentile.
+function cotPair(cotPairs, base, quote) {
+  const pairs = cotPairs?.pairs;
+  if (!pairs) return null;
+  const direct = pairs[`${base}/${quote}`];
+  if (direct) return { diff: direct[0], change: direct[1], pct: direct[2] };
+  const inv = pairs[`${quote}/${base}`];
+  return inv ? { diff: -inv[0], change: -inv[1], pct: 100 - inv[2] } : null;
+}
+
+function PairPositioning({ cur, cotPairs }) {
+  const others = Object.keys(COT).filter(c => c !== 'XAU' && c !== cur);
+  const rows   = others.map(c => [c, cotPair(cotPairs, cur, c)]).filter(([, p]) => p);
+  if (!rows.length) return null;
+  const mono = { fontFamily: "'IBM Plex Mono', monospace", fontSize: '0.78rem' };
+
+  return (
+    <Card label={`PAIR POSITIONING — ${cur} VS G10 (${cotPairs.weeks}-WEEK PERCENTILE)`}>
+      <div className="mtx-wrap">
+        <table className="mtx">
+          <thead>
+            <tr><th>PAIR</th><th>NET DIFF</th><th>WoW</th><th>PERCENTILE</th></tr>
+          </thead>
+          <tbody>
+            {rows.map(([c, p]) => (
+              <tr key={c}>
+                <td style={mono}>{cur}/{c}</td>
+                <td style={{ ...mono, color: p.diff > 0 ? 'var(--teal)' : p.diff < 0 ? 'var(--red)' : 'var(--muted)' }}>
+                  {p.diff > 0 ? '+' : ''}{p.diff}
+                </td>
+                <td style={{ ...mono, color: p.change > 0 ? 'var(--teal)' : p.change < 0 ? 'var(--red)' : 'var(--muted)' }}>
+                  {p.change > 0 ? '+' : ''}{p.change}
+                </td>
+                <td style={{ ...mono, color: p.pct >= 90 || p.pct <= 10 ? 'var(--red)' : 'var(--ink)' }}>
+                  {p.pct}{(p.pct >= 90 || p.pct <= 10) && ' ● EXTREME'}
+                </td>
+              </tr>
+            ))}
+          </tbody>
+        </table>
+      </div>
+    </Card>
+  );
+}
+
 export function S7Cot({ brief }) {
   const cur    = useCurrentCcy();
   const live   = useLiveData();
@@ -139,6 +185,8 @@ export function S7Cot({ brief }) {
           </div>
         )}
       </Card>
+
+      <PairPositioning cur={cur} cotPairs={live.cotPairs} />
     </>
   );
 }
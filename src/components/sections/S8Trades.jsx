@@ -2,7 +2,7 @@ import { SectionHead } from '../ui/SectionHead.jsx';
 import { Card } from '../ui/Card.jsx';
 import { CURRENCIES } from '../../data/currencies.js';
 import { score, useTopPairs } from '../../hooks/useScores.js';
-import { useCurrentCcy } from '../../context/AppContext.jsx';
+import { useCurrentCcy, useLiveData } from '../../context/AppContext.jsx';
 
 // ── Skeleton card for loading state ─────────────────────────────────
 function TradeCardSkeleton() {
@@ -21,11 +21,21 @@ function TradeCardSkeleton() {
   );
 }
 
+// ATR stop distances from atr-data.json's riskGrid — either quoting of the pair
+function useAtrStops(pair) {
+  const grid = useLiveData().atrRiskGrid;
+  if (!grid || !pair) return null;
+  const [a, b] = pair.split('/');
+  const entry  = grid.pairs[pair] || grid.pairs[`${b}/${a}`];
+  return entry ? { multiples: grid.atrMultiples, stops: entry.stops, unit: entry.unit } : null;
+}
+
 function TradeCard({ cur, otherCcy, thesis }) {
   const {
     conviction = 65, summary, dir, entry, target, stop,
     risks = [], catalyst, timeframe, chain = [], tags = [],
   } = thesis;
+  const atrStops = useAtrStops(thesis.pair || `${cur}/${otherCcy}`);
 
   const convColor = conviction >= 75 ? 'var(--teal)' : conviction >= 50 ? 'var(--gold)' : 'var(--red)';
   const convLabel = conviction >= 75 ? 'HIGH' : conviction >= 50 ? 'MODERATE' : 'LOW';
@@ -59,6 +69,11 @@ function TradeCard({ cur, otherCcy, thesis }) {
           <div className="lvl"><div className="lvl-lbl">TARGET</div><div className="lvl-v tgt">{target}</div></div>
           <div className="lvl"><div className="lvl-lbl">STOP</div><div className="lvl-v stop">{stop}</div></div>
         </div>
+        {atrStops && (
+          <div style={{ fontFamily: "'IBM Plex Mono', monospace", fontSize: '0.7rem', color: 'var(--muted)', margin: '0.35rem 0' }}>
+            ATR STOPS · {atrStops.multiples.map((m, i) => `${m}× ${atrStops.stops[i]}`).join(' · ')} {atrStops.unit}
+          </div>
+        )}
         <div>
           {risks.map((r, i) => <div key={i} className="tc-risk">{r}</div>)}
         </div>
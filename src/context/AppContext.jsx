@@ -9,11 +9,13 @@ const initialLiveData = {
   cbRates:        {},   // { USD:'3.50-3.75%', EUR:'2.15%', ... }
   markets:        {},   // { xau:{price,change,changePct}, wti:{...}, ... }
   fx:             {},   // { 'EUR/USD':1.0842, ... }
-  usMacro:        {},   // { cpi, corePCE, unemployment, nfp } — reserved
+  usMacro:        {},   // { cpi, corePCE, unemployment, nfp, fed } — macro.json (FRED)
   cot:            {},   // { EUR:{net,prev}, JPY:{net,prev}, ... }
   cotAsOf:        null,
+  cotPairs:       null, // { fields:['diff','change','pct'], pairs:{ 'EUR/USD':[-20,3,12], ... }, weeks }
   intlMacro:      {},   // { AUD:{cpi,unemployment}, ... } — reserved
   atr:            {},   // { 'EUR/USD':{atr:68,vol:'medium'}, ... } — weekly ATR
+  atrRiskGrid:    null, // { accounts, atrMultiples, riskPcts, pairs:{ 'EUR/USD':{stops, accounts:{USD:{pipValue,lots}}} } }
   atrFetchedAt:   null,
   atrFallbackUsed:[],
   calendar:       {},   // { AUD:[...events], USD:[...events], ... }
@@ -25,6 +27,7 @@ const initialLiveData = {
     fx:       'stale',
     cot:      'stale',
     atr:      'stale',
+    macro:    'stale',
     calendar: 'stale',
     news:     'stale',
   },
@@ -82,8 +85,10 @@ function reducer(state, action) {
       if (patch.usMacro)   next.usMacro   = { ...next.usMacro,   ...patch.usMacro };
       if (patch.cot)       next.cot       = { ...next.cot,       ...patch.cot };
       if (patch.cotAsOf)   next.cotAsOf   = patch.cotAsOf;
+      if (patch.cotPairs)  next.cotPairs  = patch.cotPairs;
       if (patch.intlMacro) next.intlMacro = { ...next.intlMacro, ...patch.intlMacro };
       if (patch.atr)       next.atr       = { ...next.atr,       ...patch.atr };
+      if (patch.atrRiskGrid)     next.atrRiskGrid     = patch.atrRiskGrid;
       if (patch.atrFetchedAt)    next.atrFetchedAt    = patch.atrFetchedAt;
       if (patch.atrFallbackUsed) next.atrFallbackUsed = patch.atrFallbackUsed;
       if (patch.calendar)  next.calendar  = { ...next.calendar,  ...patch.calendar };
@@ -7,6 +7,7 @@ import {
   fetchCBRates,
   fetchCOT,
   fetchATR,
+  fetchMacro,
   fetchCalendar,
   fetchNews,
 } from '../api/sources.js';
@@ -51,6 +52,10 @@ export function useFetch() {
         .then(p => apply(p, 'atr', 'live'))
         .catch(e => console.warn('[ATR]', e.message)),
 
+      fetchMacro()
+        .then(p => apply(p, 'macro', 'live'))
+        .catch(e => console.warn('[Macro]', e.message)),
+
       fetchCalendar()
         .then(p => apply(p, 'calendar', 'live'))
         .catch(e => console.warn('[Calendar]', e.message)),
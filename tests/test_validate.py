@@ -0,0 +1,211 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import validate
+
+
+# ── compare / _power_of_ten ───────────────────────────────────────────────────
+
+@pytest.mark.parametrize("new, old, k", [
+    (150.0, 1.5, 2),          # points vs pips
+    (0.0425, 4.25, -2),       # fraction vs percent
+    (-31.0, -3.1, 1),
+    (4.5, 4.25, None),        # an ordinary move
+    (3.0, 1.0, None),         # ×3 is not a power of ten
+    (-4.25, 4.25, None),      # sign flips are not unit slips
+    (0.0, 4.25, None),
+    (4.25, None, None),
+])
+def test_power_of_ten(new, old, k):
+    assert validate._power_of_ten(new, old) == k
+
+
+def test_compare_within_floor():
+    assert validate.compare("x", 4.5, 4.25, [], floor=1.0) == []
+
+
+def test_compare_jump_beyond_floor():
+    (level, msg), = validate.compare("x", 5.75, 4.25, [], floor=1.0, unit="%")
+    assert level == "error" and "jumped 4.25 → 5.75%" in msg
+
+
+def test_compare_limit_scales_with_history():
+    series = [1, 3, 5, 7, 9]                       # typical move 2 → limit 6 × 2
+    assert validate.compare("x", 20, 9, series, floor=1) == []
+    assert validate.compare("x", 22, 9, series, floor=1)
+
+
+def test_compare_unit_slip():
+    (level, msg), = validate.compare("x", 425, 4.25, [], floor=1.0)
+    assert level == "error" and "×10^2" in msg
+
+
+def test_compare_skips_missing_values():
+    assert validate.compare("x", None, 4.25, [], floor=1.0) == []
+    assert validate.compare("x", 4.25, None, [], floor=1.0) == []
+
+
+# ── _policy_rate ──────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("text, rate", [
+    ("3.50-3.75%", 3.75),
+    ("3.50–3.75%", 3.75),
+    ("4.25%", 4.25),
+    ("-0.10%", -0.10),
+    ("0.5 %", 0.5),
+    ("n/a", None),
+    (None, None),
+])
+def test_policy_rate(text, rate):
+    assert validate._policy_rate(text) == rate
+
+
+# ── check_bars ────────────────────────────────────────────────────────────────
+
+def _bars(n=20, spike_at=None):
+    start = datetime.now(timezone.utc) - timedelta(days=n - 1)
+    bars  = []
+    for i in range(n):
+        ts = int((start + timedelta(days=i)).timestamp())
+        h, l = (1.20, 1.00) if i == spike_at else (1.102, 1.098)
+        bars.append((ts, h, l, 1.10))
+    return bars
+
+
+def _levels(found):
+    return [level for level, _ in found]
+
+
+def test_check_bars_clean():
+    assert validate.check_bars("EURUSD", _bars()) == []
+
+
+def test_check_bars_too_few():
+    assert _levels(validate.check_bars("EURUSD", _bars(10))) == ["error"]
+
+
+def test_check_bars_stale():
+    bars = [(ts - 10 * 86400, h, l, c) for ts, h, l, c in _bars()]
+    (level, msg), = validate.check_bars("EURUSD", bars)
+    assert level == "error" and "newest bar" in msg
+
+
+def test_check_bars_gap_warns():
+    bars = _bars(30)
+    bars = bars[:10] + bars[17:]                   # a week missing mid-series
+    assert _levels(validate.check_bars("EURUSD", bars)) == ["warn"]
+
+
+def test_check_bars_malformed():
+    bars = _bars()
+    ts, *_ = bars[5]
+    bars[5] = (ts, 1.098, 1.102, 1.10)             # high < low
+    assert "malformed" in validate.check_bars("EURUSD", bars)[0][1]
+
+
+def test_check_bars_tick_spike_warns():
+    (level, msg), = validate.check_bars("EURUSD", _bars(spike_at=12))
+    assert level == "warn" and "bad tick" in msg
+
+
+# ── publish: block, keep, accept, escalate ────────────────────────────────────
+
+PREV = {"rates": {"USD": "3.50-3.75%", "EUR": "2.00%"}, "source": "scraped",
+        "fetchedAt": "2026-01-05T12:00:00+00:00"}
+
+
+@pytest.fixture
+def gate(tmp_path, monkeypatch):
+    monkeypatch.setattr(validate, "REPORT_DIR", tmp_path / "validation")
+    monkeypatch.setattr(validate, "rolling_history", lambda filename: [])
+    monkeypatch.delenv("VALIDATE_ACCEPT", raising=False)
+    monkeypatch.delenv("GITHUB_STEP_SUMMARY", raising=False)
+    path = tmp_path / "cb-rates.json"
+    path.write_text(json.dumps(PREV))
+    return path
+
+
+def _publish(path, usd):
+    payload = {**PREV, "rates": {**PREV["rates"], "USD": usd}}
+    validate.publish("cb_rates", {path: payload})
+
+
+def _entry():
+    return validate.load_report("cb_rates")["datasets"]["cb-rates.json"]
+
+
+def test_publish_passes(gate):
+    _publish(gate, "3.75-4.00%")
+    assert json.loads(gate.read_text())["rates"]["USD"] == "3.75-4.00%"
+    assert _entry()["published"] and "blocked" not in _entry()
+
+
+def test_publish_blocks_and_keeps_last_good(gate):
+    before = gate.read_text()
+    with pytest.raises(SystemExit) as e:
+        _publish(gate, "5.75%")
+    assert e.value.code == 0
+    assert gate.read_text() == before
+    entry = _entry()
+    assert not entry["published"]
+    assert entry["blocked"]["runs"] == 1 and entry["blocked"]["agreeing"] == 1
+
+
+def test_publish_accepts_once_runs_agree(gate):
+    for _ in range(validate.ACCEPT_AFTER - 1):
+        with pytest.raises(SystemExit):
+            _publish(gate, "5.75%")
+    _publish(gate, "5.75%")
+    assert json.loads(gate.read_text())["rates"]["USD"] == "5.75%"
+    assert _entry()["published"] and "agreed" in _entry()["accepted"]
+
+
+def test_publish_agreement_ignores_the_numbers(gate):
+    # Same check failing on the same currency, with the value still moving
+    for n in range(validate.ACCEPT_AFTER - 1):
+        with pytest.raises(SystemExit):
+            _publish(gate, f"{5.75 + n}%")
+    _publish(gate, "6.50%")
+    assert json.loads(gate.read_text())["rates"]["USD"] == "6.50%"
+
+
+def test_publish_escalates_when_runs_disagree(gate):
+    codes = []
+    for n in range(validate.ACCEPT_AFTER):
+        with pytest.raises(SystemExit) as e:
+            _publish(gate, "5.75%" if n % 2 else "5.75")      # a jump, then not a percentage
+        codes.append(e.value.code)
+    assert codes == [0] * (validate.ACCEPT_AFTER - 1) + [1]
+    assert json.loads(gate.read_text()) == PREV
+
+
+def test_publish_override(gate, monkeypatch):
+    monkeypatch.setenv("VALIDATE_ACCEPT", "cb-rates.json")
+    _publish(gate, "5.75%")
+    assert json.loads(gate.read_text())["rates"]["USD"] == "5.75%"
+    assert _entry()["accepted"] == "VALIDATE_ACCEPT"
+
+
+def test_publish_streak_resets_after_a_clean_run(gate):
+    with pytest.raises(SystemExit):
+        _publish(gate, "5.75%")
+    _publish(gate, "3.75-4.00%")
+    with pytest.raises(SystemExit):
+        _publish(gate, "5.75%")
+    assert _entry()["blocked"]["runs"] == 1
+
+
+def test_publish_spike_does_not_block_other_instruments(gate, tmp_path):
+    prev = {"atr": {"EURUSD=X": {"atr": 70}, "GBPUSD=X": {"atr": 90}},
+            "spot": {"EURUSD=X": 1.10, "GBPUSD=X": 1.30}, "fetchedAt": "2026-01-05T12:00:00+00:00"}
+    path = tmp_path / "atr-data.json"
+    path.write_text(json.dumps(prev))
+    new  = {**prev, "atr": {"EURUSD=X": {"atr": 85}, "GBPUSD=X": {"atr": 95}}}
+
+    validate.publish("atr", {path: new}, context={"bars": {"EURUSD=X": _bars(spike_at=12),
+                                                           "GBPUSD=X": _bars()}})
+    assert json.loads(path.read_text())["atr"] == new["atr"]
+    entry = validate.load_report("atr")["datasets"]["atr-data.json"]
+    assert entry["published"] and any("bad tick" in w for w in entry["warnings"])
@@ -1,8 +1,15 @@
 import { defineConfig } from 'vite';
 import react from '@vitejs/plugin-react';
 
+// DATA_SERVER=http://127.0.0.1:8787 npm run dev — answer /api/* from
+// scripts/data_server.py instead of needing `netlify dev`
+const dataServer = process.env.DATA_SERVER;
+
 export default defineConfig({
   plugins: [react()],
-  server: { port: 3000 },
+  server: {
+    port: 3000,
+    ...(dataServer && { proxy: { '/api': dataServer, '/events': dataServer } }),
+  },
   build: { outDir: 'dist' },
 });